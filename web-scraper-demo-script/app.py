@@ -1,7 +1,7 @@
-import time
 import os
 from selenium import webdriver
 from selenium.webdriver.chrome.service import Service
+from selenium.webdriver.support.ui import WebDriverWait
 from webdriver_manager.chrome import ChromeDriverManager
 from selenium.common.exceptions import TimeoutException
 from urllib.parse import urlparse
@@ -32,7 +32,9 @@ try:
         try:
             driver.get(url)
 
-            time.sleep(2)
+            WebDriverWait(driver, 10).until(
+                lambda d: d.execute_script("return document.readyState") == "complete"
+            )
 
             full_html = driver.page_source
 
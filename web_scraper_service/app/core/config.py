@@ -9,6 +9,8 @@ Settings can be accessed globally via: `from app.core.config import settings`
 Belongs to: Core Configuration
 """
 
+from typing import Dict, Optional
+
 from pydantic import BaseSettings, Field
 
 
@@ -19,6 +21,25 @@ class Settings(BaseSettings):
         KAFKA_BOOTSTRAP_SERVERS (str): Kafka broker addresses.
         KAFKA_TOPIC (str): Kafka topic for product data messages.
         KAFKA_MAX_RETRIES (int): Maximum number of Kafka send retries.
+        KAFKA_LINGER_MS (int): Time the producer waits to fill a batch.
+        KAFKA_MAX_BATCH_SIZE (int): Maximum bytes per partition batch.
+        KAFKA_COMPRESSION_TYPE (Optional[str]): Batch compression codec.
+        KAFKA_DLQ_TOPIC (str): Dead-letter topic for given-up messages.
+        KAFKA_SERIALIZER (str): Message encoding, "json" or "binary".
+        RETRY_BASE_DELAY (float): Backoff scale in seconds for retries.
+        RETRY_MAX_DELAY (float): Longest wait in seconds before a retry.
+        PIPELINE_DRAIN_TIMEOUT (float): Seconds running scrape pipelines may
+            take to drain on shutdown.
+        FETCH_MAX_CONNECTIONS (int): Total pooled HTTP connections.
+        FETCH_MAX_CONNECTIONS_PER_HOST (int): Pooled HTTP connections per host.
+        FETCH_KEEPALIVE_TIMEOUT (float): Idle keep-alive time in seconds.
+        FETCH_DNS_CACHE_TTL (int): DNS cache lifetime in seconds.
+        SELENIUM_POOL_SIZE (int): Pre-warmed browsers in the driver pool.
+        SELENIUM_MAX_PAGES (int): Pages served before a browser is recycled.
+        SELENIUM_MAX_RSS_MB (float): Browser memory in MiB that triggers recycling.
+        PLAYWRIGHT_MAX_CONTEXTS (int): Browser contexts rendering at once.
+        RENDER_BACKENDS (Dict[str, str]): Render backend per scraper name,
+            overriding the scraper's own `render_backend`.
     """
 
     KAFKA_BOOTSTRAP_SERVERS: str = Field(
@@ -31,6 +52,75 @@ class Settings(BaseSettings):
         3, description="Maximum number of Kafka send retries."
     )
 
+    KAFKA_LINGER_MS: int = Field(
+        20, description="Time in ms the producer waits to fill a batch."
+    )
+
+    KAFKA_MAX_BATCH_SIZE: int = Field(
+        262144, description="Maximum bytes per partition batch."
+    )
+
+    KAFKA_COMPRESSION_TYPE: Optional[str] = Field(
+        "gzip",
+        description='Batch compression: "gzip", "snappy", "lz4", "zstd" or None; '
+        "all but gzip need their aiokafka extra installed.",
+    )
+
+    KAFKA_DLQ_TOPIC: str = Field(
+        "products.dlq", description="Dead-letter topic for given-up messages."
+    )
+
+    KAFKA_SERIALIZER: str = Field(
+        "json", description='Message encoding: "json" or compact "binary".'
+    )
+
+    RETRY_BASE_DELAY: float = Field(
+        1.0, description="Backoff scale in seconds for publish and scrape retries."
+    )
+
+    RETRY_MAX_DELAY: float = Field(
+        60.0, description="Longest wait in seconds before a retry."
+    )
+
+    PIPELINE_DRAIN_TIMEOUT: float = Field(
+        30.0, description="Seconds scrape pipelines may take to drain on shutdown."
+    )
+
+    FETCH_MAX_CONNECTIONS: int = Field(
+        100, description="Total pooled HTTP connections."
+    )
+
+    FETCH_MAX_CONNECTIONS_PER_HOST: int = Field(
+        8, description="Pooled HTTP connections per host."
+    )
+
+    FETCH_KEEPALIVE_TIMEOUT: float = Field(
+        30.0, description="Idle keep-alive time in seconds."
+    )
+
+    FETCH_DNS_CACHE_TTL: int = Field(300, description="DNS cache lifetime in seconds.")
+
+    SELENIUM_POOL_SIZE: int = Field(
+        2, description="Pre-warmed browsers in the driver pool."
+    )
+
+    SELENIUM_MAX_PAGES: int = Field(
+        50, description="Pages served before a browser is recycled."
+    )
+
+    SELENIUM_MAX_RSS_MB: float = Field(
+        1024, description="Browser memory in MiB that triggers recycling."
+    )
+
+    PLAYWRIGHT_MAX_CONTEXTS: int = Field(
+        8, description="Browser contexts rendering at once."
+    )
+
+    RENDER_BACKENDS: Dict[str, str] = Field(
+        default_factory=dict,
+        description='Render backend per scraper name, e.g. {"vendor_b": "playwright"}.',
+    )
+
     class Config:
         """Pydantic config for Settings.
 
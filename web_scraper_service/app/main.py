@@ -4,3 +4,52 @@ Application entry point for the Web Scraper microservice.
 Configures FastAPI app, includes routes, sets up scheduler,
 and handles startup/shutdown events.
 """
+
+from fastapi import FastAPI
+
+from app.core.config import settings
+from app.services.kafka_producer import close_kafka_producer, get_kafka_producer
+from app.services.pipeline import drain_pipelines
+from app.utils.playwright_driver import close_playwright_pool, get_playwright_pool
+from app.utils.selenium_driver import close_driver_pool, get_driver_pool
+from scrapers.fetch_utils import (
+    close_async_fetcher,
+    close_sync_fetcher,
+    start_async_fetcher,
+)
+
+app = FastAPI(title="Web Scraper Service")
+
+
+@app.on_event("startup")
+async def on_startup() -> None:
+    """Opens long-lived resources shared by all scraping jobs."""
+    await start_async_fetcher(
+        limit=settings.FETCH_MAX_CONNECTIONS,
+        limit_per_host=settings.FETCH_MAX_CONNECTIONS_PER_HOST,
+        keepalive_timeout=settings.FETCH_KEEPALIVE_TIMEOUT,
+        ttl_dns_cache=settings.FETCH_DNS_CACHE_TTL,
+    )
+    # Browsers launch on first checkout, so JS-free deployments never start one.
+    get_driver_pool(
+        size=settings.SELENIUM_POOL_SIZE,
+        max_pages=settings.SELENIUM_MAX_PAGES,
+        max_rss_mb=settings.SELENIUM_MAX_RSS_MB,
+    )
+    get_playwright_pool(max_contexts=settings.PLAYWRIGHT_MAX_CONTEXTS)
+    # One producer for the whole process: connecting per message costs a
+    # broker bootstrap and metadata fetch every time.
+    await get_kafka_producer().start()
+
+
+@app.on_event("shutdown")
+async def on_shutdown() -> None:
+    """Releases long-lived resources opened on startup."""
+    # Let running batches publish what they already fetched before the
+    # producer goes away.
+    await drain_pipelines(settings.PIPELINE_DRAIN_TIMEOUT)
+    await close_kafka_producer()
+    await close_async_fetcher()
+    close_sync_fetcher()
+    close_driver_pool()
+    await close_playwright_pool()
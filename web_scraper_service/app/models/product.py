@@ -10,7 +10,7 @@ Belongs to: Data Modeling
 """
 
 from pydantic import BaseModel, Field, validator
-from typing import Optional
+from typing import ClassVar, Optional
 
 
 class BaseProduct(BaseModel):
@@ -26,8 +26,12 @@ class BaseProduct(BaseModel):
         vendor (str): Vendor name.
         url (str): Product URL.
         available (bool): Availability status.
+        schema_version (ClassVar[int]): Version of the model's field layout,
+            sent with every Kafka message. Bump it when fields change.
     """
 
+    schema_version: ClassVar[int] = 1
+
     name: str = Field(..., description="Product name")
     sku: str = Field(..., description="Stock Keeping Unit, must not be empty")
     price: float = Field(..., gt=0, description="Product price (must be positive)")
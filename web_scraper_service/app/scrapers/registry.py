@@ -4,4 +4,75 @@ Registry module to manage available scraper classes.
 Allows registering, retrieving, and listing scraper implementations
 by category or name, facilitating dynamic scraper invocation
 without hardcoding dependencies.
+
+This is the service-side view of the lazy registry in `scrapers.registry`:
+scrapers are registered as "module:Class" strings (or installed as
+`web_scraper_service.scrapers` entry points) and imported on first use.
 """
+
+from typing import Dict, List, Optional, Type
+
+from scrapers import (
+    ENTRY_POINT_GROUP,
+    SCRAPER_REGISTRY,
+    create_scraper,
+    register_scraper,
+    scraper_names,
+)
+from scrapers.base_scraper import BaseScraper
+
+__all__ = [
+    "ENTRY_POINT_GROUP",
+    "create_scraper",
+    "get_scraper_class",
+    "list_scrapers",
+    "register_scraper",
+    "scrapers_by_category",
+]
+
+
+def get_scraper_class(name: str) -> Type[BaseScraper]:
+    """
+    Get a scraper class by name, importing its module if needed.
+
+    Args:
+        name (str): Registered scraper name.
+
+    Returns:
+        Type[BaseScraper]: The scraper class.
+
+    Raises:
+        ValueError: If no scraper is registered under `name`.
+    """
+    try:
+        return SCRAPER_REGISTRY[name]
+    except KeyError:
+        raise ValueError(f"Unknown scraper type: {name}") from None
+
+
+def list_scrapers(category: Optional[str] = None) -> List[str]:
+    """
+    List registered scraper names, optionally for a single category.
+
+    Args:
+        category (str, optional): Category tag such as "product".
+
+    Returns:
+        List[str]: Scraper names.
+    """
+    return scraper_names(category)
+
+
+def scrapers_by_category() -> Dict[str, List[str]]:
+    """
+    Group registered scraper names by category tag.
+
+    Returns:
+        Dict[str, List[str]]: Category to scraper names; a scraper with
+        several tags appears under each of them.
+    """
+    grouped: Dict[str, List[str]] = {}
+    for name in scraper_names():
+        for category in sorted(SCRAPER_REGISTRY.categories(name)):
+            grouped.setdefault(category, []).append(name)
+    return grouped
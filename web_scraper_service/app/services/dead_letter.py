@@ -0,0 +1,261 @@
+"""Dead-letter topic format and a bulk replay tool.
+
+A dead letter keeps the original message bytes, key and headers unchanged
+(for a failed scrape, the value is a small JSON document naming the scraper
+and URL) and carries the failure metadata in extra record headers:
+
+- `dlq.source`: "publish" or "scrape"
+- `dlq.original_topic`: topic a failed publish was meant for
+- `dlq.error_type` / `dlq.error_message`: the last error
+- `dlq.errors`: JSON list of every attempt's error
+- `dlq.attempts`, `dlq.first_failed_at`, `dlq.failed_at`
+- `dlq.context`: JSON object with extra details, such as the scraper name
+
+`replay_dead_letters` re-drives dead letters in bulk: publishes are resent
+to their original topic with delivery awaited in aggregate, and scrapes are
+run again through the dispatcher. Run it from the command line with:
+
+    python -m app.services.dead_letter --source publish --limit 10000
+"""
+
+import argparse
+import json
+import logging
+import time
+from typing import Any, Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+import anyio
+
+from app.core.config import settings
+from app.services.retry_queue import PUBLISH, SCRAPE, RetryTask
+
+logger = logging.getLogger("dead_letter")
+
+HEADER_PREFIX = "dlq."
+
+Headers = List[Tuple[str, bytes]]
+
+
+def dead_letter_headers(
+    task: RetryTask, original_topic: Optional[str] = None
+) -> Headers:
+    """Builds the headers of a dead letter: the original ones plus metadata.
+
+    Args:
+        task (RetryTask): The task that was given up on.
+        original_topic (str, optional): Topic a failed publish targeted.
+
+    Returns:
+        Headers: Kafka record headers.
+    """
+    error = task.error
+    fields = {
+        "source": task.source,
+        "original_topic": original_topic or "",
+        "error_type": type(error).__name__ if error is not None else "",
+        "error_message": str(error) if error is not None else "",
+        "errors": json.dumps(task.errors),
+        "attempts": str(task.attempt),
+        "first_failed_at": f"{task.first_failed_at:.3f}",
+        "failed_at": f"{time.time():.3f}",
+        "context": json.dumps(task.context, default=str),
+    }
+    return list(task.headers) + [
+        (HEADER_PREFIX + name, value.encode("utf-8")) for name, value in fields.items()
+    ]
+
+
+class DeadLetter(NamedTuple):
+    """A dead letter read back from the topic."""
+
+    source: str
+    original_topic: Optional[str]
+    payload: bytes
+    error_type: str
+    error_message: str
+    errors: List[str]
+    attempts: int
+    first_failed_at: float
+    failed_at: float
+    context: Dict[str, Any]
+    key: Optional[bytes] = None
+    headers: Headers = []
+
+    @classmethod
+    def from_record(cls, record: Any) -> "DeadLetter":
+        """Parses a consumer record from the dead-letter topic.
+
+        Args:
+            record (Any): An `aiokafka` `ConsumerRecord`.
+
+        Returns:
+            DeadLetter: The parsed dead letter.
+
+        Raises:
+            ValueError: If the record lacks the dead-letter headers.
+        """
+        headers = {
+            name[len(HEADER_PREFIX) :]: value.decode("utf-8")
+            for name, value in (record.headers or ())
+            if name.startswith(HEADER_PREFIX)
+        }
+        original_headers = [
+            (name, value)
+            for name, value in (record.headers or ())
+            if not name.startswith(HEADER_PREFIX)
+        ]
+        if "source" not in headers:
+            raise ValueError(f"Not a dead letter: offset {record.offset}")
+        return cls(
+            source=headers["source"],
+            original_topic=headers.get("original_topic") or None,
+            payload=record.value or b"",
+            error_type=headers.get("error_type", ""),
+            error_message=headers.get("error_message", ""),
+            errors=json.loads(headers.get("errors", "[]")),
+            attempts=int(headers.get("attempts", "0")),
+            first_failed_at=float(headers.get("first_failed_at", "0")),
+            failed_at=float(headers.get("failed_at", "0")),
+            context=json.loads(headers.get("context", "{}")),
+            key=record.key,
+            headers=original_headers,
+        )
+
+
+def scrape_payload(scraper_name: str, url: str) -> bytes:
+    """Encodes the payload dead-lettered for a failed scrape."""
+    return json.dumps({"scraper_name": scraper_name, "url": url}).encode("utf-8")
+
+
+async def replay_dead_letters(
+    consumer: Any,
+    producer: Any,
+    dispatcher: Any = None,
+    sources: Sequence[str] = (PUBLISH, SCRAPE),
+    limit: Optional[int] = None,
+    batch_size: int = 500,
+    idle_timeout: float = 5.0,
+) -> Dict[str, int]:
+    """Re-drives dead letters in bulk.
+
+    Reads the dead-letter topic in batches until it has been idle for
+    `idle_timeout` seconds or `limit` letters were handled, and commits the
+    consumer's offsets after each batch. Letters whose replay fails again
+    are dead-lettered anew by the producer or dispatcher, so nothing is
+    lost. Skipped letters are committed too, so replay each source filter
+    under its own consumer group.
+
+    Args:
+        consumer (AIOKafkaConsumer): Started consumer subscribed to the
+            dead-letter topic, with auto-commit disabled.
+        producer (KafkaProducerService): Started producer used for publishes.
+        dispatcher (ScraperDispatcher, optional): Runs failed scrapes again.
+            Default to skipping scrape letters.
+        sources (Sequence[str], optional): Letter sources to replay; others
+            are skipped. Default to publishes and scrapes.
+        limit (int, optional): Maximum letters to read. Default to all.
+        batch_size (int, optional): Records fetched per batch. Default to 500.
+        idle_timeout (float, optional): Seconds without new records after
+            which the replay stops. Default to 5.
+
+    Returns:
+        Dict[str, int]: Counts of "read", "republished", "rescraped",
+        "skipped" and "failed" letters.
+    """
+    counts = {"read": 0, "republished": 0, "rescraped": 0, "skipped": 0, "failed": 0}
+    while limit is None or counts["read"] < limit:
+        max_records = batch_size
+        if limit is not None:
+            max_records = min(batch_size, limit - counts["read"])
+        batches = await consumer.getmany(
+            timeout_ms=int(idle_timeout * 1000), max_records=max_records
+        )
+        records = [record for batch in batches.values() for record in batch]
+        if not records:
+            break
+        counts["read"] += len(records)
+
+        deliveries = []
+        for record in records:
+            try:
+                letter = DeadLetter.from_record(record)
+            except ValueError as e:
+                logger.error("Skipping record: %s", str(e))
+                counts["skipped"] += 1
+                continue
+            if letter.source not in sources:
+                counts["skipped"] += 1
+            elif letter.source == PUBLISH and letter.original_topic:
+                deliveries.append(
+                    await producer.send_message(
+                        letter.payload,
+                        letter.original_topic,
+                        key=letter.key,
+                        headers=letter.headers,
+                    )
+                )
+            elif letter.source == SCRAPE and dispatcher is not None:
+                target = json.loads(letter.payload)
+                await dispatcher.process_product_scraping(
+                    target["scraper_name"], target["url"]
+                )
+                counts["rescraped"] += 1
+            else:
+                counts["skipped"] += 1
+        for error in await producer.wait_delivered(deliveries):
+            counts["republished" if error is None else "failed"] += 1
+        await consumer.commit()
+        logger.info("Replayed dead letters: %s", counts)
+    return counts
+
+
+async def _replay_main(args: argparse.Namespace) -> Dict[str, int]:
+    from aiokafka import AIOKafkaConsumer
+
+    from app.services.dispatcher import ScraperDispatcher
+    from app.services.kafka_producer import close_kafka_producer, get_kafka_producer
+
+    consumer = AIOKafkaConsumer(
+        args.topic,
+        bootstrap_servers=settings.KAFKA_BOOTSTRAP_SERVERS,
+        group_id=args.group_id,
+        enable_auto_commit=False,
+        auto_offset_reset="earliest",
+    )
+    producer = get_kafka_producer()
+    dispatcher = ScraperDispatcher(kafka_producer=producer)
+    await consumer.start()
+    try:
+        await producer.start()
+        return await replay_dead_letters(
+            consumer,
+            producer,
+            dispatcher,
+            sources=args.sources or (PUBLISH, SCRAPE),
+            limit=args.limit,
+        )
+    finally:
+        await consumer.stop()
+        dispatcher.close()
+        await close_kafka_producer()
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """Entrypoint for CLI execution: prints replay counts as JSON."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--topic", default=settings.KAFKA_DLQ_TOPIC)
+    parser.add_argument("--group-id", default="dead-letter-replay")
+    parser.add_argument(
+        "--source",
+        action="append",
+        dest="sources",
+        choices=[PUBLISH, SCRAPE],
+        help="Letter source to replay (repeatable); default: all",
+    )
+    parser.add_argument("--limit", type=int, default=None)
+    args = parser.parse_args(argv)
+    print(json.dumps(anyio.run(_replay_main, args), indent=2))
+
+
+if __name__ == "__main__":
+    main()
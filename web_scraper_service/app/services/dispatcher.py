@@ -5,19 +5,67 @@ manages scraper lifecycle (fetch, parse), error handling,
 and publishing validated product data to Kafka.
 
 Use the scraper registry to dynamically select scraper classes.
+
+`process_batch` runs many URLs through a staged `Pipeline` (fetch, parse,
+validate, publish) with bounded queues and separate workers per stage:
+fetching stays on the event loop, CPU-bound parsing runs on a `ParserPool` of
+worker processes, and backpressure from any stage throttles fetching.
+
+With a `FingerprintIndex`, the dispatcher runs incrementally: pages whose
+normalized content has not changed since they were last published skip
+parsing, validation and the Kafka send.
+
+The Kafka producer is the long-lived, process-wide one owned by the service
+(started on startup, stopped on shutdown); the dispatcher only makes sure it
+is started and never stops it.
+
+Failed scrapes go to the producer's retry queue instead of being dropped:
+they are scraped again after a backoff and, once retries run out, land on the
+dead-letter topic (see `dead_letter` for the replay tool).
 """
 
+import argparse
+import inspect
+import json
 import logging
+import signal
+from functools import partial
+from typing import (
+    Any,
+    AsyncIterable,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+    Union,
+)
+
 import anyio
 
-from app.services.kafka_producer import KafkaProducerService
+from app.core.config import settings
+from app.services.dead_letter import scrape_payload
+from app.services.kafka_producer import (
+    KafkaProducerService,
+    close_kafka_producer,
+    get_kafka_producer,
+)
+from app.services.parse_pool import ParserPool
+from app.services.pipeline import Pipeline, Stage, drain_pipelines
+from app.services.retry_queue import SCRAPE, RetryTask
+from app.services.validators import get_validator
 from app.models.product import LaptopProduct  # Using LaptopProduct as an example
+from app.utils.playwright_driver import configure_renderer
+from scrapers import create_scraper
+from scrapers.fingerprint import FingerprintIndex
 
 logger = logging.getLogger("dispatcher")
 
 
 class MockScraper:
-    """A mock scraper used for testing the dispatcher pipeline."""
+    """A mock scraper that `mock_run` passes to the dispatcher for demos."""
 
     def fetch_html(self, url: str) -> str:
         """Returns mock HTML content for a given URL.
@@ -54,58 +102,340 @@ class MockScraper:
         }
 
 
-def create_scraper(scraper_name: str) -> MockScraper:
-    """Factory to create a scraper instance by name.
+class ScraperDispatcher:
+    """Coordinates scraping, validation, and data publishing workflows."""
 
-    Args:
-        scraper_name (str): The name of the scraper.
+    def __init__(
+        self,
+        fingerprints: Optional[FingerprintIndex] = None,
+        kafka_producer: Optional[KafkaProducerService] = None,
+        parser_pool: Optional[ParserPool] = None,
+    ):
+        """Initializes the ScraperDispatcher with a Kafka producer.
 
-    Returns:
-        MockScraper: The mock scraper instance (stub).
-    """
-    return MockScraper()
+        Args:
+            fingerprints (FingerprintIndex, optional): Index used to skip
+                unchanged pages. Default to None (process every page).
+            kafka_producer (KafkaProducerService, optional): Producer to
+                publish with. Default to the process-wide producer.
+            parser_pool (ParserPool, optional): Pool that parses pages for
+                single scrapes, retries and batches. Default to a pool owned
+                by the dispatcher, started on first use and shut down by
+                `close`.
+        """
+        self.kafka_producer = kafka_producer or get_kafka_producer()
+        self.fingerprints = fingerprints
+        self._owns_parser_pool = parser_pool is None
+        self.parser_pool = parser_pool or ParserPool()
 
+    def close(self) -> None:
+        """Shuts down the dispatcher's own parser pool, if it started one."""
+        if self._owns_parser_pool:
+            self.parser_pool.close()
 
-class ScraperDispatcher:
-    """Coordinates scraping, validation, and data publishing workflows."""
+    def _is_unchanged(self, url: str, html: str) -> Tuple[bool, Optional[str]]:
+        """Checks a page against the fingerprint index, if one is set.
+
+        Args:
+            url (str): The fetched URL.
+            html (str): The fetched HTML.
+
+        Returns:
+            Tuple[bool, Optional[str]]: Whether the page is unchanged, and
+            the digest to record once it is published.
+        """
+        if self.fingerprints is None:
+            return False, None
+        return self.fingerprints.check(url, html)
 
-    def __init__(self):
-        """Initializes the ScraperDispatcher with a Kafka producer."""
-        self.kafka_producer = KafkaProducerService()
+    def _mark_published(self, url: str, digest: Optional[str]) -> None:
+        if digest is not None:
+            self.fingerprints.record(url, digest)
 
-    async def process_product_scraping(self, scraper_name: str, url: str) -> None:
+    async def process_product_scraping(
+        self, scraper_name: str, url: str, scraper: Any = None
+    ) -> None:
         """Orchestrates scraping, validation, and Kafka publishing.
 
+        Failures never propagate: the URL is handed to the producer's retry
+        queue, which scrapes it again after a backoff, or dead-letters it
+        straight away when the scraped data is invalid.
+
+        Args:
+            scraper_name (str): Name of the scraper class to use.
+            url (str): URL to scrape.
+            scraper (optional): Scraper instance to use instead of the
+                registered one, e.g. `MockScraper` for demos. Default to
+                `scrapers.create_scraper(scraper_name)`.
+        """
+        try:
+            await self._scrape_and_publish(scraper_name, url, scraper)
+        except Exception as e:
+            logger.error("Failed to process scraping for %s: %s", url, str(e))
+            self._retry_scrape(scraper_name, url, e, scraper)
+
+    async def _scrape_and_publish(
+        self, scraper_name: str, url: str, scraper: Any = None
+    ) -> bool:
+        """Scrapes one URL and publishes the validated product.
+
         Args:
             scraper_name (str): Name of the scraper class to use.
             url (str): URL to scrape.
+            scraper (optional): See `process_product_scraping`.
+
+        Returns:
+            bool: True if the product was delivered; False if the page was
+            unchanged or the message ended up dead-lettered by the producer.
 
         Raises:
-            Exception: If any step in the pipeline fails.
+            Exception: If fetching, parsing or validation fails.
         """
-        try:
-            # 1. Start the Kafka producer (should ideally be done once globally)
-            await self.kafka_producer.start()
+        # 1. Make sure the shared Kafka producer is running (no-op if so)
+        await self.kafka_producer.start()
+
+        # 2. Instantiate the scraper by name; registered scrapers parse on the
+        # parser pool, an injected instance on a worker thread.
+        if scraper is None:
+            scraper = self._create_scraper(scraper_name)
+            parse = partial(self.parser_pool.parse, scraper_name)
+        else:
+            parse = partial(anyio.to_thread.run_sync, scraper.parse_html)
+
+        # 3. Fetch and parse product data off the event loop
+        html = await self._fetch(scraper, url)
+        unchanged, digest = self._is_unchanged(url, html)
+        if unchanged:
+            logger.info("Product from %s unchanged; skipped.", url)
+            return False
+        parsed = await parse(html, url)
+
+        # 4. Validate product with a Pydantic model
+        product = self._validate(scraper, parsed)
+
+        # 5. Send Kafka and wait for the broker acknowledgement; failed sends
+        # are retried and dead-lettered by the producer itself.
+        delivery = await self.kafka_producer.send_product(product)
+        (error,) = await self.kafka_producer.wait_delivered([delivery])
+        if error is not None:
+            logger.error("Product from %s was dead-lettered: %s", url, str(error))
+            return False
+        self._mark_published(url, digest)
+
+        logger.info("Product from %s sent to Kafka.", url)
+        return True
+
+    @staticmethod
+    def _validate(scraper, parsed: dict) -> LaptopProduct:
+        """Builds the product with the compiled validator of its model.
 
-            # 2. Instantiate the scraper by name
-            scraper = create_scraper(scraper_name)
+        Args:
+            scraper: Scraper that parsed the record; its `trusted_output`
+                skips the type checks.
+            parsed (dict): Parsed product data.
 
-            # 3. Fetch and parse product data (mocked or real)
-            html = scraper.fetch_html(url)
-            parsed = scraper.parse_html(html, url)
+        Returns:
+            LaptopProduct: The validated product.
 
-            # 4. Validate product with a Pydantic model
-            product = LaptopProduct(**parsed)  # Switch model as needed
+        Raises:
+            ValidationError: If the data is invalid.
+        """
+        return get_validator(LaptopProduct).validate_one(  # Switch model as needed
+            parsed, trusted=getattr(scraper, "trusted_output", False)
+        )
 
-            # 5. Send Kafka
-            await self.kafka_producer.send_product(product)
+    def _retry_scrape(
+        self, scraper_name: str, url: str, error: Exception, scraper: Any = None
+    ) -> None:
+        """Queues a failed scrape for a delayed retry or the dead-letter topic.
 
-            logger.info("Product from %s sent to Kafka.", url)
-        except Exception as e:
-            logger.error("Failed to process scraping for %s: %s", url, str(e))
-            # Optionally handle errors, retries, dead letter queue, etc.
-        finally:
-            await self.kafka_producer.stop()  # For test/demo, stop after each
+        Invalid data (`ValueError`, including Pydantic validation errors)
+        would fail the same way again, so it is dead-lettered at once.
+
+        Args:
+            scraper_name (str): Name of the scraper that failed.
+            url (str): URL that failed.
+            error (Exception): The failure.
+            scraper (optional): Scraper instance the retry should use; see
+                `process_product_scraping`.
+        """
+        task = RetryTask(
+            SCRAPE,
+            url,
+            partial(self._scrape_and_publish, scraper_name, url, scraper),
+            payload=scrape_payload(scraper_name, url),
+            context={"scraper_name": scraper_name, "url": url},
+        )
+        self.kafka_producer.retries.submit(
+            task, error, retry=not isinstance(error, ValueError)
+        )
+
+    @staticmethod
+    def _create_scraper(scraper_name: str) -> Any:
+        """Builds a registered scraper with its configured render backend.
+
+        Args:
+            scraper_name (str): Registered scraper name.
+
+        Returns:
+            The scraper instance.
+        """
+        return configure_renderer(
+            create_scraper(scraper_name), settings.RENDER_BACKENDS.get(scraper_name)
+        )
+
+    @staticmethod
+    async def _fetch(scraper, url: str) -> str:
+        """Fetches a page, natively async when the scraper supports it.
+
+        Args:
+            scraper: Scraper instance.
+            url (str): URL to fetch.
+
+        Returns:
+            str: The fetched HTML.
+        """
+        fetch_async = getattr(scraper, "fetch_html_async", None)
+        if inspect.iscoroutinefunction(fetch_async):
+            return await fetch_async(url)
+        return await anyio.to_thread.run_sync(scraper.fetch_html, url)
+
+    async def process_batch(
+        self,
+        scraper_name: str,
+        urls: Union[Iterable[str], AsyncIterable[str]],
+        fetch_concurrency: int = 16,
+        queue_size: int = 64,
+        parser_pool: Optional[ParserPool] = None,
+        delivery_window: int = 500,
+        parse_workers: Optional[int] = None,
+        validate_workers: int = 1,
+        publish_workers: int = 2,
+        log_interval: Optional[float] = None,
+    ) -> Dict[str, int]:
+        """Scrapes many URLs through a fetch, parse, validate, publish pipeline.
+
+        Each stage has its own workers and a queue of at most `queue_size`
+        items in front of it (see `pipeline`), so a slow stage throttles the
+        ones before it: fetching pauses whenever parsing falls behind, and a
+        slow broker holds up publishing and, in turn, everything upstream.
+        Parsing runs on the parser pool's processes. Pages the fingerprint
+        index reports as unchanged are counted and dropped before parsing.
+        Pages are fetched through the render backend set for the scraper in
+        `RENDER_BACKENDS`, or its own `render_backend`.
+
+        Products are sent without waiting for the broker; delivery reports
+        are awaited together every `delivery_window` sends and at the end of
+        the batch, and only delivered pages count as published. A publish
+        worker waits for its window's reports before sending more, which
+        bounds the messages in flight to about `publish_workers` windows.
+
+        `pipeline.drain_pipelines` stops the batch gracefully: no new URLs
+        are taken, and pages already fetched are still published.
+
+        Args:
+            scraper_name (str): Name of the scraper to use.
+            urls (Union[Iterable[str], AsyncIterable[str]]): URLs to scrape;
+                consumed lazily.
+            fetch_concurrency (int, optional): Fetch workers. Default to 16.
+            queue_size (int, optional): Items buffered in front of each
+                stage. Default to 64.
+            parser_pool (ParserPool, optional): Pool to parse on. Default to
+                the dispatcher's `parser_pool`.
+            delivery_window (int, optional): Sends between delivery waits.
+                Default to 500.
+            parse_workers (int, optional): Pages parsed at the same time.
+                Default to the parser pool's process count.
+            validate_workers (int, optional): Validation workers. Default to 1.
+            publish_workers (int, optional): Publish workers. Default to 2.
+            log_interval (float, optional): Seconds between logs of the
+                per-stage stats. Default to logging them only at the end.
+
+        Returns:
+            Dict[str, int]: Counts of fetched, unchanged, parsed, published
+            and failed pages.
+        """
+        stats = {
+            "fetched": 0,
+            "unchanged": 0,
+            "parsed": 0,
+            "published": 0,
+            "failed": 0,
+        }
+        scraper = self._create_scraper(scraper_name)
+        pool = parser_pool or self.parser_pool
+        deliveries = []
+
+        async def settle_deliveries() -> None:
+            batch = deliveries[:]
+            deliveries.clear()
+            errors = await self.kafka_producer.wait_delivered(
+                [delivery for delivery, _, _ in batch]
+            )
+            for (_, url, digest), error in zip(batch, errors):
+                if error is None:
+                    self._mark_published(url, digest)
+                    stats["published"] += 1
+                else:
+                    logger.error("Failed to deliver %s: %s", url, str(error))
+                    stats["failed"] += 1
+
+        async def fetch(url: str) -> Tuple[str, str]:
+            html = await self._fetch(scraper, url)
+            stats["fetched"] += 1
+            return url, html
+
+        async def parse(item: Tuple[str, str]) -> Optional[tuple]:
+            url, html = item
+            unchanged, digest = self._is_unchanged(url, html)
+            if unchanged:
+                stats["unchanged"] += 1
+                return None
+            parsed = await pool.parse(scraper_name, html, url)
+            stats["parsed"] += 1
+            return url, digest, parsed
+
+        async def validate(item: tuple) -> tuple:
+            url, digest, parsed = item
+            return url, digest, self._validate(scraper, parsed)
+
+        async def publish(item: tuple) -> str:
+            url, digest, product = item
+            delivery = await self.kafka_producer.send_product(product)
+            deliveries.append((delivery, url, digest))
+            if len(deliveries) >= delivery_window:
+                await settle_deliveries()
+            return url
+
+        def on_error(step: str) -> Callable[[Any, Exception], None]:
+            def failed(item: Any, error: Exception) -> None:
+                url = item if isinstance(item, str) else item[0]
+                logger.error("Failed to %s %s: %s", step, url, str(error))
+                self._retry_scrape(scraper_name, url, error)
+                stats["failed"] += 1
+
+            return failed
+
+        stages = [
+            Stage("fetch", fetch, fetch_concurrency, queue_size, on_error("fetch")),
+            Stage(
+                "parse",
+                parse,
+                parse_workers or pool.max_workers,
+                queue_size,
+                on_error("parse"),
+            ),
+            Stage(
+                "validate", validate, validate_workers, queue_size, on_error("validate")
+            ),
+            Stage("publish", publish, publish_workers, queue_size, on_error("publish")),
+        ]
+
+        await self.kafka_producer.start()
+        await Pipeline(stages, name=scraper_name).run(urls, log_interval)
+        await settle_deliveries()
+        logger.info("Batch for %s finished: %s", scraper_name, stats)
+        return stats
 
     async def mock_run(self) -> None:
         """Demo/test entrypoint with mocked data.
@@ -114,9 +444,67 @@ class ScraperDispatcher:
         """
         test_scraper = "vendor_a"
         test_url = "http://mocked-url.com/product/123"
-        await self.process_product_scraping(test_scraper, test_url)
+        await self.process_product_scraping(test_scraper, test_url, MockScraper())
 
 
-if __name__ == "__main__":
+async def _drain_on_signal() -> None:
+    with anyio.open_signal_receiver(signal.SIGINT, signal.SIGTERM) as signals:
+        async for signum in signals:
+            logger.info("Received signal %d; draining pipelines.", signum)
+            await drain_pipelines(settings.PIPELINE_DRAIN_TIMEOUT)
+            return
+
+
+def _read_urls(path: str) -> Iterator[str]:
+    with open(0 if path == "-" else path, encoding="utf-8") as lines:
+        for line in lines:
+            if line.strip():
+                yield line.strip()
+
+
+async def _main(args: argparse.Namespace) -> None:
     dispatcher = ScraperDispatcher()
-    anyio.run(dispatcher.mock_run())
+    try:
+        if args.urls is None:
+            await dispatcher.mock_run()
+            return
+        async with anyio.create_task_group() as tg:
+            tg.start_soon(_drain_on_signal)
+            stats = await dispatcher.process_batch(
+                args.scraper,
+                _read_urls(args.urls),
+                fetch_concurrency=args.fetch_workers,
+                queue_size=args.queue_size,
+                parse_workers=args.parse_workers,
+                validate_workers=args.validate_workers,
+                publish_workers=args.publish_workers,
+                log_interval=args.log_interval,
+            )
+            tg.cancel_scope.cancel()
+        print(json.dumps(stats, indent=2))
+    finally:
+        dispatcher.close()
+        await close_kafka_producer()
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """Entrypoint for CLI execution.
+
+    Without `--urls`, runs the mock pipeline once. With it, scrapes every URL
+    in the file (one per line, "-" for stdin) as a batch; SIGINT or SIGTERM
+    drains the batch gracefully.
+    """
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("scraper", nargs="?", default="vendor_a")
+    parser.add_argument("--urls", default=None)
+    parser.add_argument("--fetch-workers", type=int, default=16)
+    parser.add_argument("--parse-workers", type=int, default=None)
+    parser.add_argument("--validate-workers", type=int, default=1)
+    parser.add_argument("--publish-workers", type=int, default=2)
+    parser.add_argument("--queue-size", type=int, default=64)
+    parser.add_argument("--log-interval", type=float, default=10.0)
+    anyio.run(_main, parser.parse_args(argv))
+
+
+if __name__ == "__main__":
+    main()
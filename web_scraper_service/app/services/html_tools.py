@@ -3,4 +3,478 @@ Helper functions for HTML parsing and manipulation.
 
 Provides reusable utilities to extract and clean HTML content,
 ensuring consistent behavior across different scrapers.
+
+Vendors describe what to extract declaratively, as an `ExtractionSpec`
+mapping product fields to `FieldRule`s (CSS or XPath selector, attribute,
+post-processor). A spec is compiled once, when it is registered: every CSS
+selector is translated to XPath and every XPath is precompiled, so per-page
+work is one lxml parse plus a walk of precompiled expressions. Specs that
+set `item_selector` extract every product card of a listing page in the
+same pass.
+
+Many product pages also embed schema.org data as JSON-LD or microdata.
+`extract_structured_product` finds it with a regex scan, without building a
+DOM, and maps it to `BaseProduct` fields. Specs built with
+`structured_data=True` try that fast path first and only run their
+selectors when a required field is still missing.
+
+Belongs to: Web Scraper Service - Services
 """
+
+import json
+import logging
+import re
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple, Type, Union
+from urllib.parse import urljoin
+
+from lxml import etree, html as lxml_html
+from lxml.cssselect import CSSSelector
+from pydantic import BaseModel
+
+logger = logging.getLogger("html_tools")
+
+PostProcessor = Callable[[Any], Any]
+
+_PRICE_RE = re.compile(r"\d[\d.,\s]*")
+_WHITESPACE_RE = re.compile(r"\s+")
+
+DEFAULT_REQUIRED_FIELDS: Tuple[str, ...] = ("name", "sku", "price")
+
+_JSON_LD_RE = re.compile(
+    r"<script[^>]*type\s*=\s*[\"']?application/ld\+json[\"']?[^>]*>(.*?)</script\s*>",
+    re.IGNORECASE | re.DOTALL,
+)
+_MICRODATA_PRODUCT_RE = re.compile(
+    r"itemtype\s*=\s*[\"']https?://schema\.org/Product[\"']", re.IGNORECASE
+)
+_ITEMPROP_RE = re.compile(
+    r"<(\w+)([^>]*?\bitemprop\s*=\s*[\"']([\w\s]+)[\"'][^>]*)>([^<]*)", re.IGNORECASE
+)
+_ATTR_RE = re.compile(
+    r"\b(content|href|src|value)\s*=\s*[\"']([^\"']*)[\"']", re.IGNORECASE
+)
+_SKU_KEYS = ("sku", "mpn", "productID", "gtin13", "gtin12", "gtin")
+
+
+def clean_text(value: Optional[str]) -> Optional[str]:
+    """Collapses whitespace and strips; returns None for empty strings."""
+    if value is None:
+        return None
+    value = _WHITESPACE_RE.sub(" ", value).strip()
+    return value or None
+
+
+def parse_price(value: Optional[str]) -> Optional[float]:
+    """Parses a displayed price such as "$1,299.99" or "1.299,99 EUR".
+
+    Args:
+        value (str, optional): Price text.
+
+    Returns:
+        Optional[float]: The amount, or None if no number is present.
+    """
+    if not value:
+        return None
+    match = _PRICE_RE.search(value)
+    if not match:
+        return None
+    number = match.group(0).replace(" ", "").strip(".,")
+    if "," in number and "." in number:
+        # The right-most separator is the decimal one.
+        if number.rfind(",") > number.rfind("."):
+            number = number.replace(".", "").replace(",", ".")
+        else:
+            number = number.replace(",", "")
+    elif "," in number:
+        head, _, tail = number.rpartition(",")
+        number = (
+            f"{head.replace(',', '')}.{tail}"
+            if len(tail) != 3
+            else number.replace(",", "")
+        )
+    try:
+        return float(number)
+    except ValueError:
+        return None
+
+
+def in_stock(value: Optional[str]) -> bool:
+    """Maps availability text or schema.org URLs to a boolean."""
+    if not value:
+        return False
+    lowered = value.lower()
+    return not any(
+        word in lowered
+        for word in ("out of stock", "outofstock", "sold out", "unavailable")
+    )
+
+
+def _iter_json_ld_nodes(data: Any) -> Iterator[Dict[str, Any]]:
+    if isinstance(data, list):
+        for item in data:
+            yield from _iter_json_ld_nodes(item)
+    elif isinstance(data, dict):
+        yield data
+        if "@graph" in data:
+            yield from _iter_json_ld_nodes(data["@graph"])
+
+
+def _has_type(node: Dict[str, Any], type_name: str) -> bool:
+    types = node.get("@type")
+    types = types if isinstance(types, list) else [types]
+    return any(isinstance(t, str) and t.rsplit("/", 1)[-1] == type_name for t in types)
+
+
+def extract_json_ld(html: str) -> List[Dict[str, Any]]:
+    """Decodes every JSON-LD block in a page without parsing the DOM.
+
+    Malformed blocks are skipped. `@graph` containers and top-level arrays
+    are flattened.
+
+    Args:
+        html (str): Page HTML.
+
+    Returns:
+        List[Dict[str, Any]]: JSON-LD nodes in document order.
+    """
+    nodes = []
+    for match in _JSON_LD_RE.finditer(html):
+        try:
+            data = json.loads(match.group(1).strip())
+        except ValueError:
+            continue
+        nodes.extend(_iter_json_ld_nodes(data))
+    return nodes
+
+
+def _first_offer(offers: Any) -> Dict[str, Any]:
+    if isinstance(offers, list):
+        offers = offers[0] if offers else {}
+    return offers if isinstance(offers, dict) else {}
+
+
+def product_from_json_ld(node: Dict[str, Any]) -> Dict[str, Any]:
+    """Maps a schema.org Product node to `BaseProduct` fields.
+
+    Args:
+        node (Dict[str, Any]): A JSON-LD node of type Product.
+
+    Returns:
+        Dict[str, Any]: The fields that could be read; missing ones are
+        left out.
+    """
+    record: Dict[str, Any] = {}
+    if node.get("name"):
+        record["name"] = clean_text(str(node["name"]))
+    for key in _SKU_KEYS:
+        if node.get(key):
+            record["sku"] = str(node[key]).strip()
+            break
+    offer = _first_offer(node.get("offers"))
+    price = offer.get("price", offer.get("lowPrice"))
+    if price is None and isinstance(offer.get("priceSpecification"), dict):
+        price = offer["priceSpecification"].get("price")
+    if price is not None:
+        price = price if isinstance(price, (int, float)) else parse_price(str(price))
+        if price is not None:
+            record["price"] = float(price)
+    if offer.get("availability"):
+        record["available"] = in_stock(str(offer["availability"]))
+    url = offer.get("url") or node.get("url")
+    if isinstance(url, str) and url:
+        record["url"] = url
+    return {k: v for k, v in record.items() if v is not None}
+
+
+def extract_microdata_product(html: str) -> Dict[str, Any]:
+    """Reads schema.org Product microdata with a flat scan of `itemprop` tags.
+
+    Nested item scopes are not distinguished: the first value of each
+    property in the page wins, which suits single-product pages.
+
+    Args:
+        html (str): Page HTML.
+
+    Returns:
+        Dict[str, Any]: `BaseProduct` fields found; empty if the page has
+        no Product item.
+    """
+    if not _MICRODATA_PRODUCT_RE.search(html):
+        return {}
+    props: Dict[str, str] = {}
+    for match in _ITEMPROP_RE.finditer(html):
+        attrs, text = match.group(2), match.group(4)
+        values = {k.lower(): v for k, v in _ATTR_RE.findall(attrs)}
+        value = values.get("content") or values.get("href") or values.get("value")
+        value = clean_text(value if value is not None else text)
+        if value is None:
+            continue
+        for prop in match.group(3).split():
+            props.setdefault(prop, value)
+    node: Dict[str, Any] = {k: props[k] for k in ("name", "url") if k in props}
+    node.update({k: props[k] for k in _SKU_KEYS if k in props})
+    offer = {k: props[k] for k in ("price", "lowPrice", "availability") if k in props}
+    if offer:
+        node["offers"] = offer
+    return product_from_json_ld(node)
+
+
+def extract_structured_product(html: str) -> Dict[str, Any]:
+    """Extracts product fields from JSON-LD, then microdata, without a DOM.
+
+    Args:
+        html (str): Page HTML.
+
+    Returns:
+        Dict[str, Any]: `BaseProduct` fields found; JSON-LD values take
+        precedence over microdata.
+    """
+    record: Dict[str, Any] = {}
+    if "ld+json" in html:
+        for node in extract_json_ld(html):
+            if _has_type(node, "Product"):
+                record = product_from_json_ld(node)
+                break
+    if "itemprop" in html:
+        for key, value in extract_microdata_product(html).items():
+            record.setdefault(key, value)
+    return record
+
+
+class FieldRule:
+    """How to extract one field.
+
+    Args:
+        selector (str): CSS selector, or an XPath expression when it starts
+            with "/", "./" or "(" (or when `xpath` is set). Within product
+            cards, use relative XPath ("./..."); "//" searches the whole page.
+        attr (str, optional): Attribute to read. Default to the element's
+            whitespace-normalized text.
+        post (PostProcessor, optional): Callable applied to the raw value.
+        many (bool, optional): Return every match as a list instead of the
+            first one. Default to False.
+        default (Any, optional): Value when nothing matches. Default to None.
+        absolute_url (bool, optional): Resolve the value against the page
+            URL, for `href`/`src` attributes. Default to False.
+        xpath (bool, optional): Force XPath interpretation. Default to False.
+    """
+
+    def __init__(
+        self,
+        selector: str,
+        attr: Optional[str] = None,
+        post: Optional[PostProcessor] = None,
+        many: bool = False,
+        default: Any = None,
+        absolute_url: bool = False,
+        xpath: bool = False,
+    ):
+        self.selector = selector
+        self.attr = attr
+        self.post = post
+        self.many = many
+        self.default = default
+        self.absolute_url = absolute_url
+        self.xpath = xpath or selector.startswith(("/", "./", "("))
+
+    def compile(self) -> etree.XPath:
+        """Returns the precompiled XPath for this rule's selector.
+
+        Raises:
+            ValueError: If the selector is not valid CSS or XPath.
+        """
+        try:
+            if self.xpath:
+                return etree.XPath(self.selector)
+            return CSSSelector(self.selector)
+        except Exception as e:
+            raise ValueError(f"Invalid selector {self.selector!r}: {e}") from e
+
+
+class CompiledRule:
+    """A `FieldRule` with its selector compiled; built by `ExtractionSpec`."""
+
+    def __init__(self, name: str, rule: FieldRule):
+        self.name = name
+        self.rule = rule
+        self.query = rule.compile()
+
+    def _value(self, node: Any, url: str) -> Any:
+        if not hasattr(node, "text_content"):
+            value = str(node)
+        elif self.rule.attr:
+            value = node.get(self.rule.attr)
+        else:
+            value = node.text_content()
+        value = clean_text(value)
+        if value is not None and self.rule.absolute_url:
+            value = urljoin(url, value)
+        if self.rule.post is not None:
+            value = self.rule.post(value)
+        return value
+
+    def apply(self, element: Any, url: str) -> Any:
+        """Evaluates the rule on an element (a page root or a product card)."""
+        matches = self.query(element)
+        if not isinstance(matches, list):
+            matches = [matches]
+        if self.rule.many:
+            values = [self._value(m, url) for m in matches]
+            return [v for v in values if v is not None] or self.rule.default
+        for match in matches:
+            value = self._value(match, url)
+            if value is not None:
+                return value
+        return self.rule.default
+
+
+class ExtractionSpec:
+    """Declarative, precompiled extraction spec for one vendor.
+
+    Args:
+        fields (Dict[str, Union[FieldRule, str]]): Product field to rule; a
+            bare string is shorthand for `FieldRule(selector)`.
+        model (Type[BaseModel], optional): Product model the output must fit,
+            e.g. `LaptopProduct`. Field names are checked against it.
+        item_selector (str, optional): Selector matching each product card
+            on a listing page; rules are then evaluated relative to a card.
+        constants (Dict[str, Any], optional): Values added to every record,
+            e.g. `{"vendor": "Vendor A"}`.
+        structured_data (bool, optional): Let `extract` read JSON-LD and
+            microdata first. Default to False.
+        required_fields (Tuple[str, ...], optional): Fields the structured
+            data must supply for selector parsing to be skipped. Default to
+            name, sku and price.
+
+    Raises:
+        ValueError: If a field is not part of `model` or a selector is
+            invalid.
+    """
+
+    def __init__(
+        self,
+        fields: Dict[str, Union[FieldRule, str]],
+        model: Optional[Type[BaseModel]] = None,
+        item_selector: Optional[str] = None,
+        constants: Optional[Dict[str, Any]] = None,
+        structured_data: bool = False,
+        required_fields: Tuple[str, ...] = DEFAULT_REQUIRED_FIELDS,
+    ):
+        self.model = model
+        self.structured_data = structured_data
+        self.required_fields = tuple(required_fields)
+        self.constants = dict(constants or {})
+        if model is not None:
+            unknown = (set(fields) | set(self.constants)) - set(model.__fields__)
+            if unknown:
+                raise ValueError(
+                    f"Fields not in {model.__name__}: {', '.join(sorted(unknown))}"
+                )
+        self.rules = [
+            CompiledRule(name, rule if isinstance(rule, FieldRule) else FieldRule(rule))
+            for name, rule in fields.items()
+        ]
+        self.item_query = FieldRule(item_selector).compile() if item_selector else None
+
+    def _record(self, element: Any, url: str) -> Dict[str, Any]:
+        record = dict(self.constants)
+        for rule in self.rules:
+            record[rule.name] = rule.apply(element, url)
+        if "url" not in record or record["url"] is None:
+            record["url"] = url
+        return record
+
+    def extract(self, html: Union[str, bytes, Any], url: str) -> Dict[str, Any]:
+        """Extracts one product from a product page.
+
+        With `structured_data`, JSON-LD and microdata are read first; the
+        selectors only run, to fill the gaps, when a required field is
+        missing.
+
+        Args:
+            html (Union[str, bytes, Any]): Page HTML, or an already parsed
+                lxml tree.
+            url (str): The page URL, used as `url` unless a rule sets it and
+                as the base for relative links.
+
+        Returns:
+            Dict[str, Any]: Field values keyed like the product model.
+        """
+        if self.structured_data and isinstance(html, (str, bytes)):
+            text = html.decode("utf-8", "replace") if isinstance(html, bytes) else html
+            structured = extract_structured_product(text)
+            if all(structured.get(f) is not None for f in self.required_fields):
+                record = dict(self.constants, url=url)
+                record.update(structured)
+                return record
+            record = self._record(parse_document(html), url)
+            record.update(structured)
+            return record
+        return self._record(parse_document(html), url)
+
+    def extract_all(
+        self, html: Union[str, bytes, Any], url: str
+    ) -> List[Dict[str, Any]]:
+        """Extracts every product card of a listing page in one pass.
+
+        Args:
+            html (Union[str, bytes, Any]): Page HTML, or an already parsed
+                lxml tree.
+            url (str): The listing URL, used as the base for relative links.
+
+        Returns:
+            List[Dict[str, Any]]: One record per card, in document order.
+
+        Raises:
+            ValueError: If the spec has no `item_selector`.
+        """
+        if self.item_query is None:
+            raise ValueError("extract_all requires an item_selector")
+        root = parse_document(html)
+        return [self._record(card, url) for card in self.item_query(root)]
+
+
+def parse_document(html: Union[str, bytes, Any]) -> Any:
+    """Parses HTML with lxml, passing already parsed trees through.
+
+    Args:
+        html (Union[str, bytes, Any]): Markup or an lxml element.
+
+    Returns:
+        Any: The document's root element.
+    """
+    if isinstance(html, (str, bytes)):
+        if not html.strip():
+            return lxml_html.fromstring("<html></html>")
+        return lxml_html.fromstring(html)
+    return html
+
+
+_SPECS: Dict[str, ExtractionSpec] = {}
+
+
+def register_spec(name: str, spec: ExtractionSpec) -> ExtractionSpec:
+    """Registers a vendor's compiled spec under `name`.
+
+    Args:
+        name (str): Vendor or scraper name.
+        spec (ExtractionSpec): The spec; compiled on construction.
+
+    Returns:
+        ExtractionSpec: The registered spec.
+    """
+    _SPECS[name] = spec
+    logger.info("Registered extraction spec for %s.", name)
+    return spec
+
+
+def get_spec(name: str) -> ExtractionSpec:
+    """Returns the spec registered under `name`.
+
+    Raises:
+        KeyError: If no spec is registered for `name`.
+    """
+    try:
+        return _SPECS[name]
+    except KeyError:
+        raise KeyError(f"No extraction spec registered for {name}") from None
@@ -2,13 +2,39 @@
 
 Handles Kafka client configuration, message serialization, and
 publishing data to relevant topics in the ingestion pipeline.
+
+The producer is long-lived: it is started once when the service starts and
+stopped on shutdown (see `get_kafka_producer` / `close_kafka_producer`).
+Sends are fire-and-forget: `send_product` only appends the message to the
+producer's batch for its partition and returns a delivery future, so many
+messages share one broker round trip (`KAFKA_LINGER_MS`,
+`KAFKA_MAX_BATCH_SIZE`, `KAFKA_COMPRESSION_TYPE`). `send_products` and
+`wait_delivered` await delivery reports in aggregate.
+
+Products are encoded by the serializer named by `KAFKA_SERIALIZER` (see
+`serializers`), keyed by vendor and SKU so each product's updates stay in
+order on one partition, and sent with headers naming the encoding and the
+model's schema version.
+
+Failed sends are never retried inline: they go to the producer's
+`RetryScheduler`, which resends them in the background after a backoff and
+publishes them to the dead-letter topic (`KAFKA_DLQ_TOPIC`) once retries are
+exhausted. The delivery future only settles when the message is delivered
+or dead-lettered.
 """
 
+import asyncio
 import logging
-import anyio
+from functools import partial
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
 from aiokafka import AIOKafkaProducer
-from typing import Any
+
 from app.core.config import settings
+from app.services.dead_letter import dead_letter_headers
+from app.services.retry_queue import PUBLISH, RetryScheduler, RetryTask
+from app.services.serializers import get_serializer, message_key
+from scrapers.retry_policy import RetryPolicy
 
 logger = logging.getLogger("kafka_producer")
 
@@ -18,82 +44,338 @@ class KafkaProducerService:
 
     This service initializes a Kafka producer client, serializes product data,
     sends messages with retry logic, and logs results.
+
+    Args:
+        retry_policy (RetryPolicy, optional): Backoff for failed sends.
+            Default to `KAFKA_MAX_RETRIES` attempts with `RETRY_BASE_DELAY`
+            and `RETRY_MAX_DELAY`.
+        serializer (Any, optional): Encodes products, see `serializers`.
+            Default to the one named by `KAFKA_SERIALIZER`.
     """
 
-    def __init__(self):
+    def __init__(
+        self, retry_policy: Optional[RetryPolicy] = None, serializer: Any = None
+    ):
         """Initializes the KafkaProducerService using global settings."""
         self.brokers = settings.KAFKA_BOOTSTRAP_SERVERS
         self.topic = settings.KAFKA_TOPIC
-        self.max_retries = settings.KAFKA_MAX_RETRIES
+        self.dlq_topic = settings.KAFKA_DLQ_TOPIC
+        self.linger_ms = settings.KAFKA_LINGER_MS
+        self.max_batch_size = settings.KAFKA_MAX_BATCH_SIZE
+        self.compression_type = settings.KAFKA_COMPRESSION_TYPE
+        self.serializer = serializer or get_serializer(settings.KAFKA_SERIALIZER)
         self._producer = None  # Will be initialized in start()
+        self._stats = {"sent": 0, "delivered": 0, "failed": 0}
+        self.retries = RetryScheduler(
+            retry_policy
+            or RetryPolicy(
+                max_retries=settings.KAFKA_MAX_RETRIES,
+                base_delay=settings.RETRY_BASE_DELAY,
+                max_delay=settings.RETRY_MAX_DELAY,
+            ),
+            dead_letter=self.send_dead_letter,
+        )
+        self._retry_runner: Optional[asyncio.Task] = None
+        self._deliveries: Set["asyncio.Future"] = set()
+
+    @property
+    def is_started(self) -> bool:
+        """Whether the producer is connected and accepting messages."""
+        return self._producer is not None
 
     async def start(self) -> None:
-        """Initializes and starts the Kafka producer.
+        """Initializes and starts the Kafka producer; a no-op if started.
 
         Raises:
             Exception: If the producer cannot be started.
         """
-        self._producer = AIOKafkaProducer(bootstrap_servers=self.brokers)
-        await self._producer.start()
-        logger.info("Kafka producer started for topic: %s", self.topic)
+        if self._producer is not None:
+            return
+        producer = AIOKafkaProducer(
+            bootstrap_servers=self.brokers,
+            linger_ms=self.linger_ms,
+            max_batch_size=self.max_batch_size,
+            compression_type=self.compression_type,
+        )
+        await producer.start()
+        self._producer = producer
+        self._retry_runner = asyncio.get_running_loop().create_task(self.retries.run())
+        logger.info(
+            "Kafka producer started for topic: %s (linger %d ms, batch %d bytes, "
+            "compression %s, serializer %s)",
+            self.topic,
+            self.linger_ms,
+            self.max_batch_size,
+            self.compression_type,
+            self.serializer.name,
+        )
+
+    async def stop(self, drain_timeout: float = 10.0) -> None:
+        """Flushes pending messages and stops the Kafka producer gracefully.
 
-    async def stop(self) -> None:
-        """Stops the Kafka producer gracefully."""
+        Buffered messages are flushed and their delivery reports awaited
+        first, so that deliveries failing during the flush still reach the
+        retry queue; messages still waiting for a retry are then
+        dead-lettered.
+
+        Args:
+            drain_timeout (float, optional): Seconds allowed for the flush,
+                and again for in-flight retries and dead letters. Default
+                to 10.
+        """
         if self._producer:
-            await self._producer.stop()
-            logger.info("Kafka producer stopped.")
+            try:
+                await asyncio.wait_for(self._flush_deliveries(), drain_timeout)
+            except asyncio.TimeoutError:
+                logger.error(
+                    "Kafka producer stopped with %d delivery report(s) pending",
+                    len(self._deliveries),
+                )
+            await self.retries.close(drain_timeout)
+            if self._retry_runner is not None:
+                await asyncio.gather(self._retry_runner, return_exceptions=True)
+                self._retry_runner = None
+            producer, self._producer = self._producer, None
+            await producer.stop()
+            logger.info(
+                "Kafka producer stopped. Stats: %s, retries: %s",
+                self._stats,
+                self.retries.stats(),
+            )
 
-    async def send_product(self, product_model: Any) -> None:
-        """Serializes and sends product data to Kafka with retries.
+    async def flush(self) -> None:
+        """Waits until every message sent so far has been transmitted."""
+        if self._producer:
+            await self._producer.flush()
+
+    async def _flush_deliveries(self) -> None:
+        await self.flush()
+        if self._deliveries:
+            # Completes after each delivery's `_on_delivery` callback has run.
+            await asyncio.wait(list(self._deliveries))
+
+    async def send_product(self, product_model: Any) -> "asyncio.Future":
+        """Serializes product data and queues it for the next Kafka batch.
+
+        The message is keyed by "vendor:sku" and carries the serializer's
+        headers.
 
         Args:
             product_model (Any): Pydantic model or dict representing the product.
 
+        Returns:
+            asyncio.Future: See `send_message`.
+
         Raises:
             RuntimeError: If producer is not started.
             ValueError: If product_model cannot be serialized.
         """
+        return await self.send_message(
+            self._serialize(product_model),
+            key=message_key(product_model),
+            headers=self.serializer.headers(product_model),
+        )
+
+    async def send_message(
+        self,
+        message: bytes,
+        topic: Optional[str] = None,
+        key: Optional[bytes] = None,
+        headers: Optional[List[Tuple[str, bytes]]] = None,
+    ) -> "asyncio.Future":
+        """Queues already serialized bytes, retrying failures in the background.
+
+        Args:
+            message (bytes): The record value.
+            topic (str, optional): Target topic. Default to `KAFKA_TOPIC`.
+            key (bytes, optional): Record key, which picks the partition.
+                Default to none (spread across partitions).
+            headers (List[Tuple[str, bytes]], optional): Record headers.
+
+        Returns:
+            asyncio.Future: Resolves to the record metadata once delivered,
+            or raises the last error once the message has been dead-lettered.
+
+        Raises:
+            RuntimeError: If producer is not started.
+        """
         if not self._producer:
             raise RuntimeError("Kafka producer is not started. Call start() first.")
 
-        message_bytes = self._serialize(product_model)
-        attempt = 0
+        topic = topic or self.topic
+        result = asyncio.get_running_loop().create_future()
+        result.add_done_callback(self._count_outcome)
+        task = RetryTask(
+            PUBLISH,
+            topic,
+            partial(self._deliver, topic, message, key, headers),
+            payload=message,
+            context={"topic": topic},
+            future=result,
+            record_key=key,
+            headers=headers,
+        )
+        self._stats["sent"] += 1
+        try:
+            delivery = await self._producer.send(
+                topic, message, key=key, headers=headers
+            )
+        except Exception as e:
+            logger.error("Kafka send to '%s' failed: %s", topic, str(e))
+            self.retries.submit(task, e)
+            return result
+        self._deliveries.add(delivery)
+        delivery.add_done_callback(self._deliveries.discard)
+        delivery.add_done_callback(partial(self._on_delivery, task))
+        return result
 
-        while attempt < self.max_retries:
-            try:
-                await self._producer.send_and_wait(self.topic, message_bytes)
-                logger.info(
-                    "Message sent to Kafka topic '%s' on attempt %d",
-                    self.topic,
-                    attempt + 1,
-                )
-                return
-            except Exception as e:
-                logger.error("Kafka send attempt %d failed: %s", attempt + 1, str(e))
-                attempt += 1
-                await anyio.sleep(2)
-        logger.error("All retries failed. Message was not sent to Kafka.")
+    def _on_delivery(self, task: RetryTask, delivery: "asyncio.Future") -> None:
+        if delivery.cancelled():
+            self.retries.submit(task, asyncio.CancelledError(), retry=False)
+        elif delivery.exception() is not None:
+            logger.error(
+                "Kafka delivery to '%s' failed: %s", task.key, delivery.exception()
+            )
+            self.retries.submit(task, delivery.exception())
+        elif not task.future.done():
+            task.future.set_result(delivery.result())
+
+    async def _deliver(
+        self,
+        topic: str,
+        message: bytes,
+        key: Optional[bytes],
+        headers: Optional[List[Tuple[str, bytes]]],
+    ) -> Any:
+        if not self._producer:
+            raise RuntimeError("Kafka producer is stopped.")
+        delivery = await self._producer.send(topic, message, key=key, headers=headers)
+        return await delivery
+
+    def _count_outcome(self, result: "asyncio.Future") -> None:
+        if not result.cancelled() and result.exception() is None:
+            self._stats["delivered"] += 1
+        else:
+            self._stats["failed"] += 1
+
+    async def send_dead_letter(self, task: RetryTask) -> None:
+        """Publishes a given-up task to the dead-letter topic.
+
+        Args:
+            task (RetryTask): A failed publish or scrape.
+
+        Raises:
+            RuntimeError: If producer is not started.
+        """
+        if not self._producer:
+            raise RuntimeError("Kafka producer is not started. Call start() first.")
+        original_topic = task.context.get("topic") if task.source == PUBLISH else None
+        delivery = await self._producer.send(
+            self.dlq_topic,
+            task.payload,
+            key=task.record_key,
+            headers=dead_letter_headers(task, original_topic),
+        )
+        await delivery
+        logger.warning(
+            "Dead-lettered %s of %s to '%s'", task.source, task.key, self.dlq_topic
+        )
 
     @staticmethod
-    def _serialize(product_model: Any) -> bytes:
-        """Serializes the product data into a JSON-encoded bytes object.
+    async def wait_delivered(
+        deliveries: Iterable["asyncio.Future"],
+    ) -> List[Optional[BaseException]]:
+        """Awaits a group of delivery futures together.
+
+        Args:
+            deliveries (Iterable[asyncio.Future]): Futures from `send_product`.
+
+        Returns:
+            List[Optional[BaseException]]: Per delivery, None on success or
+            the delivery error, in input order.
+        """
+        results = await asyncio.gather(*deliveries, return_exceptions=True)
+        return [r if isinstance(r, BaseException) else None for r in results]
+
+    async def send_products(
+        self, products: Iterable[Any], window: int = 1000
+    ) -> Dict[str, int]:
+        """Sends many products and awaits their delivery in aggregate.
+
+        Delivery reports are collected every `window` messages, which bounds
+        the number of outstanding futures for very large iterables.
+
+        Args:
+            products (Iterable[Any]): Pydantic models or dicts; consumed lazily.
+            window (int, optional): Messages sent between delivery waits.
+                Default to 1000.
+
+        Returns:
+            Dict[str, int]: Counts of "delivered" and "failed" messages.
+
+        Raises:
+            RuntimeError: If producer is not started.
+        """
+        counts = {"delivered": 0, "failed": 0}
+        pending: List[asyncio.Future] = []
+
+        async def settle() -> None:
+            for error in await self.wait_delivered(pending):
+                counts["delivered" if error is None else "failed"] += 1
+            pending.clear()
+
+        for product in products:
+            try:
+                pending.append(await self.send_product(product))
+            except ValueError as e:
+                logger.error("Skipping unserializable product: %s", str(e))
+                counts["failed"] += 1
+            if len(pending) >= window:
+                await settle()
+        await settle()
+        logger.info("Bulk send to topic '%s' finished: %s", self.topic, counts)
+        return counts
+
+    def stats(self) -> Dict[str, int]:
+        """Returns counts of sent, delivered and failed messages."""
+        return dict(self._stats)
+
+    def _serialize(self, product_model: Any) -> bytes:
+        """Serializes the product data with the configured serializer.
 
         Args:
             product_model (Any): The product data to serialize.
 
         Returns:
-            bytes: JSON-encoded product data.
+            bytes: Encoded product data.
 
         Raises:
             ValueError: If the input is not serializable.
         """
-        if hasattr(product_model, "json"):
-            return product_model.json().encode("utf-8")
-        elif isinstance(product_model, dict):
-            import json
+        return self.serializer.serialize(product_model)
 
-            return json.dumps(product_model).encode("utf-8")
-        else:
-            raise ValueError(
-                "Cannot serialize product_model: must be a Pydantic model or dict."
-            )
+
+_kafka_producer: Optional[KafkaProducerService] = None
+
+
+def get_kafka_producer() -> KafkaProducerService:
+    """Returns the process-wide producer, creating it if needed.
+
+    The producer connects on its first `start()`; the service starts it on
+    startup and stops it on shutdown.
+
+    Returns:
+        KafkaProducerService: The shared producer.
+    """
+    global _kafka_producer
+    if _kafka_producer is None:
+        _kafka_producer = KafkaProducerService()
+    return _kafka_producer
+
+
+async def close_kafka_producer() -> None:
+    """Flushes and stops the process-wide producer, if one was created."""
+    global _kafka_producer
+    producer, _kafka_producer = _kafka_producer, None
+    if producer is not None:
+        await producer.stop()
@@ -0,0 +1,109 @@
+"""Process pool for CPU-bound HTML parsing.
+
+Moves `parse_html` off the event loop thread so that parsing can use every
+core while the fetch side keeps its requests in flight. Each worker process
+builds a vendor scraper once, through `scrapers.create_scraper`, and reuses it
+for every page it parses.
+
+Belongs to: Web Scraper Service - Services
+"""
+
+import asyncio
+import logging
+import os
+from concurrent.futures import Executor, ProcessPoolExecutor
+from typing import Any, Dict, Optional
+
+from scrapers import BaseScraper, create_scraper
+
+logger = logging.getLogger("parse_pool")
+
+# Scrapers built inside the current worker process, keyed by scraper name.
+_worker_scrapers: Dict[str, BaseScraper] = {}
+
+
+def _get_worker_scraper(scraper_name: str) -> BaseScraper:
+    """Returns this process's scraper for `scraper_name`, building it once.
+
+    Args:
+        scraper_name (str): Registered scraper name.
+
+    Returns:
+        BaseScraper: The cached scraper instance.
+    """
+    scraper = _worker_scrapers.get(scraper_name)
+    if scraper is None:
+        scraper = _worker_scrapers[scraper_name] = create_scraper(scraper_name)
+    return scraper
+
+
+def parse_in_worker(scraper_name: str, html: str, url: str) -> Dict[str, Any]:
+    """Parses one page with the worker's cached scraper.
+
+    Runs inside a pool process, so it must stay a picklable module-level
+    function.
+
+    Args:
+        scraper_name (str): Registered scraper name.
+        html (str): HTML content to parse.
+        url (str): The source URL.
+
+    Returns:
+        Dict[str, Any]: The scraper's parsed data.
+    """
+    return _get_worker_scraper(scraper_name).parse_html(html, url)
+
+
+class ParserPool:
+    """Runs `parse_html` calls on a pool of worker processes.
+
+    Args:
+        max_workers (int, optional): Number of parser processes. Default to
+            the number of CPUs.
+        executor (Executor, optional): Pre-built executor to use instead of a
+            new `ProcessPoolExecutor`; it is not shut down by `close()`.
+    """
+
+    def __init__(
+        self, max_workers: Optional[int] = None, executor: Optional[Executor] = None
+    ):
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self._owns_executor = executor is None
+        self._executor = executor
+
+    def start(self) -> None:
+        """Starts the worker processes if they are not running yet."""
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(max_workers=self.max_workers)
+            logger.info("Parser pool started with %d workers.", self.max_workers)
+
+    def close(self) -> None:
+        """Shuts the worker processes down once pending parses finish."""
+        if self._executor is not None and self._owns_executor:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+            logger.info("Parser pool stopped.")
+
+    async def parse(self, scraper_name: str, html: str, url: str) -> Dict[str, Any]:
+        """Parses one page on a worker without blocking the event loop.
+
+        Args:
+            scraper_name (str): Registered scraper name.
+            html (str): HTML content to parse.
+            url (str): The source URL.
+
+        Returns:
+            Dict[str, Any]: The scraper's parsed data.
+        """
+        self.start()
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self._executor, parse_in_worker, scraper_name, html, url
+        )
+
+    def __enter__(self) -> "ParserPool":
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.close()
@@ -0,0 +1,319 @@
+"""Staged async pipeline with bounded queues between stages.
+
+A `Pipeline` chains `Stage`s, each with its own pool of worker tasks and a
+bounded queue in front of it. Items taken from the source enter the first
+stage's queue; each stage's handler turns an item into the next stage's
+item, or drops it by returning None. Because every queue is bounded, a slow
+stage fills the queue in front of it and blocks the stage before it, all
+the way back to the source: a slow Kafka broker or slow parsing throttles
+fetching instead of letting buffered pages grow without bound.
+
+`Pipeline.stop` drains gracefully: the pipeline stops taking new items from
+the source, cancelling a wait for an async source's next item so that an
+idle source cannot hold the drain up, lets everything already queued flow
+through, and only cancels the workers if draining exceeds the timeout.
+`drain_pipelines` does so for every running pipeline, for service shutdown.
+
+`Pipeline.stats` reports, per stage, the queue depth, the number of blocked
+upstream senders (where backpressure builds), busy workers, item counts and
+handler latency; `log_interval` logs them periodically while running.
+"""
+
+import logging
+import time
+import weakref
+from typing import (
+    Any,
+    AsyncIterable,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Dict,
+    Iterable,
+    List,
+    Optional,
+    Sequence,
+    Union,
+)
+
+import anyio
+from anyio.abc import TaskGroup
+
+logger = logging.getLogger("pipeline")
+
+Handler = Callable[[Any], Awaitable[Any]]
+ErrorHandler = Callable[[Any, Exception], None]
+
+
+class Stage:
+    """One step of a `Pipeline`.
+
+    Counters accumulate across runs of the stage.
+
+    Args:
+        name (str): Stage name used in stats and logs.
+        handler (Handler): Coroutine function called with each item; returns
+            the item for the next stage, or None to drop it.
+        workers (int, optional): Items handled at the same time. Default to 1.
+        queue_size (int, optional): Items buffered in front of the stage.
+            Default to 64.
+        on_error (ErrorHandler, optional): Called with the item and the error
+            when the handler raises; the item is then dropped. Default to
+            logging the error.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        handler: Handler,
+        workers: int = 1,
+        queue_size: int = 64,
+        on_error: Optional[ErrorHandler] = None,
+    ):
+        if workers < 1:
+            raise ValueError(f"Stage {name} needs at least one worker")
+        self.name = name
+        self.handler = handler
+        self.workers = workers
+        self.queue_size = queue_size
+        self.on_error = on_error
+        self.processed = 0
+        self.dropped = 0
+        self.failed = 0
+        self.busy = 0
+        self._latency_total = 0.0
+        self._latency_max = 0.0
+        self._queue: Any = None  # Receive side of the input queue, once running.
+
+    async def process(self, item: Any) -> Any:
+        """Runs the handler on one item, recording counts and latency.
+
+        Args:
+            item (Any): The input item.
+
+        Returns:
+            Any: The handler's result, or None if it dropped the item or
+            failed.
+        """
+        self.busy += 1
+        start = time.perf_counter()
+        try:
+            result = await self.handler(item)
+        except Exception as e:
+            self.failed += 1
+            if self.on_error is not None:
+                self.on_error(item, e)
+            else:
+                logger.error("Stage %s failed on %r: %s", self.name, item, str(e))
+            return None
+        finally:
+            elapsed = time.perf_counter() - start
+            self.busy -= 1
+            self.processed += 1
+            self._latency_total += elapsed
+            self._latency_max = max(self._latency_max, elapsed)
+        if result is None:
+            self.dropped += 1
+        return result
+
+    def stats(self) -> Dict[str, Any]:
+        """Returns queue depth, counters and handler latency of the stage."""
+        queue = self._queue.statistics() if self._queue is not None else None
+        return {
+            "workers": self.workers,
+            "queue_size": self.queue_size,
+            "queue_depth": queue.current_buffer_used if queue else 0,
+            "blocked_senders": queue.tasks_waiting_send if queue else 0,
+            "busy": self.busy,
+            "processed": self.processed,
+            "dropped": self.dropped,
+            "failed": self.failed,
+            "latency_ms_mean": round(
+                self._latency_total / self.processed * 1000 if self.processed else 0.0,
+                3,
+            ),
+            "latency_ms_max": round(self._latency_max * 1000, 3),
+        }
+
+
+class Pipeline:
+    """Runs items through a chain of stages connected by bounded queues.
+
+    Args:
+        stages (Sequence[Stage]): The stages, in order.
+        name (str, optional): Name used in logs. Default to "pipeline".
+
+    Raises:
+        ValueError: If no stages are given.
+    """
+
+    def __init__(self, stages: Sequence[Stage], name: str = "pipeline"):
+        if not stages:
+            raise ValueError("A pipeline needs at least one stage")
+        self.stages = list(stages)
+        self.name = name
+        self.fed = 0
+        self._stopping = False
+        self._cancel_scope: Optional[anyio.CancelScope] = None
+        self._feed_scope: Optional[anyio.CancelScope] = None
+        self._done: Optional[anyio.Event] = None
+
+    @property
+    def running(self) -> bool:
+        """Whether `run` is in progress."""
+        return self._done is not None and not self._done.is_set()
+
+    async def run(
+        self,
+        source: Union[Iterable[Any], AsyncIterable[Any]],
+        log_interval: Optional[float] = None,
+    ) -> Dict[str, Any]:
+        """Feeds the source through the stages until it is exhausted or stopped.
+
+        Args:
+            source (Union[Iterable, AsyncIterable]): Items for the first
+                stage; consumed lazily, only as fast as the pipeline drains.
+            log_interval (float, optional): Seconds between stats log lines.
+                Default to no periodic logging.
+
+        Returns:
+            Dict[str, Any]: Final stats, see `stats`.
+        """
+        self._done = anyio.Event()
+        finished = anyio.Event()
+        _running.add(self)
+        try:
+            async with anyio.create_task_group() as outer:
+                if log_interval:
+                    outer.start_soon(self._log_stats, log_interval, finished)
+                async with anyio.create_task_group() as tg:
+                    self._cancel_scope = tg.cancel_scope
+                    self._start_stages(tg, source)
+                finished.set()
+        finally:
+            _running.discard(self)
+            self._cancel_scope = None
+            self._feed_scope = None
+            self._done.set()
+        stats = self.stats()
+        logger.info("Pipeline %s finished: %s", self.name, stats)
+        return stats
+
+    def _start_stages(
+        self, tg: TaskGroup, source: Union[Iterable, AsyncIterable]
+    ) -> None:
+        streams = [
+            anyio.create_memory_object_stream(stage.queue_size) for stage in self.stages
+        ]
+        for index, stage in enumerate(self.stages):
+            receive = streams[index][1]
+            send = streams[index + 1][0] if index + 1 < len(streams) else None
+            stage._queue = receive
+            for _ in range(stage.workers):
+                tg.start_soon(
+                    self._work,
+                    stage,
+                    receive.clone(),
+                    send.clone() if send is not None else None,
+                )
+            # Each queue closes once every worker holding a clone has exited.
+            receive.close()
+            if send is not None:
+                send.close()
+        tg.start_soon(self._feed, source, streams[0][0])
+
+    async def _feed(self, source: Union[Iterable, AsyncIterable], send: Any) -> None:
+        async with send:
+            if hasattr(source, "__aiter__"):
+                await self._feed_async(source.__aiter__(), send)
+                return
+            if self._stopping:
+                return
+            for item in source:
+                await send.send(item)
+                self.fed += 1
+                if self._stopping:
+                    break
+
+    async def _feed_async(self, source: AsyncIterator[Any], send: Any) -> None:
+        # Only the wait for the next item runs in the feed scope, so `stop`
+        # never cancels a send and loses an item already taken.
+        while not self._stopping:
+            with anyio.CancelScope() as self._feed_scope:
+                try:
+                    item = await source.__anext__()
+                except StopAsyncIteration:
+                    return
+            if self._feed_scope.cancelled_caught:
+                return
+            await send.send(item)
+            self.fed += 1
+
+    async def _work(self, stage: Stage, receive: Any, send: Any) -> None:
+        try:
+            async with receive:
+                async for item in receive:
+                    result = await stage.process(item)
+                    if result is not None and send is not None:
+                        await send.send(result)
+        finally:
+            if send is not None:
+                await send.aclose()
+
+    async def _log_stats(self, interval: float, finished: anyio.Event) -> None:
+        while not finished.is_set():
+            with anyio.move_on_after(interval):
+                await finished.wait()
+            if not finished.is_set():
+                logger.info("Pipeline %s: %s", self.name, self.stats())
+
+    async def stop(self, timeout: Optional[float] = None) -> bool:
+        """Stops taking new items and waits for queued items to drain.
+
+        Args:
+            timeout (float, optional): Seconds to wait before cancelling the
+                workers. Default to waiting until drained.
+
+        Returns:
+            bool: True if the pipeline drained, False if it was cancelled.
+        """
+        self._stopping = True
+        if not self.running:
+            return True
+        if self._feed_scope is not None:
+            self._feed_scope.cancel()
+        with anyio.move_on_after(timeout):
+            await self._done.wait()
+        if self._done.is_set():
+            return True
+        logger.error("Pipeline %s did not drain in time: %s", self.name, self.stats())
+        if self._cancel_scope is not None:
+            self._cancel_scope.cancel()
+        return False
+
+    def stats(self) -> Dict[str, Any]:
+        """Returns the number of items fed and each stage's stats."""
+        return {
+            "fed": self.fed,
+            "stages": {stage.name: stage.stats() for stage in self.stages},
+        }
+
+
+_running: "weakref.WeakSet[Pipeline]" = weakref.WeakSet()
+
+
+def running_pipelines() -> List[Pipeline]:
+    """Returns the pipelines currently running in this process."""
+    return list(_running)
+
+
+async def drain_pipelines(timeout: Optional[float] = None) -> None:
+    """Stops every running pipeline and waits for them to drain.
+
+    Args:
+        timeout (float, optional): Seconds each pipeline may take to drain
+            before it is cancelled. Default to no limit.
+    """
+    async with anyio.create_task_group() as tg:
+        for pipeline in running_pipelines():
+            tg.start_soon(pipeline.stop, timeout)
@@ -0,0 +1,261 @@
+"""Delayed-retry scheduler for failed publishes and scrapes.
+
+Failed work is not retried inline: it is wrapped in a `RetryTask` and handed
+to a `RetryScheduler`, which keeps tasks in a heap ordered by due time and
+re-runs each one in the background once its backoff has elapsed. Callers
+return immediately, so a failing item never stalls healthy ones.
+
+Backoff and the attempt limit come from a `scrapers.retry_policy.RetryPolicy`
+(exponential backoff with full jitter). A task that runs out of attempts, or
+is submitted as not retryable, is passed to the dead-letter callback, which
+normally publishes it to the dead-letter topic (see `dead_letter`).
+"""
+
+import heapq
+import itertools
+import logging
+import time
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+import anyio
+
+from scrapers.retry_policy import RetryPolicy
+
+logger = logging.getLogger("retry_queue")
+
+PUBLISH = "publish"
+SCRAPE = "scrape"
+
+DeadLetterHandler = Callable[["RetryTask"], Awaitable[None]]
+
+
+class RetryTask:
+    """A failed unit of work waiting for its next attempt.
+
+    Args:
+        source (str): What failed, "publish" or "scrape".
+        key (str): Topic or URL the work targets; passed to the retry policy.
+        action (Callable[[], Awaitable[Any]]): Coroutine function re-running
+            the work; raising means the attempt failed.
+        payload (bytes, optional): Original payload, kept for dead-lettering.
+        context (Dict[str, Any], optional): Metadata stored with a dead
+            letter, e.g. the scraper name and URL.
+        future (asyncio.Future, optional): Resolved with the action's result
+            on success, or with the last error once the task is dead-lettered.
+        record_key (bytes, optional): Kafka key of a failed publish.
+        headers (List[Tuple[str, bytes]], optional): Kafka headers of a
+            failed publish, kept on its dead letter.
+    """
+
+    __slots__ = (
+        "source",
+        "key",
+        "action",
+        "payload",
+        "record_key",
+        "headers",
+        "context",
+        "future",
+        "attempt",
+        "errors",
+        "error",
+        "first_failed_at",
+        "dead",
+    )
+
+    def __init__(
+        self,
+        source: str,
+        key: str,
+        action: Callable[[], Awaitable[Any]],
+        payload: bytes = b"",
+        context: Optional[Dict[str, Any]] = None,
+        future: Any = None,
+        record_key: Optional[bytes] = None,
+        headers: Optional[List[Tuple[str, bytes]]] = None,
+    ):
+        self.source = source
+        self.key = key
+        self.action = action
+        self.payload = payload
+        self.record_key = record_key
+        self.headers = list(headers or ())
+        self.context = context or {}
+        self.future = future
+        self.attempt = 1
+        self.errors: List[str] = []
+        self.error: Optional[BaseException] = None
+        self.first_failed_at = time.time()
+        self.dead = False
+
+
+class RetryScheduler:
+    """Runs failed tasks again after a backoff, without blocking the caller.
+
+    `submit` may be called from any code running on the event loop, including
+    future callbacks. `run` must be running (e.g. as a background task) for
+    retries and dead letters to be processed.
+
+    Args:
+        policy (RetryPolicy, optional): Attempt limit and backoff. Default to
+            `RetryPolicy()`.
+        dead_letter (DeadLetterHandler, optional): Called with tasks that are
+            given up on. Default to only logging them.
+        concurrency (int, optional): Tasks of each source re-run at the same
+            time. Publishes and scrapes get separate slots, because a scrape
+            retry waits for its product's delivery, which may itself be a
+            publish retry queued here. Default to 16.
+    """
+
+    def __init__(
+        self,
+        policy: Optional[RetryPolicy] = None,
+        dead_letter: Optional[DeadLetterHandler] = None,
+        concurrency: int = 16,
+    ):
+        self.policy = policy or RetryPolicy()
+        self.dead_letter = dead_letter
+        self.concurrency = concurrency
+        self._heap: List[Tuple[float, int, RetryTask]] = []
+        self._sequence = itertools.count()
+        self._wakeup: Optional[anyio.Event] = None
+        self._cancel_scope: Optional[anyio.CancelScope] = None
+        self._closing = False
+        self._in_flight = 0
+        self._stats = {"scheduled": 0, "succeeded": 0, "dead_lettered": 0}
+
+    def __len__(self) -> int:
+        return len(self._heap) + self._in_flight
+
+    def submit(
+        self, task: RetryTask, error: BaseException, retry: bool = True
+    ) -> Optional[float]:
+        """Records a failed attempt and schedules the task's next step.
+
+        Args:
+            task (RetryTask): The task whose attempt failed.
+            error (BaseException): The error raised by the attempt.
+            retry (bool, optional): False to dead-letter the task right away,
+                for errors that cannot succeed on retry. Default to True.
+
+        Returns:
+            Optional[float]: Seconds until the retry, or None if the task
+            will be dead-lettered.
+        """
+        task.error = error
+        task.errors.append(f"{type(error).__name__}: {error}")
+        delay = None
+        if retry and not self._closing:
+            delay = self.policy.on_failure(task.key, error, task.attempt)
+        if delay is None:
+            task.dead = True
+        else:
+            task.attempt += 1
+            self._stats["scheduled"] += 1
+            logger.info(
+                "Retrying %s of %s in %.2fs (attempt %d)",
+                task.source,
+                task.key,
+                delay,
+                task.attempt,
+            )
+        heapq.heappush(
+            self._heap, (time.monotonic() + (delay or 0.0), next(self._sequence), task)
+        )
+        self._wake()
+        return delay
+
+    def _wake(self) -> None:
+        if self._wakeup is not None:
+            self._wakeup.set()
+
+    async def run(self) -> None:
+        """Processes due tasks until cancelled, or until closed and drained.
+
+        Once `run` returns the scheduler accepts retries again, so it can be
+        run anew after `close`, e.g. when the owning producer restarts.
+        """
+        limits: Dict[str, anyio.Semaphore] = {}
+        try:
+            async with anyio.create_task_group() as tg:
+                self._cancel_scope = tg.cancel_scope
+                while not (self._closing and not len(self)):
+                    now = time.monotonic()
+                    while self._heap and self._heap[0][0] <= now:
+                        _, _, task = heapq.heappop(self._heap)
+                        if task.source not in limits:
+                            limits[task.source] = anyio.Semaphore(self.concurrency)
+                        self._in_flight += 1
+                        tg.start_soon(self._execute, task, limits[task.source])
+                    self._wakeup = anyio.Event()
+                    timeout = self._heap[0][0] - now if self._heap else None
+                    with anyio.move_on_after(timeout):
+                        await self._wakeup.wait()
+        finally:
+            self._closing = False
+            self._cancel_scope = None
+            self._wakeup = None
+
+    async def _execute(self, task: RetryTask, limit: anyio.Semaphore) -> None:
+        try:
+            async with limit:
+                if task.dead:
+                    await self._give_up(task)
+                    return
+                try:
+                    result = await task.action()
+                except Exception as e:
+                    self.submit(task, e)
+                    return
+                self._stats["succeeded"] += 1
+                if task.future is not None and not task.future.done():
+                    task.future.set_result(result)
+        finally:
+            self._in_flight -= 1
+            self._wake()
+
+    async def _give_up(self, task: RetryTask) -> None:
+        logger.error(
+            "Giving up on %s of %s after %d attempt(s): %s",
+            task.source,
+            task.key,
+            task.attempt,
+            task.errors[-1],
+        )
+        if self.dead_letter is not None:
+            try:
+                await self.dead_letter(task)
+                self._stats["dead_lettered"] += 1
+            except Exception as e:
+                logger.error("Failed to dead-letter %s: %s", task.key, str(e))
+        if task.future is not None and not task.future.done():
+            task.future.set_exception(task.error)
+
+    async def close(self, timeout: float = 10.0) -> None:
+        """Dead-letters every pending task and stops `run`.
+
+        Tasks still waiting for their retry are dead-lettered at once, so a
+        shutdown never loses them; they can be re-driven from the dead-letter
+        topic later.
+
+        Args:
+            timeout (float, optional): Seconds to wait for running tasks and
+                dead letters to finish. Default to 10.
+        """
+        self._closing = True
+        self._heap = [(0.0, seq, task) for _, seq, task in self._heap]
+        heapq.heapify(self._heap)
+        for _, _, task in self._heap:
+            task.dead = True
+        self._wake()
+        with anyio.move_on_after(timeout):
+            while len(self):
+                await anyio.sleep(0.01)
+        if len(self):
+            logger.error("Retry queue closed with %d task(s) unfinished", len(self))
+            if self._cancel_scope is not None:
+                self._cancel_scope.cancel()
+
+    def stats(self) -> Dict[str, int]:
+        """Returns retry counters and the number of pending tasks."""
+        return dict(self._stats, pending=len(self))
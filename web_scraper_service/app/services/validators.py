@@ -3,4 +3,391 @@ Custom validation functions for scraped data models.
 
 Provides reusable validators for fields and complex
 business rules beyond standard Pydantic validation.
+
+`BatchValidator` checks many parsed records against one product model in a
+single call. It is compiled once per model class (see `get_validator`):
+fields whose value already has the exact type the model expects (a `str`
+for a `str` field, a `float` within bounds for a constrained float, and so
+on) are accepted with an inline check, and only the model's own validators
+(such as `sku_must_not_be_empty`) run on them. Every other value goes
+through Pydantic's regular field validation, so coercions and error
+messages are the same as with `Model(**record)`.
+
+Invalid records do not stop a batch: `validate` returns the valid products
+together with one `FieldError` per failing field. With `trusted=True` the
+type checks are skipped altogether, for scrapers whose extractors already
+produce correctly typed values (`BaseScraper.trusted_output`); only missing
+required fields are reported.
 """
+
+import math
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    List,
+    NamedTuple,
+    Optional,
+    Set,
+    Tuple,
+    Type,
+)
+
+from pydantic import BaseModel, Extra, ValidationError
+from pydantic.error_wrappers import ErrorWrapper
+from pydantic.errors import MissingError
+from pydantic.fields import SHAPE_SINGLETON, ModelField
+
+_MISSING = object()
+_IMMUTABLE_DEFAULTS = (type(None), bool, int, float, str, bytes, tuple, frozenset)
+
+
+class FieldError(NamedTuple):
+    """One failing field of one record.
+
+    Attributes:
+        row (int): Position of the record in the batch.
+        field (str): Field name, dotted for nested locations.
+        message (str): Pydantic's error message.
+        type (str): Pydantic's error type, e.g. "value_error.missing".
+        value (Any): The offending input value, or None if it was missing.
+    """
+
+    row: int
+    field: str
+    message: str
+    type: str
+    value: Any
+
+
+class BatchResult(NamedTuple):
+    """Outcome of validating a batch of records.
+
+    Attributes:
+        products (List[BaseModel]): Valid products, in input order.
+        rows (List[int]): Batch position of each valid product.
+        errors (List[FieldError]): Errors of the invalid records.
+    """
+
+    products: List[BaseModel]
+    rows: List[int]
+    errors: List[FieldError]
+
+    @property
+    def invalid_rows(self) -> List[int]:
+        """Batch positions of the records that failed validation."""
+        return sorted({error.row for error in self.errors})
+
+    def errors_by_row(self) -> Dict[int, List[FieldError]]:
+        """Groups the errors by batch position."""
+        grouped: Dict[int, List[FieldError]] = {}
+        for error in self.errors:
+            grouped.setdefault(error.row, []).append(error)
+        return grouped
+
+
+def _bounds_check(type_: Any, value_type: type) -> Callable[[Any], bool]:
+    gt, ge = getattr(type_, "gt", None), getattr(type_, "ge", None)
+    lt, le = getattr(type_, "lt", None), getattr(type_, "le", None)
+
+    def check(v: Any) -> bool:
+        return (
+            type(v) is value_type
+            and (gt is None or v > gt)
+            and (ge is None or v >= ge)
+            and (lt is None or v < lt)
+            and (le is None or v <= le)
+        )
+
+    return check
+
+
+def _fast_check(field: ModelField, config: Any) -> Optional[Callable[[Any], bool]]:
+    """Returns an exact-type check that stands in for a field's type validators.
+
+    A value passing the check would be returned unchanged by Pydantic's type
+    validators. Returns None when the field needs the full validation.
+    """
+    if (
+        field.shape != SHAPE_SINGLETON
+        or field.sub_fields
+        or field.pre_validators
+        or any(v.each_item for v in field.class_validators.values())
+    ):
+        return None
+    type_ = field.type_
+    if type_ is str:
+        plain = not (
+            config.anystr_strip_whitespace
+            or config.anystr_upper
+            or config.anystr_lower
+            or config.min_anystr_length
+            or config.max_anystr_length is not None
+        )
+        return (lambda v: type(v) is str) if plain else None
+    if type_ is bool:
+        return lambda v: v is True or v is False
+    if not isinstance(type_, type) or getattr(type_, "multiple_of", None):
+        return None
+    if getattr(type_, "allow_inf_nan", None) is False:
+        return None
+    if issubclass(type_, float):
+        check = _bounds_check(type_, float)
+        if config.allow_inf_nan:
+            return check
+        return lambda v: check(v) and math.isfinite(v)
+    if issubclass(type_, int) and not issubclass(type_, bool):
+        return _bounds_check(type_, int)
+    return None
+
+
+class _CompiledField(NamedTuple):
+    name: str
+    alias: str
+    alt_name: Optional[str]
+    field: ModelField
+    check: Optional[Callable[[Any], bool]]
+    default: Any
+    validate_default: bool
+    post_validators: tuple
+
+
+class BatchValidator:
+    """Validates lists of parsed records against one Pydantic product model.
+
+    Prefer `get_validator`, which compiles each model only once.
+
+    Args:
+        model (Type[BaseModel]): The product model, e.g. `LaptopProduct`.
+    """
+
+    def __init__(self, model: Type[BaseModel]):
+        self.model = model
+        config = model.__config__
+        self._config = config
+        # Root validators and non-default `extra` handling are only applied
+        # by the model itself, so such models are validated one by one.
+        self._compiled = (
+            config.extra is Extra.ignore
+            and not model.__pre_root_validators__
+            and not model.__post_root_validators__
+        )
+        self._fields: Tuple[_CompiledField, ...] = tuple(
+            _CompiledField(
+                name=name,
+                alias=field.alias,
+                alt_name=(
+                    name
+                    if config.allow_population_by_field_name and field.alt_alias
+                    else None
+                ),
+                field=field,
+                check=_fast_check(field, config),
+                default=(
+                    field.default
+                    if field.default_factory is None
+                    and isinstance(field.default, _IMMUTABLE_DEFAULTS)
+                    else _MISSING
+                ),
+                validate_default=config.validate_all or field.validate_always,
+                post_validators=tuple(field.post_validators or ()),
+            )
+            for name, field in model.__fields__.items()
+        )
+
+    def validate(
+        self, rows: Iterable[Dict[str, Any]], trusted: bool = False
+    ) -> BatchResult:
+        """Validates a batch of records.
+
+        Args:
+            rows (Iterable[Dict[str, Any]]): Parsed records, e.g. the output
+                of `parse_html`.
+            trusted (bool, optional): Skip type checks and build products
+                from the values as given; only missing required fields are
+                reported. Default to False.
+
+        Returns:
+            BatchResult: Valid products and the errors of invalid records.
+        """
+        products: List[BaseModel] = []
+        positions: List[int] = []
+        errors: List[FieldError] = []
+        for row, record in enumerate(rows):
+            if trusted:
+                product, row_errors = self._construct_one(record)
+            elif self._compiled:
+                product, row_errors = self._validate_compiled(record)
+            else:
+                product, row_errors = self._validate_model(record)
+            if row_errors:
+                errors.extend(error._replace(row=row) for error in row_errors)
+            else:
+                products.append(product)
+                positions.append(row)
+        return BatchResult(products, positions, errors)
+
+    def validate_one(self, record: Dict[str, Any], trusted: bool = False) -> BaseModel:
+        """Validates a single record.
+
+        Args:
+            record (Dict[str, Any]): A parsed record.
+            trusted (bool, optional): See `validate`. Default to False.
+
+        Returns:
+            BaseModel: The product.
+
+        Raises:
+            ValidationError: If the record is invalid.
+        """
+        if trusted:
+            product, errors = self._construct_one(record, raw=True)
+        elif self._compiled:
+            product, errors = self._validate_compiled(record, raw=True)
+        else:
+            return self.model(**record)
+        if errors:
+            raise ValidationError(errors, self.model)
+        return product
+
+    def construct(self, rows: Iterable[Dict[str, Any]]) -> BatchResult:
+        """Builds products from trusted records; same as `validate(rows, True)`."""
+        return self.validate(rows, trusted=True)
+
+    def _validate_compiled(
+        self, record: Dict[str, Any], raw: bool = False
+    ) -> Tuple[Optional[BaseModel], list]:
+        model, config = self.model, self._config
+        values: Dict[str, Any] = {}
+        fields_set: Set[str] = set()
+        errors: list = []
+        for (
+            name,
+            alias,
+            alt_name,
+            field,
+            check,
+            default,
+            validate_default,
+            post_validators,
+        ) in self._fields:
+            value = record.get(alias, _MISSING)
+            if value is _MISSING and alt_name is not None:
+                value = record.get(alt_name, _MISSING)
+            if value is _MISSING:
+                if field.required:
+                    errors.append(ErrorWrapper(MissingError(), loc=alias))
+                    continue
+                value = field.get_default() if default is _MISSING else default
+                if not validate_default:
+                    values[name] = value
+                    continue
+            else:
+                fields_set.add(name)
+            if check is not None and (
+                (value is None and field.allow_none) or check(value)
+            ):
+                try:
+                    validated = value
+                    for validator in post_validators:
+                        validated = validator(model, validated, values, field, config)
+                    values[name] = validated
+                    continue
+                except (ValueError, TypeError, AssertionError):
+                    pass  # Let Pydantic report the error below.
+            validated, error = field.validate(value, values, loc=alias, cls=model)
+            if error:
+                errors.append(error)
+            else:
+                values[name] = validated
+        if errors:
+            return None, errors if raw else self._field_errors(errors, record)
+        return self._build(values, fields_set), []
+
+    def _validate_model(
+        self, record: Dict[str, Any]
+    ) -> Tuple[Optional[BaseModel], List[FieldError]]:
+        try:
+            return self.model(**record), []
+        except ValidationError as e:
+            return None, self._field_errors(e.raw_errors, record)
+
+    def _construct_one(
+        self, record: Dict[str, Any], raw: bool = False
+    ) -> Tuple[Optional[BaseModel], list]:
+        values: Dict[str, Any] = {}
+        fields_set: Set[str] = set()
+        errors: list = []
+        for name, alias, alt_name, field, _, default, _, _ in self._fields:
+            value = record.get(alias, _MISSING)
+            if value is _MISSING and alt_name is not None:
+                value = record.get(alt_name, _MISSING)
+            if value is _MISSING:
+                if field.required:
+                    errors.append(ErrorWrapper(MissingError(), loc=alias))
+                    continue
+                value = field.get_default() if default is _MISSING else default
+            else:
+                fields_set.add(name)
+            values[name] = value
+        if errors:
+            return None, errors if raw else self._field_errors(errors, record)
+        return self._build(values, fields_set), []
+
+    def _build(self, values: Dict[str, Any], fields_set: Set[str]) -> BaseModel:
+        # Same as `Model.construct`, for values that already hold every field.
+        product = self.model.__new__(self.model)
+        object.__setattr__(product, "__dict__", values)
+        object.__setattr__(product, "__fields_set__", fields_set)
+        product._init_private_attributes()
+        return product
+
+    def _field_errors(
+        self, raw_errors: list, record: Dict[str, Any]
+    ) -> List[FieldError]:
+        return [
+            FieldError(
+                row=0,
+                field=".".join(str(part) for part in error["loc"]),
+                message=error["msg"],
+                type=error["type"],
+                value=record.get(error["loc"][0]) if error["loc"] else None,
+            )
+            for error in ValidationError(raw_errors, self.model).errors()
+        ]
+
+
+_validators: Dict[Type[BaseModel], BatchValidator] = {}
+
+
+def get_validator(model: Type[BaseModel]) -> BatchValidator:
+    """Returns the compiled batch validator of a model, compiling it once.
+
+    Args:
+        model (Type[BaseModel]): The product model.
+
+    Returns:
+        BatchValidator: The model's validator.
+    """
+    validator = _validators.get(model)
+    if validator is None:
+        validator = _validators[model] = BatchValidator(model)
+    return validator
+
+
+def validate_products(
+    model: Type[BaseModel], rows: Iterable[Dict[str, Any]], trusted: bool = False
+) -> BatchResult:
+    """Validates a batch of records against a product model.
+
+    Args:
+        model (Type[BaseModel]): The product model, e.g. `LaptopProduct`.
+        rows (Iterable[Dict[str, Any]]): Parsed records.
+        trusted (bool, optional): See `BatchValidator.validate`.
+            Default to False.
+
+    Returns:
+        BatchResult: Valid products and the errors of invalid records.
+    """
+    return get_validator(model).validate(rows, trusted=trusted)
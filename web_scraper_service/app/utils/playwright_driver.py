@@ -0,0 +1,330 @@
+"""
+Playwright rendering backend.
+
+Runs one headless Chromium per worker process and renders pages in a pool
+of lightweight browser contexts, which share the browser process but keep
+cookies and storage apart. Every context intercepts requests and aborts
+images, fonts, media and known trackers, so only the document, scripts, XHR
+and stylesheets are loaded. `render` returns the DOM as soon as a
+configurable selector is attached, instead of waiting for the full load.
+
+Vendors opt in through `BaseScraper.render_backend` or the
+`RENDER_BACKENDS` setting; see `configure_renderer`. The "tiered" backend
+wraps the pool in a `TieredFetcher`, which renders only the pages a plain
+HTTP fetch cannot serve.
+"""
+
+import asyncio
+import logging
+from contextlib import suppress
+from typing import (
+    Any,
+    Awaitable,
+    Callable,
+    Dict,
+    FrozenSet,
+    Iterable,
+    Optional,
+    Tuple,
+)
+from urllib.parse import urlsplit
+
+from playwright.async_api import Browser, BrowserContext, Route, async_playwright
+from playwright.async_api import TimeoutError as PlaywrightTimeoutError
+
+from scrapers.tiered_fetch import TieredFetcher
+
+logger = logging.getLogger("playwright_driver")
+
+DEFAULT_BLOCKED_RESOURCE_TYPES = frozenset({"image", "font", "media"})
+
+DEFAULT_BLOCKED_HOSTS = frozenset(
+    {
+        "google-analytics.com",
+        "googletagmanager.com",
+        "doubleclick.net",
+        "googlesyndication.com",
+        "facebook.net",
+        "connect.facebook.net",
+        "hotjar.com",
+        "segment.io",
+        "mixpanel.com",
+        "criteo.com",
+        "scorecardresearch.com",
+        "adnxs.com",
+        "taboola.com",
+        "outbrain.com",
+    }
+)
+
+BrowserLauncher = Callable[[], Awaitable[Browser]]
+
+
+def is_blocked_host(host: str, blocked_hosts: Iterable[str]) -> bool:
+    """Returns True if `host` is a blocked domain or one of its subdomains."""
+    host = host.lower()
+    return any(host == b or host.endswith("." + b) for b in blocked_hosts)
+
+
+class PlaywrightPool:
+    """Pool of browser contexts on a single headless Chromium.
+
+    Args:
+        max_contexts (int, optional): Contexts, and so pages, rendering at
+            once. Default to 8.
+        max_pages_per_context (int, optional): Pages rendered before a
+            context is replaced, dropping its cookies and cache. Default
+            to 100.
+        timeout (float, optional): Navigation and selector timeout in
+            seconds. Default to 15.
+        blocked_resource_types (Iterable[str], optional): Playwright resource
+            types to abort. Default to images, fonts and media.
+        blocked_hosts (Iterable[str], optional): Domains whose requests are
+            aborted. Default to `DEFAULT_BLOCKED_HOSTS`.
+        launcher (BrowserLauncher, optional): Coroutine function returning a
+            started `Browser`. Default to launching headless Chromium.
+    """
+
+    def __init__(
+        self,
+        max_contexts: int = 8,
+        max_pages_per_context: int = 100,
+        timeout: float = 15,
+        blocked_resource_types: Optional[Iterable[str]] = None,
+        blocked_hosts: Optional[Iterable[str]] = None,
+        launcher: Optional[BrowserLauncher] = None,
+    ):
+        self.max_contexts = max_contexts
+        self.max_pages_per_context = max_pages_per_context
+        self.timeout = timeout
+        self.blocked_resource_types: FrozenSet[str] = frozenset(
+            DEFAULT_BLOCKED_RESOURCE_TYPES
+            if blocked_resource_types is None
+            else blocked_resource_types
+        )
+        self.blocked_hosts: FrozenSet[str] = frozenset(
+            DEFAULT_BLOCKED_HOSTS if blocked_hosts is None else blocked_hosts
+        )
+        self._launcher = launcher
+        self._playwright: Any = None
+        self._browser: Optional[Browser] = None
+        self._contexts: Optional[asyncio.Queue] = None
+        self._start_lock = asyncio.Lock()
+        self.blocked_requests = 0
+
+    async def _launch(self) -> Browser:
+        if self._launcher is not None:
+            return await self._launcher()
+        if self._playwright is None:
+            self._playwright = await async_playwright().start()
+        return await self._playwright.chromium.launch(headless=True)
+
+    async def _relaunch_if_disconnected(self) -> None:
+        """Replaces a crashed or closed browser; its contexts are all gone."""
+        async with self._start_lock:
+            if self._browser is None or self._browser.is_connected():
+                return
+            logger.warning("Playwright browser disconnected; relaunching.")
+            self._browser = await self._launch()
+
+    async def _route(self, route: Route) -> None:
+        """Aborts heavy or tracking requests and lets the rest through."""
+        request = route.request
+        if request.resource_type in self.blocked_resource_types or is_blocked_host(
+            urlsplit(request.url).hostname or "", self.blocked_hosts
+        ):
+            self.blocked_requests += 1
+            await route.abort()
+        else:
+            await route.continue_()
+
+    async def _open_context(self) -> BrowserContext:
+        context = await self._browser.new_context(java_script_enabled=True)
+        context.set_default_timeout(self.timeout * 1000)
+        await context.route("**/*", self._route)
+        return context
+
+    async def _new_context(self) -> BrowserContext:
+        await self._relaunch_if_disconnected()
+        return await self._open_context()
+
+    async def start(self) -> None:
+        """Launches the browser and its contexts if not running yet."""
+        async with self._start_lock:
+            if self._browser is not None:
+                return
+            self._browser = await self._launch()
+            self._contexts = asyncio.Queue()
+            for _ in range(self.max_contexts):
+                self._contexts.put_nowait((await self._open_context(), 0))
+            logger.info("Playwright pool started with %d contexts.", self.max_contexts)
+
+    async def _checkout(self, timeout: float) -> Tuple[BrowserContext, int]:
+        """Takes a free context, creating one for an empty slot.
+
+        Slots hold None instead of a context when a replacement could not be
+        created; the next checkout of the slot tries again.
+        """
+        context, rendered = await asyncio.wait_for(self._contexts.get(), timeout)
+        if context is None:
+            try:
+                context = await self._new_context()
+            except BaseException:
+                self._contexts.put_nowait((None, 0))
+                raise
+        return context, rendered
+
+    async def _checkin(
+        self, context: BrowserContext, rendered: int, retire: bool
+    ) -> None:
+        """Returns a context to the pool, replacing it if used up or broken.
+
+        The slot always goes back to the pool, empty if the replacement
+        fails, so a browser crash never shrinks the pool.
+        """
+        try:
+            if retire or rendered >= self.max_pages_per_context:
+                with suppress(Exception):
+                    await context.close()
+                context, rendered = None, 0
+                context = await self._new_context()
+        except Exception as e:
+            logger.error("Could not replace a Playwright context: %s", str(e))
+        finally:
+            self._contexts.put_nowait((context, rendered))
+
+    async def render(
+        self,
+        url: str,
+        wait_selector: Optional[str] = None,
+        timeout: Optional[float] = None,
+    ) -> str:
+        """Loads `url` and returns its DOM once it is usable.
+
+        Args:
+            url (str): The URL to render.
+            wait_selector (str, optional): CSS selector marking the content as
+                rendered; the DOM is returned as soon as it is attached.
+                Default to returning at DOMContentLoaded.
+            timeout (float, optional): Seconds for navigation and the
+                selector wait. Default to the pool's timeout.
+
+        Returns:
+            str: The serialized DOM.
+
+        Raises:
+            asyncio.TimeoutError: If no context frees up within the timeout.
+            playwright.async_api.TimeoutError: If the page or selector does
+                not appear in time.
+        """
+        await self.start()
+        timeout = self.timeout if timeout is None else timeout
+        context, rendered = await self._checkout(timeout)
+        page = None
+        retire = False
+        try:
+            page = await context.new_page()
+            await page.goto(url, wait_until="domcontentloaded", timeout=timeout * 1000)
+            if wait_selector:
+                await page.wait_for_selector(
+                    wait_selector, state="attached", timeout=timeout * 1000
+                )
+            return await page.content()
+        except PlaywrightTimeoutError:
+            raise
+        except Exception:
+            # A crashed page or browser: replace the context, don't reuse it.
+            retire = True
+            raise
+        finally:
+            if page is not None:
+                with suppress(Exception):
+                    await page.close()
+            await self._checkin(context, rendered + 1, retire)
+
+    async def close(self) -> None:
+        """Closes every context, the browser and the Playwright driver."""
+        if self._browser is None:
+            return
+        while not self._contexts.empty():
+            context, _ = self._contexts.get_nowait()
+            if context is not None:
+                with suppress(Exception):
+                    await context.close()
+        with suppress(Exception):
+            await self._browser.close()
+        self._browser = None
+        if self._playwright is not None:
+            await self._playwright.stop()
+            self._playwright = None
+        logger.info("Playwright pool stopped.")
+
+    async def __aenter__(self) -> "PlaywrightPool":
+        await self.start()
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb) -> None:
+        await self.close()
+
+
+_playwright_pool: Optional[PlaywrightPool] = None
+# Tiered fetchers per scraper class, so tier decisions outlive single batches.
+_tiered_fetchers: Dict[type, TieredFetcher] = {}
+
+
+def get_playwright_pool(**kwargs) -> PlaywrightPool:
+    """Returns the process-wide Playwright pool, creating it on first use.
+
+    The browser is launched lazily on the first render.
+
+    Args:
+        **kwargs: `PlaywrightPool` arguments, used only when the pool is
+            created.
+
+    Returns:
+        PlaywrightPool: The shared pool.
+    """
+    global _playwright_pool
+    if _playwright_pool is None:
+        _playwright_pool = PlaywrightPool(**kwargs)
+    return _playwright_pool
+
+
+async def close_playwright_pool() -> None:
+    """Closes the process-wide Playwright pool, if it was created."""
+    global _playwright_pool
+    pool, _playwright_pool = _playwright_pool, None
+    _tiered_fetchers.clear()
+    if pool is not None:
+        await pool.close()
+
+
+def configure_renderer(scraper: Any, backend: Optional[str] = None) -> Any:
+    """Attaches the rendering backend a vendor is configured for.
+
+    Args:
+        scraper: Scraper instance; its `renderer` is set in place.
+        backend (str, optional): "http", "playwright" or "tiered". Default
+            to the scraper class's `render_backend` attribute.
+
+    Returns:
+        Any: The same scraper, for chaining.
+
+    Raises:
+        ValueError: If the backend is unknown.
+    """
+    backend = backend or getattr(type(scraper), "render_backend", "http")
+    if backend == "playwright":
+        scraper.renderer = get_playwright_pool()
+    elif backend == "tiered":
+        cls = type(scraper)
+        tiered = _tiered_fetchers.get(cls)
+        if tiered is None:
+            tiered = _tiered_fetchers[cls] = TieredFetcher(
+                get_playwright_pool(),
+                required_selectors=getattr(cls, "required_selectors", ()),
+            )
+        scraper.renderer = tiered
+    elif backend != "http":
+        raise ValueError(f"Unknown render backend: {backend}")
+    return scraper
@@ -3,4 +3,399 @@ Selenium WebDriver setup and utility module.
 
 Provides functions and classes to initialize, configure,
 and manage Selenium browser instances for scraping tasks.
+
+Starting Chrome costs seconds, so browsers are kept warm in a `DriverPool`:
+drivers are launched up front, checked out for a page and returned. A driver
+is replaced when it fails a health check, after `max_pages` pages, or once
+the browser's process tree exceeds `max_rss_mb`, which contains Chrome's
+memory growth on long runs. The chromedriver binary is resolved once per
+process, and pages are waited on with explicit conditions instead of fixed
+sleeps.
 """
+
+import logging
+import os
+import queue
+import threading
+import time
+from contextlib import contextmanager
+from functools import lru_cache
+from typing import Callable, Iterator, List, Optional
+
+from selenium import webdriver
+from selenium.common.exceptions import WebDriverException
+from selenium.webdriver.chrome.service import Service
+from selenium.webdriver.common.by import By
+from selenium.webdriver.remote.webdriver import WebDriver
+from selenium.webdriver.support import expected_conditions as EC
+from selenium.webdriver.support.ui import WebDriverWait
+
+logger = logging.getLogger("selenium_driver")
+
+DriverFactory = Callable[[], WebDriver]
+
+
+@lru_cache(maxsize=1)
+def get_driver_path() -> str:
+    """Resolves the chromedriver binary once per process.
+
+    Uses the `CHROMEDRIVER_PATH` environment variable when set, otherwise
+    `webdriver_manager`, which downloads or locates a matching driver.
+
+    Returns:
+        str: Path to the chromedriver executable.
+    """
+    path = os.environ.get("CHROMEDRIVER_PATH")
+    if path:
+        return path
+    from webdriver_manager.chrome import ChromeDriverManager
+
+    path = ChromeDriverManager().install()
+    logger.info("Resolved chromedriver at %s", path)
+    return path
+
+
+def build_chrome_options(headless: bool = True) -> webdriver.ChromeOptions:
+    """Builds Chrome options tuned for scraping.
+
+    Args:
+        headless (bool, optional): Run without a window. Default to True.
+
+    Returns:
+        webdriver.ChromeOptions: The configured options.
+    """
+    options = webdriver.ChromeOptions()
+    if headless:
+        options.add_argument("--headless=new")
+    options.add_argument("--window-size=1920,1080")
+    options.add_argument("--disable-gpu")
+    options.add_argument("--no-sandbox")
+    options.add_argument("--disable-dev-shm-usage")
+    options.add_argument("--blink-settings=imagesEnabled=false")
+    # Return from get() at DOMContentLoaded; explicit waits cover the rest.
+    options.page_load_strategy = "eager"
+    return options
+
+
+def create_driver(headless: bool = True, page_load_timeout: int = 20) -> WebDriver:
+    """Launches a Chrome WebDriver using the cached driver binary.
+
+    Args:
+        headless (bool, optional): Run without a window. Default to True.
+        page_load_timeout (int, optional): Page load timeout in seconds.
+            Default to 20.
+
+    Returns:
+        WebDriver: The started driver.
+    """
+    driver = webdriver.Chrome(
+        service=Service(get_driver_path()), options=build_chrome_options(headless)
+    )
+    driver.set_page_load_timeout(page_load_timeout)
+    return driver
+
+
+def wait_for_page(
+    driver: WebDriver, wait_selector: Optional[str] = None, timeout: float = 10
+) -> None:
+    """Waits until the document is ready, or until a CSS selector is present.
+
+    Args:
+        driver (WebDriver): The driver to wait on.
+        wait_selector (str, optional): CSS selector that marks the content
+            as rendered. Default to waiting for `document.readyState`.
+        timeout (float, optional): Maximum wait in seconds. Default to 10.
+
+    Raises:
+        selenium.common.exceptions.TimeoutException: If the condition is not
+            met in time.
+    """
+    wait = WebDriverWait(driver, timeout, poll_frequency=0.1)
+    if wait_selector:
+        wait.until(EC.presence_of_element_located((By.CSS_SELECTOR, wait_selector)))
+    else:
+        wait.until(
+            lambda d: d.execute_script("return document.readyState") == "complete"
+        )
+
+
+def _child_pids(pid: int) -> List[int]:
+    children: List[int] = []
+    try:
+        for task in os.listdir(f"/proc/{pid}/task"):
+            with open(f"/proc/{pid}/task/{task}/children") as f:
+                children.extend(int(child) for child in f.read().split())
+    except (OSError, ValueError):
+        pass
+    return children
+
+
+def _process_tree_rss_mb(pid: int) -> Optional[float]:
+    """Returns the resident memory of a process and its descendants in MiB.
+
+    Reads `/proc`, so it is only available on Linux; returns None elsewhere
+    or if the process has exited.
+    """
+    try:
+        page_size = os.sysconf("SC_PAGE_SIZE")
+        with open(f"/proc/{pid}/statm") as f:
+            total = int(f.read().split()[1]) * page_size
+    except (OSError, ValueError):
+        return None
+    stack = _child_pids(pid)
+    while stack:
+        child = stack.pop()
+        try:
+            with open(f"/proc/{child}/statm") as f:
+                total += int(f.read().split()[1]) * page_size
+        except (OSError, ValueError):
+            continue
+        stack.extend(_child_pids(child))
+    return total / (1024 * 1024)
+
+
+class PooledDriver:
+    """A pooled WebDriver with its usage counters.
+
+    Args:
+        driver (WebDriver): The wrapped driver.
+    """
+
+    def __init__(self, driver: WebDriver):
+        self.driver = driver
+        self.pages = 0
+        self.created_at = time.monotonic()
+
+    def rss_mb(self) -> Optional[float]:
+        """Returns the RSS of the driver's process tree in MiB, if known."""
+        process = getattr(getattr(self.driver, "service", None), "process", None)
+        pid = getattr(process, "pid", None)
+        return _process_tree_rss_mb(pid) if isinstance(pid, int) else None
+
+    def is_healthy(self) -> bool:
+        """Returns True if the browser still answers commands."""
+        try:
+            self.driver.execute_script("return 1")
+            return True
+        except WebDriverException:
+            return False
+
+    def quit(self) -> None:
+        """Quits the browser, ignoring errors from an already dead one."""
+        try:
+            self.driver.quit()
+        except Exception as e:
+            logger.warning("Failed to quit driver: %s", str(e))
+
+
+class DriverPool:
+    """Pool of pre-warmed WebDrivers shared by scraping threads.
+
+    Args:
+        size (int, optional): Number of browsers kept running. Default to 2.
+        max_pages (int, optional): Pages served before a driver is recycled.
+            Default to 50.
+        max_rss_mb (float, optional): Browser memory, in MiB, above which a
+            driver is recycled. Default to 1024; None disables the check.
+        checkout_timeout (float, optional): Seconds to wait for a free
+            driver. Default to 30.
+        driver_factory (DriverFactory, optional): Callable starting a new
+            driver. Default to a headless `create_driver`.
+    """
+
+    def __init__(
+        self,
+        size: int = 2,
+        max_pages: int = 50,
+        max_rss_mb: Optional[float] = 1024,
+        checkout_timeout: float = 30,
+        driver_factory: Optional[DriverFactory] = None,
+    ):
+        self.size = size
+        self.max_pages = max_pages
+        self.max_rss_mb = max_rss_mb
+        self.checkout_timeout = checkout_timeout
+        self.driver_factory = driver_factory or create_driver
+        # Idle slots; None is an empty slot whose driver failed to start and
+        # is started again on its next checkout.
+        self._idle: "queue.Queue[Optional[PooledDriver]]" = queue.Queue()
+        self._all: List[PooledDriver] = []
+        self._lock = threading.Lock()
+        self._started = False
+        self._closed = False
+
+    def _spawn(self) -> PooledDriver:
+        pooled = PooledDriver(self.driver_factory())
+        with self._lock:
+            self._all.append(pooled)
+        return pooled
+
+    def _try_spawn(self) -> Optional[PooledDriver]:
+        """Starts a driver, or returns None to leave its slot empty."""
+        try:
+            return self._spawn()
+        except Exception as e:
+            logger.error("Failed to start a driver: %s", str(e))
+            return None
+
+    def _retire(self, pooled: PooledDriver) -> None:
+        with self._lock:
+            if pooled in self._all:
+                self._all.remove(pooled)
+        pooled.quit()
+
+    def start(self) -> None:
+        """Launches the browsers if the pool is not warm yet."""
+        with self._lock:
+            if self._started:
+                return
+            self._started = True
+        for _ in range(self.size):
+            self._idle.put(self._try_spawn())
+        logger.info("Driver pool started with %d browsers.", self.size)
+
+    def _needs_recycling(self, pooled: PooledDriver) -> bool:
+        if pooled.pages >= self.max_pages:
+            logger.info("Recycling driver after %d pages.", pooled.pages)
+            return True
+        if self.max_rss_mb is not None:
+            rss = pooled.rss_mb()
+            if rss is not None and rss > self.max_rss_mb:
+                logger.info("Recycling driver using %.0f MiB.", rss)
+                return True
+        return False
+
+    def acquire(self) -> PooledDriver:
+        """Checks out a healthy driver, replacing dead ones.
+
+        Returns:
+            PooledDriver: A driver reserved for the caller.
+
+        Raises:
+            RuntimeError: If the pool is closed.
+            queue.Empty: If no driver frees up within `checkout_timeout`.
+            Exception: If an empty slot's driver fails to start again; the
+                slot stays in the pool for the next checkout.
+        """
+        if self._closed:
+            raise RuntimeError("Driver pool is closed")
+        self.start()
+        pooled = self._idle.get(timeout=self.checkout_timeout)
+        if pooled is not None and not pooled.is_healthy():
+            logger.warning("Replacing unresponsive driver.")
+            self._retire(pooled)
+            pooled = None
+        if pooled is None:
+            try:
+                pooled = self._spawn()
+            except BaseException:
+                self._idle.put(None)
+                raise
+        return pooled
+
+    def release(self, pooled: PooledDriver, broken: bool = False) -> None:
+        """Returns a driver to the pool, recycling it when due.
+
+        Args:
+            pooled (PooledDriver): Driver from `acquire`.
+            broken (bool, optional): Force a replacement, e.g. after a
+                crash. Default to False.
+        """
+        pooled.pages += 1
+        if self._closed:
+            self._retire(pooled)
+            return
+        if broken or self._needs_recycling(pooled):
+            self._retire(pooled)
+            pooled = self._try_spawn()
+        self._idle.put(pooled)
+
+    @contextmanager
+    def checkout(self) -> Iterator[WebDriver]:
+        """Context manager lending a driver for the duration of the block.
+
+        A `WebDriverException` escaping the block marks the driver broken.
+
+        Yields:
+            WebDriver: The checked-out driver.
+        """
+        pooled = self.acquire()
+        broken = False
+        try:
+            yield pooled.driver
+        except WebDriverException:
+            broken = True
+            raise
+        finally:
+            self.release(pooled, broken)
+
+    def get_page_source(
+        self, url: str, wait_selector: Optional[str] = None, timeout: float = 10
+    ) -> str:
+        """Loads a page on a pooled driver and returns its rendered HTML.
+
+        Args:
+            url (str): The URL to load.
+            wait_selector (str, optional): CSS selector to wait for. Default
+                to waiting for the document to be ready.
+            timeout (float, optional): Explicit wait timeout in seconds.
+                Default to 10.
+
+        Returns:
+            str: The page source after the wait condition is met.
+        """
+        with self.checkout() as driver:
+            driver.get(url)
+            wait_for_page(driver, wait_selector, timeout)
+            return driver.page_source
+
+    def close(self) -> None:
+        """Quits every browser; drivers still checked out quit on release."""
+        self._closed = True
+        while True:
+            try:
+                pooled = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            if pooled is not None:
+                self._retire(pooled)
+        logger.info("Driver pool stopped.")
+
+    def __enter__(self) -> "DriverPool":
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.close()
+
+
+_driver_pool: Optional[DriverPool] = None
+_driver_pool_lock = threading.Lock()
+
+
+def get_driver_pool(**kwargs) -> DriverPool:
+    """Returns the process-wide driver pool, creating it on first use.
+
+    Browsers are launched lazily on the first checkout, so services that
+    never render JavaScript do not pay for them.
+
+    Args:
+        **kwargs: `DriverPool` arguments, used only when the pool is created.
+
+    Returns:
+        DriverPool: The shared pool.
+    """
+    global _driver_pool
+    with _driver_pool_lock:
+        if _driver_pool is None:
+            _driver_pool = DriverPool(**kwargs)
+        return _driver_pool
+
+
+def close_driver_pool() -> None:
+    """Quits the process-wide driver pool's browsers, if it was created."""
+    global _driver_pool
+    with _driver_pool_lock:
+        pool, _driver_pool = _driver_pool, None
+    if pool is not None:
+        pool.close()
@@ -2,20 +2,41 @@
 Scraper's package stub for demo/story purposes.
 
 Provides registry, factory, and utility functions for vendor-specific web scrapers.
+
+Importing the package is cheap: vendor modules (and the fetching stack behind
+`BaseScraper`) are only imported when a scraper is first created or one of
+their classes is accessed. See `scrapers.registry` for plugin registration.
 """
 
-from .base_scraper import BaseScraper, ScrapingException
-from .vendor_a import VendorAScraper
-from .vendor_b import VendorBScraper
+import importlib
+from typing import TYPE_CHECKING, Dict, Iterable, List, Optional, Type
+
+from .registry import ENTRY_POINT_GROUP, ScraperRegistry, ScraperTarget
 
-from typing import Dict, Type
+if TYPE_CHECKING:
+    from .base_scraper import BaseScraper, ScrapingException
+    from .vendor_a import VendorAScraper
+    from .vendor_b import VendorBScraper
 
 __version__ = "1.0.0"
 __author__ = "Web Scraper Service Team"
 
-SCRAPER_REGISTRY: Dict[str, Type[BaseScraper]] = {
-    "vendor_a": VendorAScraper,
-    "vendor_b": VendorBScraper,
+SCRAPER_REGISTRY = ScraperRegistry(
+    {
+        "vendor_a": f"{__name__}.vendor_a:VendorAScraper",
+        "vendor_b": f"{__name__}.vendor_b:VendorBScraper",
+    },
+    categories={
+        "vendor_a": ("product",),
+        "vendor_b": ("product",),
+    },
+)
+
+_LAZY_ATTRIBUTES = {
+    "BaseScraper": "base_scraper",
+    "ScrapingException": "base_scraper",
+    "VendorAScraper": "vendor_a",
+    "VendorBScraper": "vendor_b",
 }
 
 __all__ = [
@@ -25,14 +46,28 @@ __all__ = [
     "ScrapingException",
     "create_scraper",
     "get_available_scrapers",
+    "register_scraper",
+    "scraper_names",
+    "ENTRY_POINT_GROUP",
     "SCRAPER_REGISTRY",
 ]
 
 
-def create_scraper(scraper_type: str, **kwargs) -> BaseScraper:
+def __getattr__(name: str):
+    module = _LAZY_ATTRIBUTES.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f".{module}", __name__), name)
+    globals()[name] = value
+    return value
+
+
+def create_scraper(scraper_type: str, **kwargs) -> "BaseScraper":
     """
     Factory to create a scraper instance by type.
 
+    The scraper's module is imported on the first call for each type.
+
     Args:
         scraper_type (str): Key of the scraper to create (e.g. "vendor_a").
         **kwargs: Additional arguments to pass to the scraper constructor.
@@ -43,35 +78,49 @@ def create_scraper(scraper_type: str, **kwargs) -> BaseScraper:
     Raises:
         ValueError: If scraper_type is not registered.
     """
-    if scraper_type not in SCRAPER_REGISTRY:
-        raise ValueError(f"Unknown scraper type: {scraper_type}")
-    return SCRAPER_REGISTRY[scraper_type](name=scraper_type, **kwargs)
+    return SCRAPER_REGISTRY.create(scraper_type, **kwargs)
+
+
+def scraper_names(category: Optional[str] = None) -> List[str]:
+    """
+    List registered scraper names without importing any scraper module.
 
+    Args:
+        category (str, optional): Only list scrapers tagged with this category.
 
-def get_available_scrapers() -> Dict[str, Type[BaseScraper]]:
+    Returns:
+        List[str]: Scraper names.
+    """
+    return SCRAPER_REGISTRY.names(category)
+
+
+def get_available_scrapers() -> Dict[str, Type["BaseScraper"]]:
     """
     Get all available scraper types.
 
+    This imports every registered scraper; use `scraper_names` when only the
+    names are needed.
+
     Returns:
         Dict[str, Type[BaseScraper]]: Mapping of scraper names to their classes.
     """
-    return SCRAPER_REGISTRY.copy()
+    return dict(SCRAPER_REGISTRY.items())
 
 
-def register_scraper(name: str, scraper_class: Type[BaseScraper]) -> None:
+def register_scraper(
+    name: str, scraper_class: ScraperTarget, categories: Iterable[str] = ()
+) -> None:
     """
     Register a new scraper class in the registry.
 
     Args:
         name (str): Name to register the scraper under.
-        scraper_class (Type[BaseScraper]): Scraper class to register.
+        scraper_class (ScraperTarget): Scraper class to register, or a
+            "module:Class" string to import it from on first use.
+        categories (Iterable[str], optional): Category tags for lookup.
 
     Raises:
         TypeError: If scraper_class does not inherit from BaseScraper.
         ValueError: If name is already in use.
     """
-    if not issubclass(scraper_class, BaseScraper):
-        raise TypeError("scraper_class must inherit from BaseScraper")
-    if name in SCRAPER_REGISTRY:
-        raise ValueError(f"Scraper '{name}' is already registered")
-    SCRAPER_REGISTRY[name] = scraper_class
+    SCRAPER_REGISTRY.register(name, scraper_class, categories)
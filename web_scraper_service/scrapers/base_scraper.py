@@ -4,8 +4,27 @@ Base scraper stub for demonstration purposes.
 Defines the interface and minimal logic for all vendor-specific scrapers.
 """
 
+import asyncio
+import threading
+import time
 from abc import ABC, abstractmethod
-from typing import Dict, Any, List
+from typing import (
+    Any,
+    AsyncIterable,
+    AsyncIterator,
+    Dict,
+    Iterable,
+    List,
+    Optional,
+    Tuple,
+    Union,
+)
+
+from . import fetch_utils
+from .fetch_utils import AsyncFetcher
+from .fingerprint import FingerprintIndex
+from .html_archive import HtmlArchive
+from .partial_parse import parse_regions, soup_regions
 
 
 class BaseScraper(ABC):
@@ -15,18 +34,58 @@ class BaseScraper(ABC):
     Provides a minimal interface for vendor-specific scrapers, including
     method signatures for fetching and parsing HTML, as well as batch scraping.
 
+    Class attributes select how a vendor's pages are fetched:
+    `render_backend` is "http" for plain fetches, "playwright" for pages
+    that need a browser, or "tiered" to try HTTP first and render only pages
+    missing `required_selectors` or that look JavaScript-gated;
+    `wait_selector` is the CSS selector that marks a rendered page as ready.
+    `target_regions` lists the containers (`tag#id.class` selectors) that
+    hold the data, so `parse_targets` can skip building the rest of the DOM.
+    `categories` tags the scraper (e.g. "product") for registry lookups.
+    `trusted_output` declares that `parse_html` already returns correctly
+    typed values, so the dispatcher builds products without type checks.
+
     Args:
         name (str): Unique name or type of the scraper.
         timeout (int, optional): Timeout for page loads or requests (default: 20).
         headless (bool, optional): Whether to run the scraper in headless mode (default: True).
+        fetcher (AsyncFetcher, optional): Pooled HTTP fetcher for async fetches
+            (default: the process-wide shared fetcher).
+        fingerprints (FingerprintIndex, optional): Enables incremental mode:
+            pages whose normalized content is unchanged since they were last
+            scraped skip parsing (default: None).
+        renderer (optional): Async rendering backend with a
+            `render(url, wait_selector)` coroutine, such as a Playwright
+            pool; when set, `fetch_html_async` renders pages through it
+            (default: None).
     """
 
-    def __init__(self, name: str, timeout: int = 20, headless: bool = True):
+    render_backend: str = "http"
+    wait_selector: Optional[str] = None
+    required_selectors: Tuple[str, ...] = ()
+    target_regions: Tuple[str, ...] = ()
+    categories: Tuple[str, ...] = ()
+    trusted_output: bool = False
+
+    def __init__(
+        self,
+        name: str,
+        timeout: int = 20,
+        headless: bool = True,
+        fetcher: Optional[AsyncFetcher] = None,
+        fingerprints: Optional[FingerprintIndex] = None,
+        renderer: Optional[Any] = None,
+    ):
         self.name = name
         self.timeout = timeout
         self.headless = headless
+        self.fetcher = fetcher
+        self.fingerprints = fingerprints
+        self.renderer = renderer
         self.driver = None
         self.logger = None
+        self._archives: Dict[str, HtmlArchive] = {}
+        self._archives_lock = threading.Lock()
 
     @abstractmethod
     def fetch_html(self, url: str) -> str:
@@ -44,6 +103,23 @@ class BaseScraper(ABC):
         """
         pass
 
+    async def fetch_html_async(self, url: str) -> str:
+        """
+        Fetch raw HTML asynchronously over the pooled HTTP session.
+
+        When a `renderer` is attached, the page is rendered through it
+        instead, waiting for `wait_selector`.
+
+        Args:
+            url (str): The URL to fetch.
+
+        Returns:
+            str: HTML content as a string.
+        """
+        if self.renderer is not None:
+            return await self.renderer.render(url, self.wait_selector)
+        return await fetch_utils.fetch_html_async(url, fetcher=self.fetcher)
+
     @abstractmethod
     def parse_html(self, html: str, url: str) -> Dict[str, Any]:
         """
@@ -61,29 +137,95 @@ class BaseScraper(ABC):
         """
         pass
 
+    def parse_targets(self, html: str, backend: str = "lxml") -> Any:
+        """
+        Parse only the scraper's `target_regions` of a page.
+
+        The "lxml" backend streams the page and returns the region subtrees
+        as a list of lxml elements; the "soup" backend returns a
+        BeautifulSoup holding just those regions. Without `target_regions`
+        the whole page is parsed.
+
+        Args:
+            html (str): HTML content as a string.
+            backend (str, optional): "lxml" or "soup" (default: "lxml").
+
+        Returns:
+            Any: List of lxml elements, or a BeautifulSoup object.
+
+        Raises:
+            ValueError: If the backend is unknown.
+        """
+        regions = self.target_regions or ("html",)
+        if backend == "lxml":
+            return parse_regions(html, regions)
+        if backend == "soup":
+            return soup_regions(html, regions)
+        raise ValueError(f"Unknown parse backend: {backend}")
+
     def scrape(
         self, url: str, save_html: bool = True, output_folder: str = "./scraped_pages"
     ) -> Dict[str, Any]:
         """
         Run a complete scrape for a single URL.
 
+        When `save_html` is set, the page is stored in the content-addressed
+        `HtmlArchive` kept in `output_folder`, and its content hash is
+        returned as `html_hash`.
+
+        In incremental mode (`fingerprints` set), a page whose normalized
+        content matches the last successful scrape is not parsed; the result
+        has `unchanged` set and empty `data`, and the page's freshness is
+        still recorded.
+
         Args:
             url (str): URL to scrape.
-            save_html (bool, optional): Whether to save HTML to disk (default: True).
-            output_folder (str, optional): Folder to save HTML files (default: "./scraped_pages").
+            save_html (bool, optional): Whether to archive the HTML (default: True).
+            output_folder (str, optional): Archive folder (default: "./scraped_pages").
 
         Returns:
-            Dict[str, Any]: Scrape result with metadata and (dummy) data.
+            Dict[str, Any]: Scrape result with metadata and data.
         """
+        try:
+            html = self.fetch_html(url)
+            unchanged, digest = False, None
+            if self.fingerprints is not None:
+                unchanged, digest = self.fingerprints.check(url, html)
+            data = {} if unchanged else self.parse_html(html, url)
+            html_hash = (
+                self.archive(output_folder).put(url, html) if save_html else None
+            )
+            if digest is not None and not unchanged:
+                self.fingerprints.record(url, digest)
+        except Exception as e:
+            return self._error_result(url, str(e))
         return {
             "url": url,
             "scraper": self.name,
             "success": True,
-            "data": {},
+            "data": data,
             "error": None,
             "html_file": None,
+            "html_hash": html_hash,
+            "unchanged": unchanged,
         }
 
+    def archive(self, output_folder: str = "./scraped_pages") -> HtmlArchive:
+        """
+        Get the HTML archive for a folder, opening it on first use.
+
+        Args:
+            output_folder (str, optional): Archive folder (default: "./scraped_pages").
+
+        Returns:
+            HtmlArchive: The archive stored in `output_folder`.
+        """
+        with self._archives_lock:
+            archive = self._archives.get(output_folder)
+            if archive is None:
+                archive = self._archives[output_folder] = HtmlArchive(output_folder)
+        return archive
+
     def scrape_multiple(
         self,
         urls: List[str],
@@ -103,6 +245,150 @@ class BaseScraper(ABC):
         """
         return [self.scrape(url, save_html, output_folder) for url in urls]
 
+    async def ascrape(
+        self, url: str, save_html: bool = True, output_folder: str = "./scraped_pages"
+    ) -> Dict[str, Any]:
+        """
+        Run a complete scrape for a single URL without blocking the event loop.
+
+        The default implementation bridges to the synchronous `scrape` on a
+        worker thread; scrapers with a native async path may override it.
+
+        Args:
+            url (str): URL to scrape.
+            save_html (bool, optional): Whether to save HTML to disk (default: True).
+            output_folder (str, optional): Folder to save HTML files (default: "./scraped_pages").
+
+        Returns:
+            Dict[str, Any]: Scrape result with metadata and data.
+        """
+        return await asyncio.to_thread(self.scrape, url, save_html, output_folder)
+
+    def _error_result(self, url: str, error: str) -> Dict[str, Any]:
+        """
+        Build a failed scrape result in the same shape as `scrape`.
+
+        Args:
+            url (str): URL that failed.
+            error (str): Error description.
+
+        Returns:
+            Dict[str, Any]: Scrape result marked as unsuccessful.
+        """
+        return {
+            "url": url,
+            "scraper": self.name,
+            "success": False,
+            "data": {},
+            "error": error,
+            "html_file": None,
+            "html_hash": None,
+            "unchanged": False,
+        }
+
+    async def _ascrape_one(
+        self,
+        url: str,
+        url_timeout: Optional[float],
+        save_html: bool,
+        output_folder: str,
+    ) -> Dict[str, Any]:
+        try:
+            return await asyncio.wait_for(
+                self.ascrape(url, save_html, output_folder), url_timeout
+            )
+        except asyncio.TimeoutError:
+            return self._error_result(url, f"Timed out after {url_timeout} seconds")
+        except Exception as e:
+            return self._error_result(url, str(e))
+
+    async def ascrape_multiple(
+        self,
+        urls: Union[Iterable[str], AsyncIterable[str]],
+        concurrency: int = 8,
+        url_timeout: Optional[float] = None,
+        batch_timeout: Optional[float] = None,
+        save_html: bool = True,
+        output_folder: str = "./scraped_pages",
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Scrape many URLs concurrently, yielding results as they complete.
+
+        URLs are pulled lazily from `urls`, so at most `concurrency` scrapes
+        are in flight and the input is never materialized. Failures and
+        per-URL timeouts are yielded as unsuccessful results rather than
+        raised. When `batch_timeout` expires, in-flight scrapes are
+        cancelled and yielded as timed out, and `urls` is not read any
+        further: URLs that were never started stay in the iterator, so the
+        caller can pass the same iterator to a later batch or record them.
+        Sync scrapes bridged to worker threads cannot be interrupted; a
+        cancelled one finishes in its thread and its result is discarded.
+
+        Args:
+            urls (Union[Iterable[str], AsyncIterable[str]]): URLs to scrape.
+            concurrency (int, optional): Maximum scrapes in flight (default: 8).
+            url_timeout (float, optional): Deadline per URL in seconds (default: None).
+            batch_timeout (float, optional): Deadline for the whole batch in seconds (default: None).
+            save_html (bool, optional): Whether to save HTML to disk (default: True).
+            output_folder (str, optional): Folder to save HTML files (default: "./scraped_pages").
+
+        Yields:
+            Dict[str, Any]: Scrape results, in completion order.
+        """
+        if isinstance(urls, AsyncIterable):
+            source = urls.__aiter__()
+
+            async def next_url() -> str:
+                return await source.__anext__()
+
+        else:
+            sync_source = iter(urls)
+
+            async def next_url() -> str:
+                try:
+                    return next(sync_source)
+                except StopIteration:
+                    raise StopAsyncIteration from None
+
+        deadline = None if batch_timeout is None else time.monotonic() + batch_timeout
+        pending: Dict[asyncio.Task, str] = {}
+        exhausted = False
+        try:
+            while True:
+                while not exhausted and len(pending) < concurrency:
+                    if deadline is not None and time.monotonic() >= deadline:
+                        break
+                    try:
+                        url = await next_url()
+                    except StopAsyncIteration:
+                        exhausted = True
+                        break
+                    task = asyncio.ensure_future(
+                        self._ascrape_one(url, url_timeout, save_html, output_folder)
+                    )
+                    pending[task] = url
+                if not pending:
+                    return
+                remaining = None
+                if deadline is not None:
+                    remaining = max(deadline - time.monotonic(), 0)
+                done, _ = await asyncio.wait(
+                    pending, timeout=remaining, return_when=asyncio.FIRST_COMPLETED
+                )
+                if not done:
+                    for task, url in pending.items():
+                        task.cancel()
+                        yield self._error_result(
+                            url, f"Batch timed out after {batch_timeout} seconds"
+                        )
+                    return
+                for task in done:
+                    pending.pop(task)
+                    yield task.result()
+        finally:
+            for task in pending:
+                task.cancel()
+
     def __enter__(self) -> "BaseScraper":
         """
         Context manager entry. Used for resource management in subclasses.
@@ -114,14 +400,17 @@ class BaseScraper(ABC):
 
     def __exit__(self, exc_type, exc_val, exc_tb) -> None:
         """
-        Context manager exit. Used for cleanup in subclasses.
+        Context manager exit. Closes open HTML archives; subclasses extend it.
 
         Args:
             exc_type: Exception type (if any).
             exc_val: Exception value (if any).
             exc_tb: Traceback object (if any).
         """
-        pass
+        with self._archives_lock:
+            for archive in self._archives.values():
+                archive.close()
+            self._archives.clear()
 
 
 class ScrapingException(Exception):
@@ -4,17 +4,63 @@ This module provides utility functions for fetching HTML contents both synchrono
 (using requests) and asynchronously (using aiohttp). It includes support for
 retries and platform-specific timeout handling.
 
+The async path shares one pooled `aiohttp.ClientSession` per process through
+`AsyncFetcher`, so connections, TLS sessions and DNS lookups are reused across
+requests to the same vendor hosts. Call `start_async_fetcher()` on service
+startup and `close_async_fetcher()` on shutdown.
+
+The sync path pools connections through per-thread `requests.Session` objects
+held by `SyncFetcher` and enforces its deadline without signals, so it is safe
+to run from worker threads (see `fetch_many_sync`).
+
+Both paths can opt into conditional GETs by passing an `HttpCache`. The async
+path can additionally be paced per host by a `HostRateLimiter`, either passed
+per call or attached to the `AsyncFetcher`.
+
+Retries on both paths follow a `RetryPolicy`: exponential backoff with full
+jitter, `Retry-After` support, no retries for non-retryable statuses such as
+404, and a per-host circuit breaker that fails fast while a vendor is down.
+
+Bodies are read in chunks and decoded once at the end. `max_bytes` caps how
+much is read and `stop_when` (e.g. `stop_at_marker("</main>")`) ends the
+download early; `stream_html_sync` / `stream_html_async` expose the raw
+chunks for callers that parse incrementally.
+
 Belongs to: Web Scraper Service - Scrapers
 """
 
 import asyncio
 import logging
 import signal
+import threading
 import time
-from contextlib import contextmanager
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager, nullcontext
+from typing import (
+    AsyncIterator,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+    Union,
+)
 
 import aiohttp
 import requests
+from requests.adapters import HTTPAdapter
+
+from .http_cache import HttpCache
+from .rate_limit import HostRateLimiter
+from .retry_policy import RetryPolicy, get_default_breaker
+from .streaming import (
+    StopPredicate,
+    alimit_chunks,
+    charset_from_content_type,
+    decode_body,
+    limit_chunks,
+)
 
 logger = logging.getLogger("scrapers.fetch_utils")
 
@@ -25,12 +71,231 @@ class TimeoutException(Exception):
     pass
 
 
+class AsyncFetcher:
+    """Owns a long-lived, pooled aiohttp session for asynchronous fetches.
+
+    The session is created lazily on first use and bound to the running event
+    loop. If it is used from a different loop (e.g. after a restart), a fresh
+    session is created transparently.
+
+    Args:
+        limit (int, optional): Total simultaneous connections. Default to 100.
+        limit_per_host (int, optional): Simultaneous connections per host.
+            Default to 8.
+        keepalive_timeout (float, optional): Seconds an idle connection is
+            kept open for reuse. Default to 30.
+        ttl_dns_cache (int, optional): Seconds DNS results are cached.
+            Default to 300.
+        timeout (float, optional): Total per-request timeout in seconds, or
+            None to leave timeouts to the caller. Default to None.
+        headers (dict, optional): Default headers sent with every request.
+        limiter (HostRateLimiter, optional): Per-host scheduler applied to
+            every fetch made through this fetcher. Default to none.
+    """
+
+    def __init__(
+        self,
+        limit: int = 100,
+        limit_per_host: int = 8,
+        keepalive_timeout: float = 30.0,
+        ttl_dns_cache: int = 300,
+        timeout: Optional[float] = None,
+        headers: Optional[dict] = None,
+        limiter: Optional[HostRateLimiter] = None,
+    ):
+        self.limit = limit
+        self.limit_per_host = limit_per_host
+        self.keepalive_timeout = keepalive_timeout
+        self.ttl_dns_cache = ttl_dns_cache
+        self.timeout = timeout
+        self.headers = headers or {}
+        self.limiter = limiter
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    @property
+    def started(self) -> bool:
+        """bool: Whether an open session currently exists."""
+        return self._session is not None and not self._session.closed
+
+    async def start(self) -> None:
+        """Creates the pooled session if it is not already open."""
+        loop = asyncio.get_running_loop()
+        if self.started and self._loop is loop:
+            return
+        connector = aiohttp.TCPConnector(
+            limit=self.limit,
+            limit_per_host=self.limit_per_host,
+            keepalive_timeout=self.keepalive_timeout,
+            ttl_dns_cache=self.ttl_dns_cache,
+        )
+        self._session = aiohttp.ClientSession(
+            connector=connector,
+            timeout=aiohttp.ClientTimeout(total=self.timeout),
+            headers=self.headers,
+        )
+        self._loop = loop
+        logger.info(
+            f"ASYNC: Started pooled session (limit={self.limit}, "
+            f"limit_per_host={self.limit_per_host})"
+        )
+
+    async def close(self) -> None:
+        """Closes the pooled session and releases all connections."""
+        session, self._session = self._session, None
+        loop, self._loop = self._loop, None
+        if session is None or session.closed:
+            return
+        if loop is asyncio.get_running_loop():
+            await session.close()
+            logger.info("ASYNC: Closed pooled session")
+
+    async def get_session(self) -> aiohttp.ClientSession:
+        """Returns the open session, starting it on first use.
+
+        Returns:
+            aiohttp.ClientSession: The shared session for the current loop.
+        """
+        if not self.started or self._loop is not asyncio.get_running_loop():
+            await self.start()
+        return self._session
+
+    async def __aenter__(self) -> "AsyncFetcher":
+        await self.start()
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb) -> None:
+        await self.close()
+
+
+_async_fetcher: Optional[AsyncFetcher] = None
+
+
+def get_async_fetcher() -> AsyncFetcher:
+    """Returns the process-wide `AsyncFetcher`, creating it with defaults.
+
+    Returns:
+        AsyncFetcher: The shared fetcher instance.
+    """
+    global _async_fetcher
+    if _async_fetcher is None:
+        _async_fetcher = AsyncFetcher()
+    return _async_fetcher
+
+
+async def start_async_fetcher(**kwargs) -> AsyncFetcher:
+    """Startup hook: (re)configures and opens the process-wide fetcher.
+
+    Args:
+        **kwargs: Connector settings forwarded to `AsyncFetcher`.
+
+    Returns:
+        AsyncFetcher: The started shared fetcher.
+    """
+    global _async_fetcher
+    if kwargs:
+        if _async_fetcher is not None:
+            await _async_fetcher.close()
+        _async_fetcher = AsyncFetcher(**kwargs)
+    fetcher = get_async_fetcher()
+    await fetcher.start()
+    return fetcher
+
+
+async def close_async_fetcher() -> None:
+    """Shutdown hook: closes the process-wide fetcher if it was started."""
+    if _async_fetcher is not None:
+        await _async_fetcher.close()
+
+
+class SyncFetcher:
+    """Thread-safe pool of `requests.Session` objects, one per thread.
+
+    `requests.Session` is not guaranteed to be thread-safe, so each thread
+    lazily gets its own session with a tuned `HTTPAdapter`, which keeps
+    connections alive across requests made from that thread.
+
+    Args:
+        pool_connections (int, optional): Number of per-host pools to cache.
+            Default to 16.
+        pool_maxsize (int, optional): Connections kept alive per host pool.
+            Default to 16.
+        headers (dict, optional): Default headers sent with every request.
+    """
+
+    def __init__(
+        self,
+        pool_connections: int = 16,
+        pool_maxsize: int = 16,
+        headers: Optional[dict] = None,
+    ):
+        self.pool_connections = pool_connections
+        self.pool_maxsize = pool_maxsize
+        self.headers = headers or {}
+        self._local = threading.local()
+        self._sessions: List[requests.Session] = []
+        self._lock = threading.Lock()
+
+    def get_session(self) -> requests.Session:
+        """Returns the calling thread's session, creating it on first use.
+
+        Returns:
+            requests.Session: A pooled session owned by the current thread.
+        """
+        session = getattr(self._local, "session", None)
+        if session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(
+                pool_connections=self.pool_connections,
+                pool_maxsize=self.pool_maxsize,
+            )
+            session.mount("http://", adapter)
+            session.mount("https://", adapter)
+            session.headers.update(self.headers)
+            self._local.session = session
+            with self._lock:
+                self._sessions.append(session)
+        return session
+
+    def close(self) -> None:
+        """Closes every session handed out by this fetcher."""
+        with self._lock:
+            sessions, self._sessions = self._sessions, []
+        for session in sessions:
+            session.close()
+        self._local = threading.local()
+
+
+_sync_fetcher: Optional[SyncFetcher] = None
+_sync_fetcher_lock = threading.Lock()
+
+
+def get_sync_fetcher() -> SyncFetcher:
+    """Returns the process-wide `SyncFetcher`, creating it with defaults.
+
+    Returns:
+        SyncFetcher: The shared fetcher instance.
+    """
+    global _sync_fetcher
+    with _sync_fetcher_lock:
+        if _sync_fetcher is None:
+            _sync_fetcher = SyncFetcher()
+        return _sync_fetcher
+
+
+def close_sync_fetcher() -> None:
+    """Shutdown hook: closes all sessions of the process-wide sync fetcher."""
+    if _sync_fetcher is not None:
+        _sync_fetcher.close()
+
+
 @contextmanager
 def time_limit(seconds: int):
     """A context manager to enforce a timeout on a block of code.
 
     Note:
         This function relies on Unix signals and will not work on Windows.
+        It only works on the main thread; `fetch_html_sync` no longer uses it.
 
     Args:
         seconds (int): The timeout duration in seconds.
@@ -55,41 +320,283 @@ def time_limit(seconds: int):
         signal.alarm(0)
 
 
-def fetch_html_sync(url: str, timeout: int = 10, max_retries: int = 3) -> str:
+def _default_policy(max_retries: int) -> RetryPolicy:
+    """Builds the default retry policy backed by the shared breaker."""
+    return RetryPolicy(max_retries=max_retries, breaker=get_default_breaker())
+
+
+def _remaining(url: str, deadline: float) -> float:
+    """Returns the seconds left before `deadline`, raising once it passed."""
+    left = deadline - time.monotonic()
+    if left <= 0:
+        raise TimeoutException(f"Deadline exceeded while fetching {url}")
+    return left
+
+
+def _iter_with_deadline(
+    session: requests.Session,
+    url: str,
+    deadline: Optional[float],
+    headers: Optional[Dict[str, str]] = None,
+    chunk_size: int = 65536,
+    idle_timeout: Optional[float] = None,
+) -> Iterator[Union[requests.Response, bytes]]:
+    """Performs a streaming GET, yielding the response and then body chunks.
+
+    Every socket operation is bounded by the remaining time and the deadline
+    is re-checked between body chunks, which gives a total-request limit
+    without relying on signals. The response is closed when the generator
+    finishes or is closed early.
+
+    Args:
+        session (requests.Session): Session to issue the request on.
+        url (str): The target URL to fetch.
+        deadline (float, optional): Absolute `time.monotonic()` deadline, or
+            None for no total limit.
+        headers (Dict[str, str], optional): Extra request headers.
+        chunk_size (int, optional): Body read size in bytes. Default to 64 KiB.
+        idle_timeout (float, optional): Longest wait for the connection or
+            any single read. Default to the time left before `deadline`.
+
+    Yields:
+        Union[requests.Response, bytes]: The response first, then its body
+        chunks.
+
+    Raises:
+        TimeoutException: If the deadline passes before the body is read.
+    """
+    timeout = idle_timeout
+    if deadline is not None:
+        left = _remaining(url, deadline)
+        timeout = left if idle_timeout is None else min(left, idle_timeout)
+    resp = session.get(url, headers=headers, timeout=timeout, stream=True)
+    try:
+        resp.raise_for_status()
+        yield resp
+        for chunk in resp.iter_content(chunk_size):
+            if deadline is not None:
+                _remaining(url, deadline)
+            yield chunk
+    finally:
+        resp.close()
+
+
+def _read_with_deadline(
+    session: requests.Session,
+    url: str,
+    deadline: float,
+    headers: Optional[Dict[str, str]] = None,
+    max_bytes: Optional[int] = None,
+    stop_when: Optional[StopPredicate] = None,
+) -> Tuple[requests.Response, str]:
+    """Performs a GET and reads the body, failing once `deadline` passes.
+
+    Args:
+        session (requests.Session): Session to issue the request on.
+        url (str): The target URL to fetch.
+        deadline (float): Absolute `time.monotonic()` deadline.
+        headers (Dict[str, str], optional): Extra request headers.
+        max_bytes (int, optional): Stop reading after this many bytes.
+        stop_when (StopPredicate, optional): Stop reading once it returns
+            True for a chunk.
+
+    Returns:
+        Tuple[requests.Response, str]: The (closed) response and its decoded
+        body.
+
+    Raises:
+        TimeoutException: If the deadline passes before the body is read.
+    """
+    stream = _iter_with_deadline(session, url, deadline, headers)
+    try:
+        resp = next(stream)
+        body = b"".join(limit_chunks(stream, max_bytes, stop_when))
+    finally:
+        stream.close()
+    charset = charset_from_content_type(resp.headers.get("Content-Type"))
+    return resp, decode_body(body, charset)
+
+
+def fetch_html_sync(
+    url: str,
+    timeout: int = 10,
+    max_retries: int = 3,
+    fetcher: Optional[SyncFetcher] = None,
+    cache: Optional[HttpCache] = None,
+    retry_policy: Optional[RetryPolicy] = None,
+    max_bytes: Optional[int] = None,
+    stop_when: Optional[StopPredicate] = None,
+) -> str:
     """Fetches HTML content synchronously with retries.
 
+    Safe to call from any thread: connections come from the calling thread's
+    pooled session and the timeout is enforced without signals.
+
     Args:
         url (str): The target URL to fetch.
-        timeout (int, optional): The timeout for the request in seconds.
+        timeout (int, optional): The total time limit per attempt in seconds.
             Default to 10.
         max_retries (int, optional): The maximum number of retry attempts.
-            Default to 3.
+            Default to 3. Ignored when `retry_policy` is given.
+        fetcher (SyncFetcher, optional): Fetcher providing pooled sessions.
+            Default to the process-wide fetcher.
+        cache (HttpCache, optional): Cache used to serve fresh pages and
+            revalidate stale ones. Default to no caching.
+        retry_policy (RetryPolicy, optional): Backoff and circuit-breaker
+            policy. Default to `max_retries` attempts with the shared breaker.
+        max_bytes (int, optional): Stop downloading after this many bytes.
+            Default to the full body.
+        stop_when (StopPredicate, optional): Stop downloading once it returns
+            True for a chunk, e.g. `stop_at_marker("</main>")`. Truncated
+            bodies are never written to the cache.
 
     Returns:
         str: The HTML content of the page.
 
     Raises:
-        Exception: If all retry attempts fail.
+        CircuitOpenError: If the host's circuit is open.
+        Exception: If all retry attempts fail, or on a non-retryable error.
     """
-    last_exc = None
-    for attempt in range(1, max_retries + 1):
+    fetcher = fetcher or get_sync_fetcher()
+    policy = retry_policy or _default_policy(max_retries)
+    entry = cache.get(url) if cache is not None else None
+    if entry is not None and entry.is_fresh():
+        logger.info(f"SYNC: Cache hit for {url}")
+        return entry.body
+    headers = entry.conditional_headers() if entry else None
+    partial = max_bytes is not None or stop_when is not None
+    for attempt in range(1, policy.max_retries + 1):
+        policy.before_attempt(url)
         try:
-            with time_limit(timeout):
-                logger.info(f"SYNC: Fetch attempt {attempt} for {url}")
-                resp = requests.get(url, timeout=timeout)
-                resp.raise_for_status()
-                logger.info(f"SYNC: Success for {url}")
-                return resp.text
+            logger.info(f"SYNC: Fetch attempt {attempt} for {url}")
+            deadline = time.monotonic() + timeout
+            resp, html = _read_with_deadline(
+                fetcher.get_session(), url, deadline, headers, max_bytes, stop_when
+            )
+            if entry is not None and resp.status_code == 304:
+                logger.info(f"SYNC: Not modified {url}")
+                cache.revalidate(entry, resp.headers)
+                policy.on_success(url)
+                return entry.body
+            if cache is not None and not partial:
+                cache.store(url, html, resp.headers)
+            policy.on_success(url)
+            logger.info(f"SYNC: Success for {url}")
+            return html
         except Exception as e:
             logger.warning(f"SYNC: Attempt {attempt} failed: {e}")
-            last_exc = e
-            if attempt < max_retries:
-                time.sleep(1)
-    logger.error(f"SYNC: All {max_retries} attempts failed for {url}")
-    raise last_exc
+            delay = policy.on_failure(url, e, attempt)
+            if delay is None:
+                logger.error(f"SYNC: Giving up on {url} after {attempt} attempts")
+                raise
+            time.sleep(delay)
+        except BaseException:
+            # Cancelled or interrupted: free a half-open trial for the next call.
+            policy.on_abort(url)
+            raise
+
 
+def fetch_many_sync(
+    urls: Iterable[str],
+    max_workers: int = 8,
+    timeout: int = 10,
+    max_retries: int = 3,
+    fetcher: Optional[SyncFetcher] = None,
+) -> List[Union[str, Exception]]:
+    """Fetches many URLs concurrently on a thread pool.
 
-async def fetch_html_async(url: str, max_retries: int = 3) -> str:
+    Args:
+        urls (Iterable[str]): The target URLs to fetch.
+        max_workers (int, optional): Number of worker threads. Default to 8.
+        timeout (int, optional): The total time limit per attempt in seconds.
+            Default to 10.
+        max_retries (int, optional): The maximum number of retry attempts
+            per URL. Default to 3.
+        fetcher (SyncFetcher, optional): Fetcher providing pooled sessions.
+            Default to the process-wide fetcher.
+
+    Returns:
+        List[Union[str, Exception]]: One entry per URL, in input order: the
+        HTML on success, or the exception raised by the last attempt.
+    """
+    fetcher = fetcher or get_sync_fetcher()
+
+    def fetch_one(url: str) -> Union[str, Exception]:
+        try:
+            return fetch_html_sync(url, timeout, max_retries, fetcher)
+        except Exception as e:
+            return e
+
+    with ThreadPoolExecutor(
+        max_workers=max_workers, thread_name_prefix="fetch"
+    ) as pool:
+        return list(pool.map(fetch_one, urls))
+
+
+def stream_html_sync(
+    url: str,
+    timeout: Optional[int] = 10,
+    max_bytes: Optional[int] = None,
+    stop_when: Optional[StopPredicate] = None,
+    chunk_size: int = 65536,
+    fetcher: Optional[SyncFetcher] = None,
+    idle_timeout: Optional[float] = None,
+) -> Iterator[bytes]:
+    """Streams the raw body of a page in chunks, without retries.
+
+    The connection is released as soon as the caller stops iterating, the
+    byte cap is hit or `stop_when` fires.
+
+    Args:
+        url (str): The target URL to fetch.
+        timeout (int, optional): The total time limit in seconds, or None for
+            no total limit. Default to 10.
+        max_bytes (int, optional): Stop after this many bytes. Default to the
+            full body.
+        stop_when (StopPredicate, optional): Stop once it returns True for a
+            chunk.
+        chunk_size (int, optional): Read size in bytes. Default to 64 KiB.
+        fetcher (SyncFetcher, optional): Fetcher providing pooled sessions.
+            Default to the process-wide fetcher.
+        idle_timeout (float, optional): Longest wait in seconds for the
+            connection or any single read. Use it with `timeout=None` for
+            bodies read lazily, where a total limit would also count the
+            time the caller spends between chunks. Default to no limit
+            beyond `timeout`.
+
+    Yields:
+        bytes: Body chunks.
+
+    Raises:
+        TimeoutException: If the deadline passes mid-stream.
+        requests.Timeout: If a read waits longer than `idle_timeout`.
+    """
+    fetcher = fetcher or get_sync_fetcher()
+    deadline = None if timeout is None else time.monotonic() + timeout
+    stream = _iter_with_deadline(
+        fetcher.get_session(),
+        url,
+        deadline,
+        chunk_size=chunk_size,
+        idle_timeout=idle_timeout,
+    )
+    try:
+        next(stream)
+        yield from limit_chunks(stream, max_bytes, stop_when)
+    finally:
+        stream.close()
+
+
+async def fetch_html_async(
+    url: str,
+    max_retries: int = 3,
+    fetcher: Optional[AsyncFetcher] = None,
+    cache: Optional[HttpCache] = None,
+    limiter: Optional[HostRateLimiter] = None,
+    retry_policy: Optional[RetryPolicy] = None,
+    max_bytes: Optional[int] = None,
+    stop_when: Optional[StopPredicate] = None,
+) -> str:
     """Fetches HTML content asynchronously with retries.
 
     Note:
@@ -99,28 +606,108 @@ async def fetch_html_async(url: str, max_retries: int = 3) -> str:
     Args:
         url (str): The target URL to fetch.
         max_retries (int, optional): The maximum number of retry attempts.
-            Default to 3.
+            Default to 3. Ignored when `retry_policy` is given.
+        fetcher (AsyncFetcher, optional): Fetcher whose pooled session is
+            used. Default to the process-wide fetcher.
+        cache (HttpCache, optional): Cache used to serve fresh pages and
+            revalidate stale ones. Default to no caching.
+        limiter (HostRateLimiter, optional): Per-host scheduler each attempt
+            waits on. Default to the fetcher's limiter, if any.
+        retry_policy (RetryPolicy, optional): Backoff and circuit-breaker
+            policy. Default to `max_retries` attempts with the shared breaker.
+        max_bytes (int, optional): Stop downloading after this many bytes.
+            Default to the full body.
+        stop_when (StopPredicate, optional): Stop downloading once it returns
+            True for a chunk, e.g. `stop_at_marker("</main>")`. Truncated
+            bodies are never written to the cache.
 
     Returns:
         str: The HTML content of the page.
 
     Raises:
-        Exception: If all retry attempts fail.
+        CircuitOpenError: If the host's circuit is open.
+        Exception: If all retry attempts fail, or on a non-retryable error.
     """
-    last_exc = None
-    for attempt in range(1, max_retries + 1):
+    fetcher = fetcher or get_async_fetcher()
+    policy = retry_policy or _default_policy(max_retries)
+    limiter = limiter or fetcher.limiter
+    entry = cache.get(url) if cache is not None else None
+    if entry is not None and entry.is_fresh():
+        logger.info(f"ASYNC: Cache hit for {url}")
+        return entry.body
+    headers = entry.conditional_headers() if entry else None
+    partial = max_bytes is not None or stop_when is not None
+    for attempt in range(1, policy.max_retries + 1):
+        policy.before_attempt(url)
         try:
             logger.info(f"ASYNC: Fetch attempt {attempt} for {url}")
-            async with aiohttp.ClientSession() as session:
-                async with session.get(url) as resp:
-                    resp.raise_for_status()
+            session = await fetcher.get_session()
+            slot_ctx = limiter.slot(url) if limiter is not None else nullcontext()
+            async with slot_ctx as slot, session.get(url, headers=headers) as resp:
+                if slot is not None:
+                    slot.record(resp.status)
+                if entry is not None and resp.status == 304:
+                    logger.info(f"ASYNC: Not modified {url}")
+                    cache.revalidate(entry, resp.headers)
+                    policy.on_success(url)
+                    return entry.body
+                resp.raise_for_status()
+                if partial:
+                    chunks = resp.content.iter_chunked(65536)
+                    body = b"".join(
+                        [c async for c in alimit_chunks(chunks, max_bytes, stop_when)]
+                    )
+                    html = decode_body(body, resp.charset)
+                else:
                     html = await resp.text()
-                    logger.info(f"ASYNC: Success for {url}")
-                    return html
+                if cache is not None and not partial:
+                    cache.store(url, html, resp.headers)
+                policy.on_success(url)
+                logger.info(f"ASYNC: Success for {url}")
+                return html
         except Exception as e:
             logger.warning(f"ASYNC: Attempt {attempt} failed: {e}")
-            last_exc = e
-            if attempt < max_retries:
-                await asyncio.sleep(1)
-    logger.error(f"ASYNC: All {max_retries} attempts failed for {url}")
-    raise last_exc
+            delay = policy.on_failure(url, e, attempt)
+            if delay is None:
+                logger.error(f"ASYNC: Giving up on {url} after {attempt} attempts")
+                raise
+            await asyncio.sleep(delay)
+        except BaseException:
+            # Cancelled or interrupted: free a half-open trial for the next call.
+            policy.on_abort(url)
+            raise
+
+
+async def stream_html_async(
+    url: str,
+    max_bytes: Optional[int] = None,
+    stop_when: Optional[StopPredicate] = None,
+    chunk_size: int = 65536,
+    fetcher: Optional[AsyncFetcher] = None,
+) -> AsyncIterator[bytes]:
+    """Streams the raw body of a page in chunks, without retries.
+
+    Note:
+        Timeout handling should be managed by the caller, as for
+        `fetch_html_async`.
+
+    Args:
+        url (str): The target URL to fetch.
+        max_bytes (int, optional): Stop after this many bytes. Default to the
+            full body.
+        stop_when (StopPredicate, optional): Stop once it returns True for a
+            chunk.
+        chunk_size (int, optional): Read size in bytes. Default to 64 KiB.
+        fetcher (AsyncFetcher, optional): Fetcher whose pooled session is
+            used. Default to the process-wide fetcher.
+
+    Yields:
+        bytes: Body chunks.
+    """
+    fetcher = fetcher or get_async_fetcher()
+    session = await fetcher.get_session()
+    async with session.get(url) as resp:
+        resp.raise_for_status()
+        chunks = resp.content.iter_chunked(chunk_size)
+        async for chunk in alimit_chunks(chunks, max_bytes, stop_when):
+            yield chunk
@@ -0,0 +1,196 @@
+"""Content-fingerprint index for incremental scraping.
+
+Most recrawled pages are unchanged apart from boilerplate such as CSRF
+tokens, nonces, cache-busting query strings and rendered timestamps. The
+index keeps, per URL, a hash of the page with those volatile regions removed,
+so callers can skip parsing, validation and publishing when it matches the
+last processed version, while still recording that the page was seen.
+
+Volatile regions are described by regular expressions; every match is
+dropped before hashing. `DEFAULT_VOLATILE_PATTERNS` covers the common cases
+and can be extended or replaced per index.
+
+Belongs to: Web Scraper Service - Scrapers
+"""
+
+import hashlib
+import logging
+import os
+import re
+import sqlite3
+import threading
+import time
+from typing import Dict, Iterable, NamedTuple, Optional, Pattern, Tuple, Union
+
+logger = logging.getLogger("scrapers.fingerprint")
+
+DEFAULT_VOLATILE_PATTERNS: Tuple[str, ...] = (
+    # HTML comments (build ids, render times, debug markers)
+    r"<!--.*?-->",
+    # CSRF tokens in hidden inputs and meta tags
+    r"<input[^>]*(?:csrf|xsrf|authenticity_token|_token)[^>]*>",
+    r"<meta[^>]*(?:csrf|xsrf)[^>]*>",
+    # Per-request nonces and cache-busting query parameters
+    r"""\snonce=["'][^"']*["']""",
+    r"[?&](?:v|ver|_|cb|ts|t)=[\w.-]+",
+    # ISO-8601 timestamps and HH:MM:SS clock times
+    r"\d{4}-\d{2}-\d{2}[T ]\d{2}:\d{2}(?::\d{2}(?:\.\d+)?)?(?:Z|[+-]\d{2}:?\d{2})?",
+    r"\b\d{1,2}:\d{2}:\d{2}\b",
+)
+
+_WHITESPACE_RE = re.compile(r"\s+")
+
+
+class FingerprintRecord(NamedTuple):
+    """Stored fingerprint state of one URL."""
+
+    url: str
+    digest: str
+    first_seen: float
+    last_seen: float
+    last_changed: float
+
+
+def compile_patterns(
+    patterns: Iterable[Union[str, Pattern[str]]],
+) -> Tuple[Pattern[str], ...]:
+    """Compiles volatile-region patterns (case-insensitive, dot matches newline).
+
+    Args:
+        patterns (Iterable[Union[str, Pattern[str]]]): Regex strings or
+            already-compiled patterns.
+
+    Returns:
+        Tuple[Pattern[str], ...]: Compiled patterns.
+    """
+    return tuple(
+        p if isinstance(p, re.Pattern) else re.compile(p, re.IGNORECASE | re.DOTALL)
+        for p in patterns
+    )
+
+
+def normalize_html(html: str, patterns: Iterable[Pattern[str]]) -> str:
+    """Removes volatile regions and collapses whitespace.
+
+    Args:
+        html (str): Page body.
+        patterns (Iterable[Pattern[str]]): Compiled volatile-region patterns.
+
+    Returns:
+        str: The normalized body.
+    """
+    for pattern in patterns:
+        html = pattern.sub("", html)
+    return _WHITESPACE_RE.sub(" ", html).strip()
+
+
+class FingerprintIndex:
+    """SQLite-backed map of URL to normalized-content hash.
+
+    Safe to share between threads of one process. A URL's fingerprint only
+    moves forward through `record`, which callers invoke once a page has been
+    fully processed, so a page whose processing failed is retried on the next
+    crawl.
+
+    Args:
+        path (str): SQLite file; its folder is created if missing.
+        volatile_patterns (Iterable[Union[str, Pattern[str]]], optional):
+            Regions to drop before hashing. Default to
+            `DEFAULT_VOLATILE_PATTERNS`.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        volatile_patterns: Optional[Iterable[Union[str, Pattern[str]]]] = None,
+    ):
+        folder = os.path.dirname(path)
+        if folder:
+            os.makedirs(folder, exist_ok=True)
+        self.path = path
+        self.patterns = compile_patterns(
+            DEFAULT_VOLATILE_PATTERNS
+            if volatile_patterns is None
+            else volatile_patterns
+        )
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS fingerprints ("
+            "url TEXT PRIMARY KEY, digest TEXT NOT NULL, first_seen REAL NOT NULL, "
+            "last_seen REAL NOT NULL, last_changed REAL NOT NULL)"
+        )
+        self._lock = threading.Lock()
+
+    def fingerprint(self, html: str) -> str:
+        """Returns the SHA-256 hex digest of the normalized body."""
+        normalized = normalize_html(html, self.patterns)
+        return hashlib.sha256(normalized.encode("utf-8")).hexdigest()
+
+    def lookup(self, url: str) -> Optional[FingerprintRecord]:
+        """Returns the stored state of `url`, or None if it was never recorded."""
+        with self._lock:
+            row = self._db.execute(
+                "SELECT * FROM fingerprints WHERE url = ?", (url,)
+            ).fetchone()
+        return FingerprintRecord(*row) if row else None
+
+    def check(self, url: str, html: str) -> Tuple[bool, str]:
+        """Compares a fresh body with the last processed version of `url`.
+
+        When the content is unchanged, the URL's `last_seen` time is updated
+        so freshness is still tracked for skipped pages.
+
+        Args:
+            url (str): The fetched URL.
+            html (str): The fetched body.
+
+        Returns:
+            Tuple[bool, str]: Whether the content is unchanged, and its digest
+            (to pass to `record` once the page has been processed).
+        """
+        digest = self.fingerprint(html)
+        with self._lock:
+            touched = self._db.execute(
+                "UPDATE fingerprints SET last_seen = ? WHERE url = ? AND digest = ?",
+                (time.time(), url, digest),
+            ).rowcount
+            self._db.commit()
+        if touched:
+            logger.debug(f"FINGERPRINT: {url} unchanged")
+        return bool(touched), digest
+
+    def record(self, url: str, digest: str) -> None:
+        """Stores `digest` as the last processed version of `url`.
+
+        Args:
+            url (str): The processed URL.
+            digest (str): Digest returned by `check` or `fingerprint`.
+        """
+        now = time.time()
+        with self._lock:
+            self._db.execute(
+                "INSERT INTO fingerprints VALUES (?, ?, ?, ?, ?) "
+                "ON CONFLICT(url) DO UPDATE SET "
+                "last_changed = CASE WHEN digest = excluded.digest "
+                "THEN last_changed ELSE excluded.last_changed END, "
+                "digest = excluded.digest, last_seen = excluded.last_seen",
+                (url, digest, now, now, now),
+            )
+            self._db.commit()
+
+    def stats(self) -> Dict[str, int]:
+        """Returns the number of tracked URLs."""
+        with self._lock:
+            urls = self._db.execute("SELECT COUNT(*) FROM fingerprints").fetchone()[0]
+        return {"urls": urls}
+
+    def close(self) -> None:
+        """Closes the underlying database."""
+        with self._lock:
+            self._db.close()
+
+    def __enter__(self) -> "FingerprintIndex":
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.close()
@@ -0,0 +1,471 @@
+"""URL frontier for category and listing crawls.
+
+Category crawls reach the same product through dozens of URL variants
+(tracking parameters, sort orders, fragments). The frontier normalizes every
+URL before it is queued and deduplicates it with a Bloom filter, whose
+memory is fixed by the expected URL count instead of growing with every URL
+(about 1.8 MB for a million URLs). URLs the filter reports as seen, mostly
+real repeats plus about one new URL in a thousand at capacity, are checked
+against an exact set of URL digests kept on disk, so no new URL is skipped.
+
+Queued pages sit in per-host priority queues that are served round-robin,
+so one large host cannot starve the others. Depth and page limits bound the
+crawl, and pagination links ("next" page) are followed without consuming
+depth.
+
+`crawl` drives the frontier: it fetches listing pages, queues the listing
+links they contain, and yields product URLs for `BaseScraper.ascrape_multiple`
+to consume lazily.
+
+Belongs to: Web Scraper Service - Scrapers
+"""
+
+import hashlib
+import heapq
+import logging
+import math
+import re
+import sqlite3
+from collections import deque
+from typing import (
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Deque,
+    Dict,
+    FrozenSet,
+    Iterable,
+    List,
+    NamedTuple,
+    Optional,
+    Set,
+    Tuple,
+)
+from urllib.parse import parse_qsl, urlencode, urljoin, urlsplit, urlunsplit
+
+from . import fetch_utils
+
+logger = logging.getLogger("scrapers.frontier")
+
+DEFAULT_TRACKING_PARAMS: FrozenSet[str] = frozenset(
+    {
+        "gclid",
+        "fbclid",
+        "msclkid",
+        "dclid",
+        "yclid",
+        "mc_cid",
+        "mc_eid",
+        "ref",
+        "ref_",
+        "referrer",
+        "source",
+        "affiliate",
+        "aff_id",
+        "cmpid",
+        "icid",
+        "_ga",
+        "sessionid",
+        "sid",
+    }
+)
+DEFAULT_TRACKING_PREFIXES: Tuple[str, ...] = ("utm_", "pk_", "hsa_")
+DEFAULT_SORT_PARAMS: FrozenSet[str] = frozenset(
+    {"sort", "sort_by", "sortby", "order", "orderby", "order_by", "dir", "direction"}
+)
+
+_TAG_RE = re.compile(r"<(a|link)\b([^>]*)>", re.IGNORECASE)
+_ATTR_RE = re.compile(r"""([\w:-]+)\s*=\s*(?:"([^"]*)"|'([^']*)'|([^\s>]+))""")
+_HREF_RE = re.compile(r"""<a\b[^>]*?\bhref\s*=\s*["']([^"'#]+)""", re.IGNORECASE)
+
+
+def normalize_url(
+    url: str,
+    drop_params: FrozenSet[str] = DEFAULT_TRACKING_PARAMS | DEFAULT_SORT_PARAMS,
+    drop_prefixes: Tuple[str, ...] = DEFAULT_TRACKING_PREFIXES,
+) -> str:
+    """Canonicalizes a URL so that variants of one page compare equal.
+
+    Lower-cases the scheme and host, drops default ports, fragments,
+    tracking and sort-order parameters, sorts the remaining query parameters
+    and strips a trailing slash from non-root paths.
+
+    Args:
+        url (str): Absolute URL.
+        drop_params (FrozenSet[str], optional): Query parameters to remove
+            (case-insensitive). Default to tracking and sort parameters.
+        drop_prefixes (Tuple[str, ...], optional): Parameter prefixes to
+            remove, e.g. "utm_".
+
+    Returns:
+        str: The normalized URL.
+    """
+    parts = urlsplit(url.strip())
+    scheme = parts.scheme.lower()
+    host = (parts.hostname or "").lower()
+    port = parts.port
+    if port and not (
+        (scheme == "http" and port == 80) or (scheme == "https" and port == 443)
+    ):
+        host = f"{host}:{port}"
+    path = re.sub(r"/{2,}", "/", parts.path) or "/"
+    if len(path) > 1:
+        path = path.rstrip("/")
+    query = sorted(
+        (k, v)
+        for k, v in parse_qsl(parts.query, keep_blank_values=True)
+        if k.lower() not in drop_params and not k.lower().startswith(drop_prefixes)
+    )
+    return urlunsplit((scheme, host, path, urlencode(query), ""))
+
+
+def _digest(url: str) -> int:
+    return int.from_bytes(
+        hashlib.blake2b(url.encode("utf-8"), digest_size=8).digest(),
+        "big",
+        signed=True,
+    )
+
+
+class BloomFilter:
+    """Fixed-size Bloom filter over strings.
+
+    Args:
+        capacity (int): Expected number of items.
+        error_rate (float, optional): Target false-positive rate at
+            capacity. Default to 0.001.
+    """
+
+    def __init__(self, capacity: int, error_rate: float = 0.001):
+        self.size = max(8, int(-capacity * math.log(error_rate) / (math.log(2) ** 2)))
+        self.hashes = max(1, round(self.size / capacity * math.log(2)))
+        self._bits = bytearray((self.size + 7) // 8)
+
+    def _positions(self, item: str) -> Iterable[int]:
+        digest = hashlib.blake2b(item.encode("utf-8"), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "big")
+        h2 = int.from_bytes(digest[8:], "big") | 1
+        return ((h1 + i * h2) % self.size for i in range(self.hashes))
+
+    def add(self, item: str) -> None:
+        """Adds an item."""
+        for pos in self._positions(item):
+            self._bits[pos >> 3] |= 1 << (pos & 7)
+
+    def __contains__(self, item: str) -> bool:
+        return all(
+            self._bits[pos >> 3] & (1 << (pos & 7)) for pos in self._positions(item)
+        )
+
+
+class UrlDeduplicator:
+    """Remembers normalized URLs in a Bloom filter backed by an exact set.
+
+    The Bloom filter answers most lookups in memory: a URL it does not
+    contain is new for certain. Only when it reports a URL as present is the
+    exact set consulted, to tell a repeat from a false positive, so a new URL
+    is never skipped. The exact set keeps 8-byte URL digests in SQLite, on
+    disk; new digests are buffered in memory and written in batches.
+
+    Args:
+        capacity (int, optional): Expected number of URLs. Default to 1M.
+        error_rate (float, optional): Bloom filter false-positive rate.
+            Default to 0.001.
+        path (str, optional): SQLite file for the exact set. Default to a
+            private temporary database, deleted by `close`.
+        flush_every (int, optional): New digests buffered before they are
+            written. Default to 10000.
+    """
+
+    def __init__(
+        self,
+        capacity: int = 1_000_000,
+        error_rate: float = 0.001,
+        path: str = "",
+        flush_every: int = 10_000,
+    ):
+        self._bloom = BloomFilter(capacity, error_rate)
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS urls (digest INTEGER PRIMARY KEY) WITHOUT ROWID"
+        )
+        self._pending: Set[int] = set()
+        self.flush_every = flush_every
+        self.added = 0
+        self.bloom_hits = 0
+        self.false_positives = 0
+
+    def _contains(self, digest: int) -> bool:
+        if digest in self._pending:
+            return True
+        row = self._db.execute("SELECT 1 FROM urls WHERE digest = ?", (digest,))
+        return row.fetchone() is not None
+
+    def _flush(self) -> None:
+        self._db.executemany(
+            "INSERT OR IGNORE INTO urls VALUES (?)", ((d,) for d in self._pending)
+        )
+        self._db.commit()
+        self._pending.clear()
+
+    def add(self, url: str) -> bool:
+        """Records a normalized URL.
+
+        Returns:
+            bool: True if the URL was new, False if it was seen before.
+        """
+        digest = _digest(url)
+        if url in self._bloom:
+            self.bloom_hits += 1
+            if self._contains(digest):
+                return False
+            self.false_positives += 1
+        else:
+            self._bloom.add(url)
+        self._pending.add(digest)
+        self.added += 1
+        if len(self._pending) >= self.flush_every:
+            self._flush()
+        return True
+
+    def close(self) -> None:
+        """Writes buffered digests and closes the exact set."""
+        self._flush()
+        self._db.close()
+
+    def __len__(self) -> int:
+        return self.added
+
+
+class CrawlItem(NamedTuple):
+    """A queued page."""
+
+    url: str
+    depth: int
+    priority: int
+
+
+class Frontier:
+    """Per-host priority queues of pages to crawl, with deduplication.
+
+    Args:
+        max_depth (int, optional): Link hops from a seed beyond which pages
+            are not queued; pagination does not count. Default to 3.
+        max_pages (int, optional): Pages handed out by `pop` before the
+            frontier reports itself exhausted. Default to 10000.
+        capacity (int, optional): Expected distinct URLs, sizing the Bloom
+            filter. Default to 1M.
+        normalizer (Callable[[str], str], optional): URL canonicalizer.
+            Default to `normalize_url`.
+        seen_path (str, optional): SQLite file for the exact set of seen
+            URLs. Default to a temporary database, deleted by `close`.
+    """
+
+    def __init__(
+        self,
+        max_depth: int = 3,
+        max_pages: int = 10_000,
+        capacity: int = 1_000_000,
+        normalizer: Callable[[str], str] = normalize_url,
+        seen_path: str = "",
+    ):
+        self.max_depth = max_depth
+        self.max_pages = max_pages
+        self.normalizer = normalizer
+        self.seen = UrlDeduplicator(capacity, path=seen_path)
+        self._queues: Dict[str, List[Tuple[int, int, CrawlItem]]] = {}
+        self._hosts: Deque[str] = deque()
+        self._counter = 0
+        self.popped = 0
+
+    def add(self, url: str, depth: int = 0, priority: int = 0) -> bool:
+        """Queues a URL unless it is a duplicate or too deep.
+
+        Args:
+            url (str): Absolute URL.
+            depth (int, optional): Link hops from the seed. Default to 0.
+            priority (int, optional): Lower values are served first within
+                the host. Default to 0.
+
+        Returns:
+            bool: True if the URL was queued.
+        """
+        if depth > self.max_depth:
+            return False
+        url = self.normalizer(url)
+        if not self.seen.add(url):
+            return False
+        host = urlsplit(url).netloc
+        queue = self._queues.get(host)
+        if queue is None:
+            queue = self._queues[host] = []
+            self._hosts.append(host)
+        self._counter += 1
+        heapq.heappush(
+            queue, (priority, self._counter, CrawlItem(url, depth, priority))
+        )
+        return True
+
+    def pop(self) -> Optional[CrawlItem]:
+        """Returns the next page, rotating across hosts.
+
+        Returns:
+            Optional[CrawlItem]: The next page, or None when the queues are
+            empty or the page limit is reached.
+        """
+        if self.popped >= self.max_pages:
+            return None
+        if not self._hosts:
+            return None
+        host = self._hosts.popleft()
+        queue = self._queues[host]
+        _, _, item = heapq.heappop(queue)
+        if queue:
+            self._hosts.append(host)
+        else:
+            del self._queues[host]
+        self.popped += 1
+        return item
+
+    def __len__(self) -> int:
+        return sum(len(q) for q in self._queues.values())
+
+    def stats(self) -> Dict[str, int]:
+        """Returns queue, dedup and limit counters."""
+        return {
+            "queued": len(self),
+            "hosts": len(self._queues),
+            "popped": self.popped,
+            "seen": len(self.seen),
+            "bloom_hits": self.seen.bloom_hits,
+            "false_positives": self.seen.false_positives,
+        }
+
+    def close(self) -> None:
+        """Closes the set of seen URLs."""
+        self.seen.close()
+
+
+def find_next_page(html: str, url: str) -> Optional[str]:
+    """Finds a listing's next-page link.
+
+    Recognizes `rel="next"` on `<link>` or `<a>`, and anchors whose class or
+    `aria-label` says "next".
+
+    Args:
+        html (str): Listing page HTML.
+        url (str): Listing URL, the base for relative links.
+
+    Returns:
+        Optional[str]: Absolute next-page URL, or None.
+    """
+    for match in _TAG_RE.finditer(html):
+        attrs = {
+            m.group(1).lower(): m.group(2) or m.group(3) or m.group(4) or ""
+            for m in _ATTR_RE.finditer(match.group(2))
+        }
+        href = attrs.get("href")
+        if not href or href.startswith(("#", "javascript:")):
+            continue
+        rel = attrs.get("rel", "").lower().split()
+        label = f"{attrs.get('class', '')} {attrs.get('aria-label', '')}".lower()
+        if "next" in rel or re.search(r"\bnext\b|pagination-next|next-page", label):
+            return urljoin(url, href)
+    return None
+
+
+class Links(NamedTuple):
+    """Links found on a listing page."""
+
+    products: Iterable[str]
+    listings: Iterable[str]
+
+
+LinkExtractor = Callable[[str, str], Links]
+
+
+def pattern_link_extractor(
+    product_pattern: str, listing_pattern: Optional[str] = None
+) -> LinkExtractor:
+    """Builds a `LinkExtractor` that classifies anchors by URL regex.
+
+    Args:
+        product_pattern (str): Regex matching product page URLs.
+        listing_pattern (str, optional): Regex matching sub-category or
+            listing URLs to crawl further. Default to none.
+
+    Returns:
+        LinkExtractor: Callable returning absolute product and listing links.
+    """
+    product_re = re.compile(product_pattern)
+    listing_re = re.compile(listing_pattern) if listing_pattern else None
+
+    def extract(html: str, url: str) -> Links:
+        products, listings = [], []
+        for href in _HREF_RE.findall(html):
+            absolute = urljoin(url, href)
+            if product_re.search(absolute):
+                products.append(absolute)
+            elif listing_re is not None and listing_re.search(absolute):
+                listings.append(absolute)
+        return Links(products, listings)
+
+    return extract
+
+
+async def crawl(
+    frontier: Frontier,
+    seeds: Iterable[str],
+    extract_links: LinkExtractor,
+    fetch: Optional[Callable[[str], Awaitable[str]]] = None,
+    follow_pagination: bool = True,
+    max_products: Optional[int] = None,
+) -> AsyncIterator[str]:
+    """Crawls listing pages and yields each distinct product URL once.
+
+    Meant to be passed straight to `BaseScraper.ascrape_multiple`, which
+    pulls product URLs lazily while the crawl continues.
+
+    Args:
+        frontier (Frontier): Queue of listing pages; its limits apply.
+        seeds (Iterable[str]): Category URLs to start from.
+        extract_links (LinkExtractor): Finds product and listing links.
+        fetch (Callable[[str], Awaitable[str]], optional): Fetches a listing
+            page. Default to `fetch_utils.fetch_html_async`.
+        follow_pagination (bool, optional): Queue next-page links at the
+            same depth. Default to True.
+        max_products (int, optional): Stop after this many product URLs.
+            Default to unlimited.
+
+    Yields:
+        str: Normalized product URLs.
+    """
+    fetch = fetch or fetch_utils.fetch_html_async
+    for seed in seeds:
+        frontier.add(seed)
+    produced = 0
+    while True:
+        item = frontier.pop()
+        if item is None:
+            break
+        try:
+            html = await fetch(item.url)
+        except Exception as e:
+            logger.warning(f"CRAWL: Failed to fetch listing {item.url}: {e}")
+            continue
+        links = extract_links(html, item.url)
+        if follow_pagination:
+            next_page = find_next_page(html, item.url)
+            if next_page:
+                frontier.add(next_page, item.depth, item.priority)
+        for listing in links.listings:
+            frontier.add(listing, item.depth + 1, item.priority + 1)
+        for product in links.products:
+            product = frontier.normalizer(product)
+            if not frontier.seen.add(product):
+                continue
+            yield product
+            produced += 1
+            if max_products is not None and produced >= max_products:
+                return
+    logger.info(f"CRAWL: Finished with {frontier.stats()}")
@@ -0,0 +1,282 @@
+"""Content-addressed, compressed archive for fetched HTML pages.
+
+Replaces one-file-per-page storage. Bodies are keyed by the SHA-256 of their
+content, so a page that has not changed between crawls is stored only once.
+Each distinct body is zlib-compressed and appended to a large segment file.
+A small SQLite index maps every (url, fetched_at) capture to its body hash,
+and every hash to its (segment, offset, length) location. Segments are read
+back through `mmap`.
+
+Several `HtmlArchive` instances, in one or more processes, may write to the
+same directory: every append takes an exclusive lock on `segments/.lock`,
+re-reads the active segment and its end offset, and commits the index row
+before releasing the lock, so no two writers can claim the same offset.
+
+Layout of an archive directory::
+
+    index.sqlite3
+    segments/.lock
+    segments/000001.seg
+    segments/000002.seg
+    ...
+
+Belongs to: Web Scraper Service - Scrapers
+"""
+
+import hashlib
+import logging
+import mmap
+import os
+import sqlite3
+import threading
+import time
+import zlib
+from contextlib import contextmanager
+from typing import Dict, Iterator, Optional, Tuple
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - Windows has no flock
+    fcntl = None
+
+logger = logging.getLogger("scrapers.html_archive")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS blobs (
+    hash TEXT PRIMARY KEY,
+    segment INTEGER NOT NULL,
+    offset INTEGER NOT NULL,
+    length INTEGER NOT NULL,
+    raw_size INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS pages (
+    url TEXT NOT NULL,
+    fetched_at REAL NOT NULL,
+    hash TEXT NOT NULL,
+    PRIMARY KEY (url, fetched_at)
+);
+"""
+
+
+class HtmlArchive:
+    """Append-only, deduplicating store of HTML captures.
+
+    Safe to share between threads of one process, and to open on the same
+    directory from several threads or processes at once.
+
+    Args:
+        directory (str): Archive folder; created if missing.
+        segment_size (int, optional): Size in bytes after which a new segment
+            file is started. Default to 256 MiB.
+        compression_level (int, optional): zlib level, 1-9. Default to 6.
+    """
+
+    def __init__(
+        self,
+        directory: str,
+        segment_size: int = 256 * 1024 * 1024,
+        compression_level: int = 6,
+    ):
+        self.directory = directory
+        self.segment_size = segment_size
+        self.compression_level = compression_level
+        self._segments_dir = os.path.join(directory, "segments")
+        os.makedirs(self._segments_dir, exist_ok=True)
+        self._db = sqlite3.connect(
+            os.path.join(directory, "index.sqlite3"), check_same_thread=False
+        )
+        self._db.executescript(_SCHEMA)
+        self._lock = threading.Lock()
+        self._maps: Dict[int, mmap.mmap] = {}
+        self._lock_file = open(os.path.join(self._segments_dir, ".lock"), "a+b")
+        self._segment = 0
+        self._writer = None
+
+    def _segment_path(self, segment: int) -> str:
+        return os.path.join(self._segments_dir, f"{segment:06d}.seg")
+
+    @contextmanager
+    def _write_lock(self) -> Iterator[None]:
+        """Holds the archive-wide lock shared with other writers' processes."""
+        if fcntl is not None:
+            fcntl.flock(self._lock_file.fileno(), fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(self._lock_file.fileno(), fcntl.LOCK_UN)
+
+    def _open_segment(self, segment: int) -> None:
+        if self._writer is not None:
+            self._writer.close()
+        self._segment = segment
+        self._writer = open(self._segment_path(segment), "ab")
+
+    def _append(self, data: bytes) -> Tuple[int, int]:
+        """Appends a compressed body; call with the write lock held.
+
+        Another writer may have appended to or rolled the active segment
+        since this instance last wrote, so both are re-read from disk.
+
+        Returns:
+            Tuple[int, int]: (segment, offset) where `data` was written.
+        """
+        row = self._db.execute("SELECT MAX(segment) FROM blobs").fetchone()
+        latest = max(row[0] or 1, self._segment)
+        if self._writer is None or latest != self._segment:
+            self._open_segment(latest)
+        offset = self._writer.seek(0, os.SEEK_END)
+        if offset >= self.segment_size:
+            self._open_segment(self._segment + 1)
+            offset = 0
+            logger.info(f"ARCHIVE: Started segment {self._segment}")
+        self._writer.write(data)
+        self._writer.flush()
+        return self._segment, offset
+
+    def put(self, url: str, html: str, fetched_at: Optional[float] = None) -> str:
+        """Records a capture of `url`, storing its body only if it is new.
+
+        Args:
+            url (str): The fetched URL.
+            html (str): The page body.
+            fetched_at (float, optional): Capture time as a UNIX timestamp.
+                Default to now.
+
+        Returns:
+            str: The SHA-256 hex digest identifying the body.
+        """
+        raw = html.encode("utf-8")
+        digest = hashlib.sha256(raw).hexdigest()
+        fetched_at = time.time() if fetched_at is None else fetched_at
+        with self._lock, self._write_lock():
+            known = self._db.execute(
+                "SELECT 1 FROM blobs WHERE hash = ?", (digest,)
+            ).fetchone()
+            if not known:
+                data = zlib.compress(raw, self.compression_level)
+                segment, offset = self._append(data)
+                self._db.execute(
+                    "INSERT INTO blobs VALUES (?, ?, ?, ?, ?)",
+                    (digest, segment, offset, len(data), len(raw)),
+                )
+            self._db.execute(
+                "INSERT OR REPLACE INTO pages VALUES (?, ?, ?)",
+                (url, fetched_at, digest),
+            )
+            self._db.commit()
+        return digest
+
+    def _read(self, segment: int, offset: int, length: int) -> bytes:
+        view = self._maps.get(segment)
+        if view is None or offset + length > len(view):
+            if view is not None:
+                view.close()
+            with open(self._segment_path(segment), "rb") as f:
+                view = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            self._maps[segment] = view
+        return view[offset : offset + length]
+
+    def get_blob(self, digest: str) -> Optional[str]:
+        """Returns the body stored under a content hash.
+
+        Args:
+            digest (str): SHA-256 hex digest returned by `put`.
+
+        Returns:
+            Optional[str]: The page body, or None if unknown.
+        """
+        with self._lock:
+            row = self._db.execute(
+                "SELECT segment, offset, length FROM blobs WHERE hash = ?", (digest,)
+            ).fetchone()
+            if row is None:
+                return None
+            data = self._read(*row)
+        return zlib.decompress(data).decode("utf-8")
+
+    def get(self, url: str, fetched_at: Optional[float] = None) -> Optional[str]:
+        """Returns a stored capture of `url`.
+
+        Args:
+            url (str): The captured URL.
+            fetched_at (float, optional): Exact capture time. Default to the
+                latest capture.
+
+        Returns:
+            Optional[str]: The page body, or None if there is no capture.
+        """
+        query = "SELECT hash FROM pages WHERE url = ?"
+        params: Tuple = (url,)
+        if fetched_at is not None:
+            query += " AND fetched_at = ?"
+            params += (fetched_at,)
+        query += " ORDER BY fetched_at DESC LIMIT 1"
+        with self._lock:
+            row = self._db.execute(query, params).fetchone()
+        return self.get_blob(row[0]) if row else None
+
+    def iter_pages(self, latest_only: bool = False) -> Iterator[Tuple[str, float, str]]:
+        """Streams stored captures in segment order.
+
+        Captures are read in on-disk order so that replaying an archive
+        walks each segment sequentially.
+
+        Args:
+            latest_only (bool, optional): Only yield the most recent capture
+                of each URL. Default to False.
+
+        Yields:
+            Tuple[str, float, str]: (url, fetched_at, html) per capture.
+        """
+        query = (
+            "SELECT p.url, p.fetched_at, p.hash FROM pages p "
+            "JOIN blobs b ON b.hash = p.hash"
+        )
+        if latest_only:
+            query += (
+                " WHERE p.fetched_at = "
+                "(SELECT MAX(fetched_at) FROM pages WHERE url = p.url)"
+            )
+        query += " ORDER BY b.segment, b.offset"
+        with self._lock:
+            cursor = self._db.execute(query)
+        while True:
+            with self._lock:
+                rows = cursor.fetchmany(500)
+            if not rows:
+                return
+            for url, fetched_at, digest in rows:
+                yield url, fetched_at, self.get_blob(digest)
+
+    def stats(self) -> Dict[str, int]:
+        """Returns capture, blob and byte counts for the archive."""
+        with self._lock:
+            pages = self._db.execute("SELECT COUNT(*) FROM pages").fetchone()[0]
+            blobs, stored, raw = self._db.execute(
+                "SELECT COUNT(*), COALESCE(SUM(length), 0), "
+                "COALESCE(SUM(raw_size), 0) FROM blobs"
+            ).fetchone()
+        return {
+            "pages": pages,
+            "blobs": blobs,
+            "stored_bytes": stored,
+            "raw_bytes": raw,
+        }
+
+    def close(self) -> None:
+        """Flushes the active segment and releases files and mappings."""
+        with self._lock:
+            for view in self._maps.values():
+                view.close()
+            self._maps.clear()
+            if self._writer is not None and not self._writer.closed:
+                self._writer.close()
+            self._lock_file.close()
+            self._db.close()
+
+    def __enter__(self) -> "HtmlArchive":
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.close()
@@ -0,0 +1,266 @@
+"""On-disk HTTP cache with conditional-GET revalidation.
+
+Stores response bodies together with their validators (`ETag`,
+`Last-Modified`) and freshness lifetime (`Cache-Control: max-age`). Fresh
+entries are served without touching the network; stale entries are
+revalidated with `If-None-Match` / `If-Modified-Since`, so unchanged pages
+come back as a body-less 304. Entries are evicted in LRU order once the
+cache grows beyond its byte budget.
+
+Used by `fetch_html_sync` and `fetch_html_async` when a cache is passed in.
+
+Belongs to: Web Scraper Service - Scrapers
+"""
+
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Mapping, Optional
+
+logger = logging.getLogger("scrapers.http_cache")
+
+
+def _parse_max_age(cache_control: Optional[str]) -> Optional[int]:
+    """Extracts `max-age` from a Cache-Control header.
+
+    Args:
+        cache_control (str, optional): Raw Cache-Control header value.
+
+    Returns:
+        Optional[int]: The max-age in seconds, 0 for `no-cache`, or None if
+        the header does not specify a lifetime.
+    """
+    if not cache_control:
+        return None
+    for directive in cache_control.lower().split(","):
+        directive = directive.strip()
+        if directive == "no-cache":
+            return 0
+        if directive.startswith("max-age="):
+            try:
+                return max(int(directive.split("=", 1)[1].strip('"')), 0)
+            except ValueError:
+                return None
+    return None
+
+
+def _is_no_store(cache_control: Optional[str]) -> bool:
+    """Returns True if a Cache-Control header forbids storing the response."""
+    if not cache_control:
+        return False
+    return "no-store" in [d.strip() for d in cache_control.lower().split(",")]
+
+
+class CacheEntry:
+    """A cached response body and its revalidation metadata.
+
+    Args:
+        url (str): The cached URL.
+        body (str): Decoded response body.
+        etag (str, optional): `ETag` validator.
+        last_modified (str, optional): `Last-Modified` validator.
+        stored_at (float): Wall-clock time the entry was (re)validated.
+        max_age (int, optional): Freshness lifetime in seconds.
+    """
+
+    def __init__(
+        self,
+        url: str,
+        body: str,
+        etag: Optional[str] = None,
+        last_modified: Optional[str] = None,
+        stored_at: float = 0.0,
+        max_age: Optional[int] = None,
+    ):
+        self.url = url
+        self.body = body
+        self.etag = etag
+        self.last_modified = last_modified
+        self.stored_at = stored_at
+        self.max_age = max_age
+
+    def is_fresh(self, now: Optional[float] = None) -> bool:
+        """Returns True if the entry may be served without revalidation."""
+        if not self.max_age:
+            return False
+        now = time.time() if now is None else now
+        return now - self.stored_at < self.max_age
+
+    def conditional_headers(self) -> Dict[str, str]:
+        """Returns the request headers that revalidate this entry."""
+        headers = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+
+class HttpCache:
+    """Thread-safe on-disk response cache with an LRU byte budget.
+
+    Each entry is kept as a `<key>.body` file holding the UTF-8 body and a
+    `<key>.json` file holding its metadata. Bodies are only read from disk
+    when an entry is actually used.
+
+    Args:
+        directory (str): Folder the cache lives in; created if missing.
+        max_bytes (int, optional): Budget for stored bodies in bytes.
+            Default to 512 MiB.
+    """
+
+    def __init__(self, directory: str, max_bytes: int = 512 * 1024 * 1024):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.total_bytes = 0
+        self._sizes: "OrderedDict[str, int]" = OrderedDict()
+        self._lock = threading.Lock()
+        os.makedirs(directory, exist_ok=True)
+        self._load_index()
+
+    @staticmethod
+    def _key(url: str) -> str:
+        return hashlib.sha256(url.encode("utf-8")).hexdigest()
+
+    def _path(self, key: str, suffix: str) -> str:
+        return os.path.join(self.directory, key + suffix)
+
+    def _load_index(self) -> None:
+        """Rebuilds the LRU index from disk, oldest access first."""
+        found = []
+        for filename in os.listdir(self.directory):
+            if not filename.endswith(".json"):
+                continue
+            key = filename[: -len(".json")]
+            try:
+                mtime = os.path.getmtime(self._path(key, ".json"))
+                size = os.path.getsize(self._path(key, ".body"))
+            except OSError:
+                continue
+            found.append((mtime, key, size))
+        for _, key, size in sorted(found):
+            self._sizes[key] = size
+            self.total_bytes += size
+        self._evict()
+
+    def _write_atomic(self, path: str, data: bytes) -> None:
+        tmp_path = f"{path}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+
+    def _remove(self, key: str) -> None:
+        self.total_bytes -= self._sizes.pop(key, 0)
+        for suffix in (".json", ".body"):
+            try:
+                os.remove(self._path(key, suffix))
+            except FileNotFoundError:
+                pass
+
+    def _evict(self) -> None:
+        while self.total_bytes > self.max_bytes and self._sizes:
+            key = next(iter(self._sizes))
+            self._remove(key)
+            logger.debug(f"CACHE: Evicted {key}")
+
+    def get(self, url: str) -> Optional[CacheEntry]:
+        """Looks up a cached entry and marks it as recently used.
+
+        Args:
+            url (str): The URL to look up.
+
+        Returns:
+            Optional[CacheEntry]: The entry, or None on a miss.
+        """
+        key = self._key(url)
+        with self._lock:
+            if key not in self._sizes:
+                return None
+            try:
+                with open(self._path(key, ".json"), "r", encoding="utf-8") as f:
+                    meta = json.load(f)
+                with open(self._path(key, ".body"), "rb") as f:
+                    body = f.read().decode("utf-8")
+                os.utime(self._path(key, ".json"))
+            except (OSError, ValueError):
+                self._remove(key)
+                return None
+            self._sizes.move_to_end(key)
+        return CacheEntry(body=body, **meta)
+
+    def store(self, url: str, body: str, headers: Mapping[str, str]) -> bool:
+        """Stores a 200 response if it carries validators or a lifetime.
+
+        Args:
+            url (str): The fetched URL.
+            body (str): Decoded response body.
+            headers (Mapping[str, str]): Response headers.
+
+        Returns:
+            bool: True if the response was cached.
+        """
+        cache_control = headers.get("Cache-Control")
+        if _is_no_store(cache_control):
+            return False
+        meta = {
+            "url": url,
+            "etag": headers.get("ETag"),
+            "last_modified": headers.get("Last-Modified"),
+            "stored_at": time.time(),
+            "max_age": _parse_max_age(cache_control),
+        }
+        if not (meta["etag"] or meta["last_modified"] or meta["max_age"]):
+            return False
+        data = body.encode("utf-8")
+        if len(data) > self.max_bytes:
+            return False
+        key = self._key(url)
+        with self._lock:
+            self._remove(key)
+            self._write_atomic(self._path(key, ".body"), data)
+            self._write_atomic(
+                self._path(key, ".json"), json.dumps(meta).encode("utf-8")
+            )
+            self._sizes[key] = len(data)
+            self.total_bytes += len(data)
+            self._evict()
+        return True
+
+    def revalidate(self, entry: CacheEntry, headers: Mapping[str, str]) -> None:
+        """Refreshes an entry's metadata after a 304 Not Modified.
+
+        Args:
+            entry (CacheEntry): The entry that was revalidated.
+            headers (Mapping[str, str]): Headers of the 304 response.
+        """
+        cache_control = headers.get("Cache-Control")
+        entry.etag = headers.get("ETag") or entry.etag
+        entry.last_modified = headers.get("Last-Modified") or entry.last_modified
+        max_age = _parse_max_age(cache_control)
+        if max_age is not None:
+            # Includes 0: a 304 with max-age=0 or no-cache ends the lifetime.
+            entry.max_age = max_age
+        entry.stored_at = time.time()
+        meta = {
+            "url": entry.url,
+            "etag": entry.etag,
+            "last_modified": entry.last_modified,
+            "stored_at": entry.stored_at,
+            "max_age": entry.max_age,
+        }
+        key = self._key(entry.url)
+        with self._lock:
+            if key in self._sizes:
+                self._write_atomic(
+                    self._path(key, ".json"), json.dumps(meta).encode("utf-8")
+                )
+
+    def clear(self) -> None:
+        """Removes every entry from the cache."""
+        with self._lock:
+            for key in list(self._sizes):
+                self._remove(key)
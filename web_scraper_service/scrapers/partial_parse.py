@@ -0,0 +1,173 @@
+"""Targeted parsing: build only the parts of a page that hold the data.
+
+Product pages are often megabytes of navigation, scripts and footers around
+one small product container. Instead of materializing the whole DOM, a
+scraper declares its target regions as simple selectors and only those
+subtrees are kept:
+
+- The "lxml" backend feeds the document through an incremental
+  `HTMLPullParser` and discards every element outside a target region as
+  soon as it is closed, so memory stays proportional to the regions, not
+  the page. Regions are returned as `lxml.html` elements, which work with
+  the `html_tools` extraction specs.
+- The "soup" backend uses a BeautifulSoup `SoupStrainer`, for scrapers
+  written against BeautifulSoup.
+
+Region selectors have the form `tag#id.class1.class2`, where every part is
+optional (e.g. "main", "#product", "div.pdp-main").
+
+Belongs to: Web Scraper Service - Scrapers
+"""
+
+import re
+from typing import Any, Iterable, Iterator, List, NamedTuple, Optional, Tuple
+
+from bs4 import BeautifulSoup, SoupStrainer
+from lxml import etree
+from lxml import html as lxml_html
+
+_SELECTOR_RE = re.compile(
+    r"^(?P<tag>[\w-]+)?(?P<id>#[\w-]+)?(?P<classes>(?:\.[\w-]+)*)$"
+)
+
+
+class Region(NamedTuple):
+    """A parsed region selector."""
+
+    tag: Optional[str]
+    id: Optional[str]
+    classes: Tuple[str, ...]
+
+    def matches(self, tag: str, attrs: Any) -> bool:
+        """Returns True if an element with `tag` and `attrs` is in the region."""
+        if self.tag is not None and tag != self.tag:
+            return False
+        if self.id is not None and attrs.get("id") != self.id:
+            return False
+        if self.classes:
+            present = set((attrs.get("class") or "").split())
+            return present.issuperset(self.classes)
+        return True
+
+
+def parse_region(selector: str) -> Region:
+    """Parses a `tag#id.class` region selector.
+
+    Args:
+        selector (str): The selector.
+
+    Returns:
+        Region: The parsed selector.
+
+    Raises:
+        ValueError: If the selector is empty or uses unsupported syntax.
+    """
+    match = _SELECTOR_RE.match(selector.strip())
+    if not selector.strip() or not match:
+        raise ValueError(f"Unsupported region selector: {selector!r}")
+    return Region(
+        tag=match.group("tag").lower() if match.group("tag") else None,
+        id=match.group("id")[1:] if match.group("id") else None,
+        classes=tuple(c for c in match.group("classes").split(".") if c),
+    )
+
+
+def _chunks(html: str, chunk_size: int) -> Iterator[str]:
+    for start in range(0, len(html), chunk_size):
+        yield html[start : start + chunk_size]
+
+
+def iter_regions(
+    html: str, selectors: Iterable[str], chunk_size: int = 65536
+) -> Iterator[Any]:
+    """Streams a document and yields each target region as it completes.
+
+    Nested matches are returned as part of their outermost region.
+
+    Args:
+        html (str): Page HTML.
+        selectors (Iterable[str]): Region selectors.
+        chunk_size (int, optional): Characters fed to the parser at a time.
+            Default to 65536.
+
+    Yields:
+        lxml.html.HtmlElement: Detached region subtrees, in document order.
+    """
+    regions = [parse_region(s) for s in selectors]
+    parser = etree.HTMLPullParser(events=("start", "end"))
+    parser.set_element_class_lookup(lxml_html.HtmlElementClassLookup())
+    depth = 0
+
+    def handle() -> Iterator[Any]:
+        nonlocal depth
+        for event, element in parser.read_events():
+            if not isinstance(element.tag, str):
+                continue
+            if event == "start":
+                if depth or any(
+                    r.matches(element.tag, element.attrib) for r in regions
+                ):
+                    depth += 1
+                continue
+            parent = element.getparent()
+            if depth:
+                depth -= 1
+                if depth:
+                    continue
+                yield element
+            else:
+                element.clear(keep_tail=False)
+            if parent is not None:
+                parent.remove(element)
+
+    for chunk in _chunks(html, chunk_size):
+        parser.feed(chunk)
+        yield from handle()
+    parser.close()
+    yield from handle()
+
+
+def parse_regions(html: str, selectors: Iterable[str]) -> List[Any]:
+    """Returns the target regions of a document as lxml elements.
+
+    Args:
+        html (str): Page HTML.
+        selectors (Iterable[str]): Region selectors.
+
+    Returns:
+        List[lxml.html.HtmlElement]: Region subtrees in document order.
+    """
+    return list(iter_regions(html, selectors))
+
+
+class _RegionStrainer(SoupStrainer):
+    """`SoupStrainer` admitting top-level tags that match any region."""
+
+    def __init__(self, regions: List[Region]):
+        super().__init__()
+        self.regions = regions
+
+    def allow_tag_creation(
+        self, nsprefix: Optional[str], name: str, attrs: Any
+    ) -> bool:
+        attrs = dict(attrs or {})
+        if isinstance(attrs.get("class"), list):
+            attrs["class"] = " ".join(attrs["class"])
+        return any(r.matches(name, attrs) for r in self.regions)
+
+    def allow_string_creation(self, string: str) -> bool:
+        return False
+
+
+def soup_regions(html: str, selectors: Iterable[str]) -> BeautifulSoup:
+    """Parses only the target regions with a BeautifulSoup `SoupStrainer`.
+
+    Args:
+        html (str): Page HTML.
+        selectors (Iterable[str]): Region selectors.
+
+    Returns:
+        BeautifulSoup: A soup holding just the matching subtrees.
+    """
+    strainer = _RegionStrainer([parse_region(s) for s in selectors])
+    return BeautifulSoup(html, "html.parser", parse_only=strainer)
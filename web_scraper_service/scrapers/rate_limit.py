@@ -0,0 +1,233 @@
+"""Per-host request scheduling for the async fetch path.
+
+Each vendor host gets a `HostLimiter` combining two controls:
+
+- a token bucket that caps the request rate (requests/sec, with a burst), and
+- an AIMD concurrency window: every success grows the window additively
+  (by `increase / window`, i.e. about +`increase` per window's worth of
+  requests) and every throttling signal (429, 503, timeout) shrinks it
+  multiplicatively.
+
+`HostRateLimiter` keeps one limiter per host and exposes live stats so the
+safe rate of each vendor can be observed while crawling.
+
+Belongs to: Web Scraper Service - Scrapers
+"""
+
+import asyncio
+import logging
+import time
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Dict, Optional
+from urllib.parse import urlsplit
+
+logger = logging.getLogger("scrapers.rate_limit")
+
+THROTTLE_STATUSES = frozenset({429, 503})
+
+
+class HostLimiter:
+    """Token bucket plus AIMD concurrency window for a single host.
+
+    Args:
+        host (str): Host name the limiter applies to.
+        rate (float, optional): Sustained requests per second. Default to 5.
+        burst (int, optional): Bucket size; defaults to `max(1, rate)`.
+        initial_window (float, optional): Starting concurrency. Default to 2.
+        min_window (float, optional): Concurrency floor. Default to 1.
+        max_window (float, optional): Concurrency ceiling. Default to 32.
+        increase (float, optional): Additive increase per window of
+            successes. Default to 1.
+        decrease (float, optional): Multiplicative decrease factor on
+            throttling. Default to 0.5.
+        cooldown (float, optional): Minimum seconds between two decreases,
+            so one burst of failures only shrinks the window once.
+            Default to 1.
+    """
+
+    def __init__(
+        self,
+        host: str,
+        rate: float = 5.0,
+        burst: Optional[int] = None,
+        initial_window: float = 2.0,
+        min_window: float = 1.0,
+        max_window: float = 32.0,
+        increase: float = 1.0,
+        decrease: float = 0.5,
+        cooldown: float = 1.0,
+    ):
+        self.host = host
+        self.rate = rate
+        self.burst = burst if burst is not None else max(1, int(rate))
+        self.window = initial_window
+        self.min_window = min_window
+        self.max_window = max_window
+        self.increase = increase
+        self.decrease = decrease
+        self.cooldown = cooldown
+        self.in_flight = 0
+        self.requests = 0
+        self.successes = 0
+        self.throttled = 0
+        self.errors = 0
+        self._latency_total = 0.0
+        self._tokens = float(self.burst)
+        self._refilled_at = time.monotonic()
+        self._decreased_at = float("-inf")
+        self._token_lock = asyncio.Lock()
+        self._window_changed = asyncio.Condition()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        elapsed = now - self._refilled_at
+        self._refilled_at = now
+        self._tokens = min(self.burst, self._tokens + elapsed * self.rate)
+
+    async def _take_token(self) -> None:
+        async with self._token_lock:
+            self._refill()
+            while self._tokens < 1:
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+                self._refill()
+            self._tokens -= 1
+
+    async def acquire(self) -> None:
+        """Waits for a free concurrency slot and a rate token."""
+        async with self._window_changed:
+            await self._window_changed.wait_for(
+                lambda: self.in_flight < max(1, int(self.window))
+            )
+            self.in_flight += 1
+        try:
+            await self._take_token()
+        except BaseException:
+            await self._release_slot()
+            raise
+        self.requests += 1
+
+    async def _release_slot(self) -> None:
+        async with self._window_changed:
+            self.in_flight -= 1
+            self._window_changed.notify_all()
+
+    async def release(self, outcome: str, latency: float = 0.0) -> None:
+        """Returns a slot and adapts the window to the request outcome.
+
+        Args:
+            outcome (str): "success", "throttled" or "error". Errors that
+                are not throttling signals leave the window unchanged.
+            latency (float, optional): Request duration in seconds.
+        """
+        self._latency_total += latency
+        if outcome == "success":
+            self.successes += 1
+            self.window = min(
+                self.max_window, self.window + self.increase / self.window
+            )
+        elif outcome == "throttled":
+            self.throttled += 1
+            now = time.monotonic()
+            if now - self._decreased_at >= self.cooldown:
+                self._decreased_at = now
+                self.window = max(self.min_window, self.window * self.decrease)
+                logger.warning(
+                    f"RATE: {self.host} throttled, window -> {self.window:.2f}"
+                )
+        else:
+            self.errors += 1
+        await self._release_slot()
+
+    def stats(self) -> Dict[str, Any]:
+        """Returns a snapshot of the limiter state and counters."""
+        completed = self.successes + self.throttled + self.errors
+        return {
+            "rate": self.rate,
+            "window": round(self.window, 3),
+            "in_flight": self.in_flight,
+            "requests": self.requests,
+            "successes": self.successes,
+            "throttled": self.throttled,
+            "errors": self.errors,
+            "avg_latency": self._latency_total / completed if completed else 0.0,
+        }
+
+
+class RequestSlot:
+    """Handle for one scheduled request; records its outcome.
+
+    Args:
+        limiter (HostLimiter): The limiter the slot was taken from.
+    """
+
+    def __init__(self, limiter: HostLimiter):
+        self.limiter = limiter
+        self.outcome: Optional[str] = None
+
+    def record(self, status: int) -> None:
+        """Classifies an HTTP status code as the request outcome."""
+        if status in THROTTLE_STATUSES:
+            self.outcome = "throttled"
+        elif status < 400:
+            self.outcome = "success"
+        else:
+            self.outcome = "error"
+
+
+class HostRateLimiter:
+    """Registry of per-host limiters sharing default settings.
+
+    Args:
+        overrides (Dict[str, Dict[str, Any]], optional): Per-host keyword
+            arguments for `HostLimiter`, e.g. `{"shop.example": {"rate": 2}}`.
+        **defaults: Keyword arguments applied to every `HostLimiter`.
+    """
+
+    def __init__(
+        self, overrides: Optional[Dict[str, Dict[str, Any]]] = None, **defaults
+    ):
+        self.overrides = overrides or {}
+        self.defaults = defaults
+        self._limiters: Dict[str, HostLimiter] = {}
+
+    def limiter_for(self, url: str) -> HostLimiter:
+        """Returns the limiter for the host of `url`, creating it if needed."""
+        host = urlsplit(url).netloc.lower()
+        limiter = self._limiters.get(host)
+        if limiter is None:
+            options = {**self.defaults, **self.overrides.get(host, {})}
+            limiter = self._limiters[host] = HostLimiter(host, **options)
+        return limiter
+
+    @asynccontextmanager
+    async def slot(self, url: str) -> AsyncIterator[RequestSlot]:
+        """Schedules one request to `url`'s host.
+
+        Call `RequestSlot.record()` with the response status inside the
+        block. Timeouts raised from the block count as throttling; other
+        exceptions count as plain errors.
+
+        Args:
+            url (str): The URL about to be requested.
+
+        Yields:
+            RequestSlot: The slot to record the outcome on.
+        """
+        limiter = self.limiter_for(url)
+        await limiter.acquire()
+        slot = RequestSlot(limiter)
+        started = time.monotonic()
+        try:
+            yield slot
+        except asyncio.TimeoutError:
+            slot.outcome = "throttled"
+            raise
+        except BaseException:
+            slot.outcome = slot.outcome or "error"
+            raise
+        finally:
+            await limiter.release(slot.outcome or "success", time.monotonic() - started)
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        """Returns live stats for every host seen so far."""
+        return {host: lim.stats() for host, lim in self._limiters.items()}
@@ -0,0 +1,242 @@
+"""Lazy scraper registry.
+
+Scrapers are registered by name as "module:Class" import strings and are
+only imported the first time they are looked up, so starting a worker costs
+nothing for vendors it never runs. Third-party packages can contribute
+scrapers through the `web_scraper_service.scrapers` entry-point group,
+e.g. in their `pyproject.toml`:
+
+    [project.entry-points."web_scraper_service.scrapers"]
+    vendor_c = "acme_scrapers.vendor_c:VendorCScraper"
+
+Entry points are discovered on first use too: looking up a registered name
+never scans installed packages.
+
+Each scraper can carry category tags (e.g. "product", "inventory") for
+lookup by category. Tags given at registration are known without importing
+the scraper; entry-point scrapers declare theirs in the class's
+`categories` attribute, so they are imported when filtering by category.
+
+Belongs to: Web Scraper Service - Scrapers
+"""
+
+import importlib
+import logging
+import threading
+from collections.abc import Mapping
+from typing import (
+    TYPE_CHECKING,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Set,
+    Type,
+    Union,
+)
+
+if TYPE_CHECKING:
+    from .base_scraper import BaseScraper
+
+logger = logging.getLogger("scrapers.registry")
+
+ENTRY_POINT_GROUP = "web_scraper_service.scrapers"
+
+ScraperTarget = Union[str, Type["BaseScraper"]]
+
+
+def import_target(target: str) -> object:
+    """Imports the object named by a "module:attribute" string.
+
+    Args:
+        target (str): Import string such as "scrapers.vendor_a:VendorAScraper".
+
+    Returns:
+        object: The imported attribute.
+
+    Raises:
+        ValueError: If `target` is not of the form "module:attribute".
+        ImportError: If the module or attribute cannot be imported.
+    """
+    module_name, _, attribute = target.partition(":")
+    if not module_name or not attribute:
+        raise ValueError(f"Expected 'module:Class', got {target!r}")
+    obj = importlib.import_module(module_name)
+    for part in attribute.split("."):
+        try:
+            obj = getattr(obj, part)
+        except AttributeError:
+            raise ImportError(f"{target!r}: no attribute {part!r}") from None
+    return obj
+
+
+class _Entry:
+    """A registered scraper: its import target, tags and loaded class."""
+
+    __slots__ = ("target", "categories", "scraper_class")
+
+    def __init__(self, target: ScraperTarget, categories: Iterable[str] = ()):
+        self.target = target
+        self.categories: Optional[Set[str]] = set(categories)
+        self.scraper_class = None
+        if not isinstance(target, str):
+            self.categories.update(target.categories)
+            self.scraper_class = target
+
+
+class ScraperRegistry(Mapping):
+    """Mapping of scraper names to scraper classes, imported on first access.
+
+    Membership tests, `names()` and iteration never import scraper modules;
+    indexing, `values()` and `items()` do.
+
+    Args:
+        scrapers (Dict[str, ScraperTarget], optional): Built-in scrapers, as
+            classes or "module:Class" strings.
+        categories (Dict[str, Iterable[str]], optional): Category tags per
+            built-in scraper name.
+        entry_point_group (str, optional): Entry-point group scanned for
+            plugin scrapers; None disables plugins. Default to
+            `ENTRY_POINT_GROUP`.
+    """
+
+    def __init__(
+        self,
+        scrapers: Optional[Dict[str, ScraperTarget]] = None,
+        categories: Optional[Dict[str, Iterable[str]]] = None,
+        entry_point_group: Optional[str] = ENTRY_POINT_GROUP,
+    ):
+        self.entry_point_group = entry_point_group
+        self._entries: Dict[str, _Entry] = {}
+        self._lock = threading.RLock()
+        self._plugins_loaded = entry_point_group is None
+        for name, target in (scrapers or {}).items():
+            self.register(name, target, (categories or {}).get(name, ()))
+
+    def register(
+        self, name: str, target: ScraperTarget, categories: Iterable[str] = ()
+    ) -> None:
+        """Registers a scraper class or "module:Class" import string.
+
+        Args:
+            name (str): Name to register the scraper under.
+            target (ScraperTarget): The scraper class, or where to import it
+                from on first use.
+            categories (Iterable[str], optional): Category tags.
+
+        Raises:
+            TypeError: If `target` is a class not inheriting from BaseScraper.
+            ValueError: If name is already in use.
+        """
+        if not isinstance(target, str):
+            _check_scraper_class(name, target)
+        with self._lock:
+            if name in self._entries:
+                raise ValueError(f"Scraper '{name}' is already registered")
+            self._entries[name] = _Entry(target, categories)
+
+    def _load_plugins(self) -> None:
+        with self._lock:
+            if self._plugins_loaded:
+                return
+            self._plugins_loaded = True
+            # Imported here: importlib.metadata is a noticeable share of the
+            # package's own import time.
+            from importlib import metadata
+
+            for entry_point in metadata.entry_points(group=self.entry_point_group):
+                if entry_point.name in self._entries:
+                    logger.warning(
+                        f"REGISTRY: Ignoring plugin {entry_point.value!r}, "
+                        f"'{entry_point.name}' is already registered"
+                    )
+                    continue
+                entry = _Entry(entry_point.value)
+                entry.categories = None  # Known once the class is imported.
+                self._entries[entry_point.name] = entry
+
+    def _entry(self, name: str) -> _Entry:
+        with self._lock:
+            if name not in self._entries:
+                self._load_plugins()
+            return self._entries[name]
+
+    def __getitem__(self, name: str) -> Type["BaseScraper"]:
+        entry = self._entry(name)
+        if entry.scraper_class is None:
+            with self._lock:
+                if entry.scraper_class is None:
+                    scraper_class = import_target(entry.target)
+                    _check_scraper_class(name, scraper_class)
+                    logger.debug(f"REGISTRY: Loaded '{name}' from {entry.target}")
+                    entry.categories = (entry.categories or set()) | set(
+                        scraper_class.categories
+                    )
+                    entry.scraper_class = scraper_class
+        return entry.scraper_class
+
+    def __contains__(self, name: object) -> bool:
+        try:
+            self._entry(name)
+        except KeyError:
+            return False
+        return True
+
+    def __iter__(self) -> Iterator[str]:
+        self._load_plugins()
+        with self._lock:
+            return iter(list(self._entries))
+
+    def __len__(self) -> int:
+        self._load_plugins()
+        return len(self._entries)
+
+    def names(self, category: Optional[str] = None) -> List[str]:
+        """Lists registered scraper names, optionally for one category.
+
+        Args:
+            category (str, optional): Only return scrapers with this tag.
+
+        Returns:
+            List[str]: Scraper names in registration order.
+        """
+        if category is None:
+            return list(self)
+        return [name for name in self if category in self.categories(name)]
+
+    def categories(self, name: str) -> Set[str]:
+        """Returns the category tags of a scraper.
+
+        Raises:
+            KeyError: If no scraper is registered under `name`.
+        """
+        entry = self._entry(name)
+        if entry.categories is None:
+            self[name]
+        return set(entry.categories)
+
+    def is_loaded(self, name: str) -> bool:
+        """Returns True if the scraper's class has already been imported."""
+        return self._entry(name).scraper_class is not None
+
+    def create(self, name: str, **kwargs) -> "BaseScraper":
+        """Imports (if needed) and instantiates the scraper named `name`.
+
+        Raises:
+            ValueError: If no scraper is registered under `name`.
+        """
+        try:
+            scraper_class = self[name]
+        except KeyError:
+            raise ValueError(f"Unknown scraper type: {name}") from None
+        return scraper_class(name=name, **kwargs)
+
+
+def _check_scraper_class(name: str, scraper_class: object) -> None:
+    from .base_scraper import BaseScraper
+
+    if not isinstance(scraper_class, type) or not issubclass(
+        scraper_class, BaseScraper
+    ):
+        raise TypeError(f"Scraper '{name}' must inherit from BaseScraper")
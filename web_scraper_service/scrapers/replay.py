@@ -0,0 +1,231 @@
+"""Offline replay of archived HTML through the registered parsers.
+
+Streams captures out of an `HtmlArchive` and runs a scraper's `parse_html` on
+them across all cores, with no network access. Used to regenerate data after
+a parser change (backfills) and as a parser performance benchmark: every run
+reports pages/sec and p50/p99 parse time per scraper.
+
+Usage:
+    python -m scrapers.replay ./scraped_pages --scraper vendor_a --workers 8
+
+Belongs to: Web Scraper Service - Scrapers
+"""
+
+import argparse
+import json
+import logging
+import os
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from . import SCRAPER_REGISTRY, create_scraper
+from .base_scraper import BaseScraper
+from .html_archive import HtmlArchive
+
+logger = logging.getLogger("scrapers.replay")
+
+# Scrapers built inside the current worker process, keyed by scraper name.
+_worker_scrapers: Dict[str, BaseScraper] = {}
+
+
+def _parse_batch(
+    scraper_name: str, batch: List[Tuple[str, float, str]]
+) -> List[Dict[str, Any]]:
+    """Parses a batch of captures inside a worker process.
+
+    Args:
+        scraper_name (str): Registered scraper name.
+        batch (List[Tuple[str, float, str]]): (url, fetched_at, html) items.
+
+    Returns:
+        List[Dict[str, Any]]: One replay record per capture.
+    """
+    scraper = _worker_scrapers.get(scraper_name)
+    if scraper is None:
+        scraper = _worker_scrapers[scraper_name] = create_scraper(scraper_name)
+    records = []
+    for url, fetched_at, html in batch:
+        started = time.perf_counter()
+        try:
+            data, error = scraper.parse_html(html, url), None
+        except Exception as e:
+            data, error = None, str(e)
+        records.append(
+            {
+                "url": url,
+                "fetched_at": fetched_at,
+                "data": data,
+                "error": error,
+                "parse_seconds": time.perf_counter() - started,
+            }
+        )
+    return records
+
+
+class ReplayStats:
+    """Throughput and latency figures for one scraper's replay.
+
+    Args:
+        scraper (str): Scraper name.
+    """
+
+    def __init__(self, scraper: str):
+        self.scraper = scraper
+        self.pages = 0
+        self.errors = 0
+        self.wall_seconds = 0.0
+        self.parse_times: List[float] = []
+
+    def add(self, record: Dict[str, Any]) -> None:
+        """Accounts for one replay record."""
+        self.pages += 1
+        self.errors += record["error"] is not None
+        self.parse_times.append(record["parse_seconds"])
+
+    def percentile(self, q: float) -> float:
+        """Returns the nearest-rank `q` quantile of parse time, in seconds."""
+        if not self.parse_times:
+            return 0.0
+        ordered = sorted(self.parse_times)
+        return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+    def as_dict(self) -> Dict[str, Any]:
+        """Returns the report as a plain dict."""
+        return {
+            "scraper": self.scraper,
+            "pages": self.pages,
+            "errors": self.errors,
+            "wall_seconds": round(self.wall_seconds, 4),
+            "pages_per_sec": round(self.pages / self.wall_seconds, 2)
+            if self.wall_seconds
+            else 0.0,
+            "p50_ms": round(self.percentile(0.50) * 1000, 3),
+            "p99_ms": round(self.percentile(0.99) * 1000, 3),
+        }
+
+
+def _batches(
+    captures: Iterable[Tuple[str, float, str]], batch_size: int
+) -> Iterator[List[Tuple[str, float, str]]]:
+    batch = []
+    for capture in captures:
+        batch.append(capture)
+        if len(batch) >= batch_size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def replay(
+    archive_dir: str,
+    scraper_name: str,
+    max_workers: Optional[int] = None,
+    batch_size: int = 32,
+    latest_only: bool = True,
+    stats: Optional[ReplayStats] = None,
+) -> Iterator[Dict[str, Any]]:
+    """Re-parses archived captures with a registered scraper.
+
+    Captures are sent to worker processes in batches, with at most two
+    batches per worker in flight, so memory stays bounded however large the
+    archive is. Records are yielded in completion order.
+
+    Args:
+        archive_dir (str): Folder of the `HtmlArchive` (the scraper's
+            `output_folder`).
+        scraper_name (str): Registered scraper whose `parse_html` to run.
+        max_workers (int, optional): Worker processes. Default to CPU count.
+        batch_size (int, optional): Captures per task. Default to 32.
+        latest_only (bool, optional): Only replay the latest capture of each
+            URL. Default to True.
+        stats (ReplayStats, optional): Collector to update as records arrive.
+
+    Yields:
+        Dict[str, Any]: Records with url, fetched_at, data, error and
+        parse_seconds.
+    """
+    max_workers = max_workers or os.cpu_count() or 1
+    started = time.perf_counter()
+    with (
+        HtmlArchive(archive_dir) as archive,
+        ProcessPoolExecutor(max_workers=max_workers) as pool,
+    ):
+        batches = _batches(archive.iter_pages(latest_only=latest_only), batch_size)
+        pending = set()
+        exhausted = False
+        while True:
+            while not exhausted and len(pending) < 2 * max_workers:
+                batch = next(batches, None)
+                if batch is None:
+                    exhausted = True
+                    break
+                pending.add(pool.submit(_parse_batch, scraper_name, batch))
+            if not pending:
+                break
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                for record in future.result():
+                    if stats is not None:
+                        stats.add(record)
+                        stats.wall_seconds = time.perf_counter() - started
+                    yield record
+
+
+def benchmark(
+    archive_dir: str,
+    scraper_names: Optional[Iterable[str]] = None,
+    max_workers: Optional[int] = None,
+    latest_only: bool = True,
+) -> Dict[str, Dict[str, Any]]:
+    """Replays an archive through each scraper and reports throughput.
+
+    Args:
+        archive_dir (str): Folder of the `HtmlArchive`.
+        scraper_names (Iterable[str], optional): Scrapers to run. Default to
+            every scraper in `SCRAPER_REGISTRY`.
+        max_workers (int, optional): Worker processes. Default to CPU count.
+        latest_only (bool, optional): Only replay the latest capture of each
+            URL. Default to True.
+
+    Returns:
+        Dict[str, Dict[str, Any]]: `ReplayStats.as_dict()` per scraper.
+    """
+    reports = {}
+    for name in scraper_names or SCRAPER_REGISTRY.names():
+        stats = ReplayStats(name)
+        for _ in replay(
+            archive_dir, name, max_workers, latest_only=latest_only, stats=stats
+        ):
+            pass
+        reports[name] = stats.as_dict()
+        logger.info(f"REPLAY: {reports[name]}")
+    return reports
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """Entrypoint for CLI execution: prints a benchmark report as JSON."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("archive_dir", help="HtmlArchive folder to replay")
+    parser.add_argument(
+        "--scraper",
+        action="append",
+        dest="scrapers",
+        help="Scraper to run (repeatable); default: all registered",
+    )
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument(
+        "--all-captures",
+        action="store_true",
+        help="Replay every capture instead of the latest per URL",
+    )
+    args = parser.parse_args(argv)
+    report = benchmark(
+        args.archive_dir, args.scrapers, args.workers, not args.all_captures
+    )
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,274 @@
+"""Retry policy and per-host circuit breaker for the fetch layer.
+
+`RetryPolicy` decides, per failed attempt, whether to retry and how long to
+wait first:
+
+- HTTP errors are split into retryable statuses (408, 425, 429, 5xx gateway
+  errors) and non-retryable ones (e.g. 404), which fail immediately.
+- Delays use exponential backoff with full jitter, i.e. a uniform draw from
+  `[0, min(max_delay, base_delay * 2 ** (attempt - 1))]`.
+- A `Retry-After` header (seconds or HTTP date) overrides the computed delay,
+  capped at `max_delay`.
+
+`CircuitBreaker` tracks consecutive failures per host. Once a host crosses the
+threshold its circuit opens and calls fail fast with `CircuitOpenError`; after
+`reset_timeout` one trial call is let through (half-open) and its outcome
+closes or re-opens the circuit.
+
+Belongs to: Web Scraper Service - Scrapers
+"""
+
+import logging
+import random
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from typing import Any, Dict, FrozenSet, Mapping, Optional, Tuple
+from urllib.parse import urlsplit
+
+logger = logging.getLogger("scrapers.retry_policy")
+
+DEFAULT_RETRY_STATUSES = frozenset({408, 425, 429, 500, 502, 503, 504})
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitOpenError(Exception):
+    """Raised when a request is refused because the host's circuit is open."""
+
+    pass
+
+
+def _host(url: str) -> str:
+    return urlsplit(url).netloc.lower()
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Parses a `Retry-After` header into a delay in seconds.
+
+    Args:
+        value (str, optional): Header value, either delta-seconds or an
+            HTTP date.
+
+    Returns:
+        Optional[float]: Non-negative delay, or None if absent or invalid.
+    """
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max(retry_at.timestamp() - time.time(), 0.0)
+
+
+def response_details(exc: BaseException) -> Tuple[Optional[int], Mapping[str, str]]:
+    """Extracts the HTTP status and headers carried by a fetch exception.
+
+    Works for `requests.HTTPError` (via `exc.response`) and
+    `aiohttp.ClientResponseError` (via `exc.status` / `exc.headers`).
+
+    Args:
+        exc (BaseException): The exception raised by an attempt.
+
+    Returns:
+        Tuple[Optional[int], Mapping[str, str]]: Status code (None for
+        transport errors) and response headers.
+    """
+    response = getattr(exc, "response", None)
+    status = getattr(response, "status_code", None)
+    headers = getattr(response, "headers", None)
+    if status is None:
+        status = getattr(exc, "status", None)
+        headers = getattr(exc, "headers", None)
+    return (status if isinstance(status, int) else None), (headers or {})
+
+
+class CircuitBreaker:
+    """Thread-safe, per-host closed/open/half-open circuit breaker.
+
+    Args:
+        failure_threshold (int, optional): Consecutive failures that open a
+            host's circuit. Default to 5.
+        reset_timeout (float, optional): Seconds an open circuit waits before
+            allowing a half-open trial call. Default to 30.
+    """
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30.0):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._hosts: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+
+    def _state_for(self, host: str) -> Dict[str, Any]:
+        return self._hosts.setdefault(
+            host, {"state": CLOSED, "failures": 0, "opened_at": 0.0, "trial": False}
+        )
+
+    def state(self, url: str) -> str:
+        """Returns the circuit state ("closed", "open" or "half_open")."""
+        with self._lock:
+            return self._state_for(_host(url))["state"]
+
+    def before_call(self, url: str) -> None:
+        """Admits a call or fails fast.
+
+        Args:
+            url (str): The URL about to be requested.
+
+        Raises:
+            CircuitOpenError: If the host's circuit is open, or half-open
+                with its trial call already in flight.
+        """
+        host = _host(url)
+        with self._lock:
+            entry = self._state_for(host)
+            if entry["state"] == OPEN:
+                if time.monotonic() - entry["opened_at"] < self.reset_timeout:
+                    raise CircuitOpenError(f"Circuit open for {host}")
+                entry["state"] = HALF_OPEN
+                entry["trial"] = False
+            if entry["state"] == HALF_OPEN:
+                if entry["trial"]:
+                    raise CircuitOpenError(f"Circuit half-open for {host}")
+                entry["trial"] = True
+
+    def record_success(self, url: str) -> None:
+        """Closes the host's circuit and resets its failure count."""
+        with self._lock:
+            entry = self._state_for(_host(url))
+            if entry["state"] != CLOSED:
+                logger.info(f"CIRCUIT: Closed for {_host(url)}")
+            entry.update(state=CLOSED, failures=0, trial=False)
+
+    def record_failure(self, url: str) -> None:
+        """Counts a failure, opening the circuit past the threshold."""
+        host = _host(url)
+        with self._lock:
+            entry = self._state_for(host)
+            entry["failures"] += 1
+            if (
+                entry["state"] == HALF_OPEN
+                or entry["failures"] >= self.failure_threshold
+            ):
+                if entry["state"] != OPEN:
+                    logger.warning(f"CIRCUIT: Opened for {host}")
+                entry.update(state=OPEN, opened_at=time.monotonic(), trial=False)
+
+    def release_trial(self, url: str) -> None:
+        """Frees a half-open host's trial slot without judging the host.
+
+        For a trial call that ended with neither a success nor a failure,
+        e.g. because it was cancelled; the next call becomes the trial.
+        """
+        with self._lock:
+            entry = self._state_for(_host(url))
+            if entry["state"] == HALF_OPEN:
+                entry["trial"] = False
+
+    def reset(self) -> None:
+        """Forgets the state of every host."""
+        with self._lock:
+            self._hosts.clear()
+
+
+_default_breaker = CircuitBreaker()
+
+
+def get_default_breaker() -> CircuitBreaker:
+    """Returns the process-wide breaker shared by the default fetch policy."""
+    return _default_breaker
+
+
+class RetryPolicy:
+    """Decides whether and when to retry a failed fetch attempt.
+
+    Args:
+        max_retries (int, optional): Total attempts, including the first.
+            Default to 3.
+        base_delay (float, optional): Backoff scale in seconds. Default to 1.
+        max_delay (float, optional): Upper bound for any single delay,
+            including `Retry-After`. Default to 30.
+        retry_statuses (FrozenSet[int], optional): HTTP statuses worth
+            retrying. Other HTTP errors fail immediately.
+        breaker (CircuitBreaker, optional): Per-host breaker consulted before
+            every attempt. Default to none.
+    """
+
+    def __init__(
+        self,
+        max_retries: int = 3,
+        base_delay: float = 1.0,
+        max_delay: float = 30.0,
+        retry_statuses: FrozenSet[int] = DEFAULT_RETRY_STATUSES,
+        breaker: Optional[CircuitBreaker] = None,
+    ):
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.retry_statuses = frozenset(retry_statuses)
+        self.breaker = breaker
+
+    def is_retryable(self, exc: BaseException) -> bool:
+        """Returns True for transport errors and retryable HTTP statuses."""
+        if isinstance(exc, CircuitOpenError):
+            return False
+        status, _ = response_details(exc)
+        return status is None or status in self.retry_statuses
+
+    def backoff(self, attempt: int) -> float:
+        """Returns a full-jitter exponential delay for the given attempt."""
+        ceiling = min(self.max_delay, self.base_delay * 2 ** (attempt - 1))
+        return random.uniform(0, ceiling)
+
+    def before_attempt(self, url: str) -> None:
+        """Fails fast if the breaker refuses calls to `url`'s host.
+
+        Raises:
+            CircuitOpenError: If the host's circuit is open.
+        """
+        if self.breaker is not None:
+            self.breaker.before_call(url)
+
+    def on_success(self, url: str) -> None:
+        """Records a successful attempt."""
+        if self.breaker is not None:
+            self.breaker.record_success(url)
+
+    def on_abort(self, url: str) -> None:
+        """Records an attempt interrupted before it succeeded or failed."""
+        if self.breaker is not None:
+            self.breaker.release_trial(url)
+
+    def on_failure(self, url: str, exc: BaseException, attempt: int) -> Optional[float]:
+        """Records a failed attempt and returns the delay before the next one.
+
+        Non-retryable HTTP errors prove the host is up, so they do not count
+        against its circuit.
+
+        Args:
+            url (str): The URL that failed.
+            exc (BaseException): The exception raised by the attempt.
+            attempt (int): 1-based number of the failed attempt.
+
+        Returns:
+            Optional[float]: Seconds to wait, or None to give up.
+        """
+        retryable = self.is_retryable(exc)
+        if self.breaker is not None and not isinstance(exc, CircuitOpenError):
+            if retryable:
+                self.breaker.record_failure(url)
+            else:
+                self.breaker.record_success(url)
+        if not retryable or attempt >= self.max_retries:
+            return None
+        _, headers = response_details(exc)
+        retry_after = parse_retry_after(headers.get("Retry-After"))
+        if retry_after is not None:
+            return min(retry_after, self.max_delay)
+        return self.backoff(attempt)
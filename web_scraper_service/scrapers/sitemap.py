@@ -0,0 +1,314 @@
+"""Streaming sitemap ingestion for seeding crawls.
+
+Sitemaps and sitemap indexes are parsed incrementally: the response body is
+streamed in chunks, gunzipped on the fly when it is gzip data, and fed to
+lxml's `iterparse`. Every `<url>` / `<sitemap>` element is cleared as soon
+as it has been read, so memory stays constant whatever the sitemap size.
+
+Nested sitemap indexes are followed depth-first. Entries can be filtered by
+URL pattern, each pattern naming a product category, and by `lastmod`, so
+incremental runs only see pages changed since the previous one; index
+entries older than the cutoff are skipped without being downloaded.
+
+Belongs to: Web Scraper Service - Scrapers
+"""
+
+import asyncio
+import gzip
+import io
+import itertools
+import json
+import logging
+import os
+import re
+from datetime import datetime, timezone
+from typing import (
+    AsyncIterator,
+    BinaryIO,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    NamedTuple,
+    Optional,
+)
+
+from lxml import etree
+
+from . import fetch_utils
+
+logger = logging.getLogger("scrapers.sitemap")
+
+_GZIP_MAGIC = b"\x1f\x8b"
+
+Opener = Callable[[str], BinaryIO]
+
+
+class SitemapEntry(NamedTuple):
+    """One page listed in a sitemap."""
+
+    url: str
+    lastmod: Optional[datetime]
+    category: Optional[str]
+
+
+class _ChunkReader(io.RawIOBase):
+    """Read-only file object over an iterator of byte chunks."""
+
+    def __init__(self, chunks: Iterator[bytes]):
+        self._chunks = chunks
+        self._buffer = b""
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, b) -> int:
+        while not self._buffer:
+            try:
+                self._buffer = next(self._chunks)
+            except StopIteration:
+                return 0
+        size = min(len(b), len(self._buffer))
+        b[:size] = self._buffer[:size]
+        self._buffer = self._buffer[size:]
+        return size
+
+    def close(self) -> None:
+        close = getattr(self._chunks, "close", None)
+        if close is not None:
+            close()
+        super().close()
+
+
+def open_url(url: str, timeout: float = 60) -> BinaryIO:
+    """Opens a sitemap URL as a streaming binary file.
+
+    The body is read as the caller consumes it, which for a large sitemap
+    can take far longer than the download itself, so only stalls are timed:
+    there is no limit on the total time.
+
+    Args:
+        url (str): Sitemap URL.
+        timeout (float, optional): Longest wait in seconds for the connection
+            or any single read. Default to 60.
+
+    Returns:
+        BinaryIO: The (still compressed, if it is a .gz file) body.
+    """
+    chunks = fetch_utils.stream_html_sync(url, timeout=None, idle_timeout=timeout)
+    return io.BufferedReader(_ChunkReader(chunks), buffer_size=65536)
+
+
+def _maybe_gunzip(stream: BinaryIO) -> BinaryIO:
+    if not isinstance(stream, io.BufferedReader):
+        stream = io.BufferedReader(stream)
+    if stream.peek(2)[:2] == _GZIP_MAGIC:
+        return gzip.GzipFile(fileobj=stream)
+    return stream
+
+
+def parse_lastmod(value: Optional[str]) -> Optional[datetime]:
+    """Parses a W3C datetime such as "2024-05-01" or "2024-05-01T10:00Z".
+
+    Args:
+        value (str, optional): The `lastmod` text.
+
+    Returns:
+        Optional[datetime]: Timezone-aware datetime (UTC if unspecified), or
+        None if missing or invalid.
+    """
+    if not value:
+        return None
+    try:
+        parsed = datetime.fromisoformat(value.strip().replace("Z", "+00:00"))
+    except ValueError:
+        return None
+    return parsed if parsed.tzinfo else parsed.replace(tzinfo=timezone.utc)
+
+
+def _child_text(element, name: str) -> Optional[str]:
+    child = element.find(f"{{*}}{name}")
+    if child is None:
+        child = element.find(name)
+    return child.text.strip() if child is not None and child.text else None
+
+
+def iter_sitemap(
+    source: str,
+    categories: Optional[Dict[str, str]] = None,
+    since: Optional[datetime] = None,
+    opener: Optional[Opener] = None,
+    max_depth: int = 5,
+) -> Iterator[SitemapEntry]:
+    """Streams the entries of a sitemap or sitemap index.
+
+    Args:
+        source (str): Sitemap or sitemap index URL.
+        categories (Dict[str, str], optional): Category name to URL regex;
+            only matching pages are yielded, tagged with the first matching
+            category. Default to every page, untagged.
+        since (datetime, optional): Skip pages and child sitemaps whose
+            `lastmod` is older. Entries without `lastmod` are kept.
+        opener (Opener, optional): Opens a sitemap URL as a binary stream.
+            Default to a streamed HTTP download.
+        max_depth (int, optional): Maximum nesting of sitemap indexes.
+            Default to 5.
+
+    Yields:
+        SitemapEntry: Matching pages, in sitemap order.
+    """
+    opener = opener or open_url
+    compiled = {name: re.compile(p) for name, p in (categories or {}).items()}
+    if since is not None and since.tzinfo is None:
+        since = since.replace(tzinfo=timezone.utc)
+    visited = set()
+
+    def walk(url: str, depth: int) -> Iterator[SitemapEntry]:
+        if url in visited or depth > max_depth:
+            return
+        visited.add(url)
+        logger.info(f"SITEMAP: Reading {url}")
+        stream = _maybe_gunzip(opener(url))
+        children = []
+        try:
+            for _, element in etree.iterparse(
+                stream, events=("end",), tag=("{*}url", "{*}sitemap"), huge_tree=True
+            ):
+                loc = _child_text(element, "loc")
+                lastmod = parse_lastmod(_child_text(element, "lastmod"))
+                is_index = etree.QName(element).localname == "sitemap"
+                element.clear()
+                while element.getprevious() is not None:
+                    del element.getparent()[0]
+                if not loc or (since and lastmod and lastmod < since):
+                    continue
+                if is_index:
+                    children.append(loc)
+                    continue
+                category = None
+                if compiled:
+                    category = next(
+                        (name for name, p in compiled.items() if p.search(loc)), None
+                    )
+                    if category is None:
+                        continue
+                yield SitemapEntry(loc, lastmod, category)
+        finally:
+            stream.close()
+        for child in children:
+            yield from walk(child, depth + 1)
+
+    yield from walk(source, 0)
+
+
+def _distinct_urls(
+    entries: Iterable[SitemapEntry], frontier, seen: set
+) -> Iterator[str]:
+    for entry in entries:
+        if frontier is not None:
+            url = frontier.normalizer(entry.url)
+            if frontier.seen.add(url):
+                yield url
+        elif entry.url not in seen:
+            seen.add(entry.url)
+            yield entry.url
+
+
+def sitemap_urls(sources: Iterable[str], frontier=None, **kwargs) -> Iterator[str]:
+    """Yields distinct page URLs from several sitemaps.
+
+    Sitemaps are downloaded while the iterator is consumed, so each `next()`
+    may block on the network; in async code use `asitemap_urls` instead.
+
+    Args:
+        sources (Iterable[str]): Sitemap or sitemap index URLs.
+        frontier (Frontier, optional): Crawl frontier whose normalizer and
+            seen-set deduplicate the URLs, so pages already found by a
+            listing crawl are not scraped twice.
+        **kwargs: Filters passed to `iter_sitemap`.
+
+    Yields:
+        str: Page URLs (normalized when a frontier is given).
+    """
+    entries = (entry for source in sources for entry in iter_sitemap(source, **kwargs))
+    yield from _distinct_urls(entries, frontier, set())
+
+
+async def asitemap_urls(
+    sources: Iterable[str], frontier=None, batch_size: int = 500, **kwargs
+) -> AsyncIterator[str]:
+    """Asynchronously yields distinct page URLs from several sitemaps.
+
+    Downloading and parsing run in a worker thread, `batch_size` entries at
+    a time, so the event loop never blocks on them; deduplication against
+    the frontier stays on the event loop. The result can be passed straight
+    to `BaseScraper.ascrape_multiple` or used as a pipeline source.
+
+    Args:
+        sources (Iterable[str]): Sitemap or sitemap index URLs.
+        frontier (Frontier, optional): Crawl frontier deduplicating the URLs,
+            as in `sitemap_urls`.
+        batch_size (int, optional): Entries read per trip to the worker
+            thread. Default to 500.
+        **kwargs: Filters passed to `iter_sitemap`.
+
+    Yields:
+        str: Page URLs (normalized when a frontier is given).
+    """
+    entries = (entry for source in sources for entry in iter_sitemap(source, **kwargs))
+    seen = set()
+    while True:
+        batch = await asyncio.to_thread(list, itertools.islice(entries, batch_size))
+        if not batch:
+            return
+        for url in _distinct_urls(batch, frontier, seen):
+            yield url
+
+
+def seed_frontier(frontier, entries: Iterable[SitemapEntry], priority: int = 0) -> int:
+    """Queues sitemap entries, e.g. category pages, into a crawl frontier.
+
+    Args:
+        frontier (Frontier): The frontier to fill.
+        entries (Iterable[SitemapEntry]): Entries from `iter_sitemap`.
+        priority (int, optional): Queue priority. Default to 0.
+
+    Returns:
+        int: Number of entries queued (duplicates are skipped).
+    """
+    return sum(frontier.add(entry.url, 0, priority) for entry in entries)
+
+
+class SitemapCheckpoint:
+    """Remembers when each sitemap was last ingested, for `since` filtering.
+
+    Args:
+        path (str): JSON file holding the checkpoints.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._runs: Dict[str, str] = {}
+        if os.path.exists(path):
+            with open(path, encoding="utf-8") as f:
+                self._runs = json.load(f)
+
+    def last_run(self, source: str) -> Optional[datetime]:
+        """Returns the start time of the last completed run for `source`."""
+        return parse_lastmod(self._runs.get(source))
+
+    def mark(self, source: str, started_at: datetime) -> None:
+        """Records a completed run and saves the file atomically.
+
+        Args:
+            source (str): Sitemap URL.
+            started_at (datetime): When the run started; pages modified
+                after it are picked up next time.
+        """
+        if started_at.tzinfo is None:
+            started_at = started_at.replace(tzinfo=timezone.utc)
+        self._runs[source] = started_at.isoformat()
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(self._runs, f, indent=2, sort_keys=True)
+        os.replace(tmp_path, self.path)
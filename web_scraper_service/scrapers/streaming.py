@@ -0,0 +1,165 @@
+"""Helpers for streaming HTML bodies with size caps and early termination.
+
+Lets the fetch layer stop reading a response as soon as the interesting part
+of the page has arrived, instead of buffering and decoding multi-megabyte
+documents in full:
+
+- `limit_chunks` / `alimit_chunks` cut a chunk stream at a byte cap or once
+  a stop predicate fires.
+- `stop_at_marker` builds a predicate that fires once a sentinel such as
+  `</main>` has been seen, even when it straddles two chunks.
+- `decode_body` decodes the collected bytes once, at the end, using the
+  declared charset, a `<meta charset>` sniffed from the head of the
+  document, or UTF-8.
+
+Belongs to: Web Scraper Service - Scrapers
+"""
+
+import codecs
+import re
+from typing import AsyncIterable, AsyncIterator, Callable, Iterable, Iterator
+from typing import Optional, Union
+
+StopPredicate = Callable[[bytes], bool]
+
+_META_CHARSET_RE = re.compile(
+    rb"""<meta[^>]+charset\s*=\s*["']?\s*([a-zA-Z0-9_.:-]+)""", re.IGNORECASE
+)
+_SNIFF_BYTES = 2048
+
+
+def stop_at_marker(marker: Union[str, bytes]) -> StopPredicate:
+    """Builds a predicate that fires once `marker` has appeared in the stream.
+
+    The predicate is stateful: it is meant to be called with consecutive
+    chunks of a single response and keeps just enough of the previous chunk
+    to match markers that span a chunk boundary.
+
+    Args:
+        marker (Union[str, bytes]): Sentinel to look for, e.g. "</main>".
+            Strings are matched as UTF-8.
+
+    Returns:
+        StopPredicate: Callable taking each chunk and returning True once
+        the marker has been seen.
+    """
+    needle = marker.encode("utf-8") if isinstance(marker, str) else marker
+    tail = b""
+
+    def predicate(chunk: bytes) -> bool:
+        nonlocal tail
+        window = tail + chunk
+        if needle in window:
+            return True
+        tail = window[-(len(needle) - 1) :] if len(needle) > 1 else b""
+        return False
+
+    return predicate
+
+
+def limit_chunks(
+    chunks: Iterable[bytes],
+    max_bytes: Optional[int] = None,
+    stop_when: Optional[StopPredicate] = None,
+) -> Iterator[bytes]:
+    """Passes chunks through until a byte cap or stop predicate is reached.
+
+    Args:
+        chunks (Iterable[bytes]): Source chunks.
+        max_bytes (int, optional): Total bytes to pass through; the last
+            chunk is truncated to fit. Default to unlimited.
+        stop_when (StopPredicate, optional): Called with each chunk after it
+            has been yielded; returning True ends the stream.
+
+    Yields:
+        bytes: The (possibly truncated) chunks.
+    """
+    total = 0
+    for chunk in chunks:
+        if max_bytes is not None and total + len(chunk) >= max_bytes:
+            if max_bytes > total:
+                yield chunk[: max_bytes - total]
+            return
+        total += len(chunk)
+        yield chunk
+        if stop_when is not None and stop_when(chunk):
+            return
+
+
+async def alimit_chunks(
+    chunks: AsyncIterable[bytes],
+    max_bytes: Optional[int] = None,
+    stop_when: Optional[StopPredicate] = None,
+) -> AsyncIterator[bytes]:
+    """Async counterpart of `limit_chunks`.
+
+    Args:
+        chunks (AsyncIterable[bytes]): Source chunks.
+        max_bytes (int, optional): Total bytes to pass through; the last
+            chunk is truncated to fit. Default to unlimited.
+        stop_when (StopPredicate, optional): Called with each chunk after it
+            has been yielded; returning True ends the stream.
+
+    Yields:
+        bytes: The (possibly truncated) chunks.
+    """
+    total = 0
+    async for chunk in chunks:
+        if max_bytes is not None and total + len(chunk) >= max_bytes:
+            if max_bytes > total:
+                yield chunk[: max_bytes - total]
+            return
+        total += len(chunk)
+        yield chunk
+        if stop_when is not None and stop_when(chunk):
+            return
+
+
+def sniff_charset(head: bytes) -> Optional[str]:
+    """Finds a `<meta charset>` declaration in the start of a document.
+
+    Args:
+        head (bytes): The first bytes of the document.
+
+    Returns:
+        Optional[str]: A known codec name, or None.
+    """
+    match = _META_CHARSET_RE.search(head[:_SNIFF_BYTES])
+    if not match:
+        return None
+    return _known_codec(match.group(1).decode("ascii", errors="ignore"))
+
+
+def _known_codec(name: Optional[str]) -> Optional[str]:
+    if not name:
+        return None
+    try:
+        return codecs.lookup(name).name
+    except LookupError:
+        return None
+
+
+def charset_from_content_type(content_type: Optional[str]) -> Optional[str]:
+    """Returns the `charset` parameter of a Content-Type header, if any."""
+    if not isinstance(content_type, str):
+        return None
+    for param in content_type.split(";")[1:]:
+        key, _, value = param.partition("=")
+        if key.strip().lower() == "charset":
+            return value.strip().strip("\"'") or None
+    return None
+
+
+def decode_body(body: bytes, charset: Optional[str] = None) -> str:
+    """Decodes a response body once, choosing the charset lazily.
+
+    Args:
+        body (bytes): Raw (possibly truncated) body.
+        charset (str, optional): Charset declared by the Content-Type
+            header, if any.
+
+    Returns:
+        str: The decoded text; undecodable bytes are replaced.
+    """
+    encoding = _known_codec(charset) or sniff_charset(body) or "utf-8"
+    return body.decode(encoding, errors="replace")
@@ -0,0 +1,220 @@
+"""Tiered fetching: plain HTTP first, a headless browser only when needed.
+
+`TieredFetcher` fetches a page over pooled HTTP and checks that it is usable:
+the vendor's required selectors must match and the page must not look
+JavaScript-gated (an empty app shell, a "please enable JavaScript" notice).
+Pages that fail the check are re-fetched through a browser renderer.
+
+The outcome is remembered per URL pattern (host plus path, with IDs and
+slugs wildcarded), so once a product template is known to need rendering,
+later pages of that template skip the wasted HTTP attempt.
+
+A `TieredFetcher` has the same `render(url, wait_selector)` interface as a
+browser renderer, so it can be attached as a scraper's `renderer`.
+
+Belongs to: Web Scraper Service - Scrapers
+"""
+
+import asyncio
+import logging
+import re
+import threading
+from functools import lru_cache
+from typing import Any, Callable, Dict, Iterable, Optional, Tuple
+from urllib.parse import urlsplit
+
+from lxml import etree
+from lxml import html as lxml_html
+from lxml.cssselect import CSSSelector
+
+from . import fetch_utils
+from .fetch_utils import AsyncFetcher
+
+logger = logging.getLogger("scrapers.tiered_fetch")
+
+HTTP = "http"
+RENDER = "render"
+
+DEFAULT_JS_GATE_MARKERS: Tuple[str, ...] = (
+    "enable javascript",
+    "javascript is required",
+    "javascript is disabled",
+    "requires javascript",
+    "please enable js",
+)
+
+_EMPTY_APP_ROOT_RE = re.compile(
+    r"<div[^>]+id=[\"'](?:root|app|__next|__nuxt)[\"'][^>]*>\s*</div>", re.IGNORECASE
+)
+_NON_TEXT_RE = re.compile(
+    r"<(script|style|noscript|template)\b.*?</\1\s*>|<[^>]+>", re.IGNORECASE | re.DOTALL
+)
+_VARIABLE_SEGMENT_RE = re.compile(
+    r"^(?:\d+|[0-9a-f]{8,}|[0-9a-f-]{36}|.*\d.*-.*|[\w-]{25,}|.+\.html?)$",
+    re.IGNORECASE,
+)
+
+PageCheck = Callable[[str], bool]
+
+
+def url_pattern(url: str) -> str:
+    """Reduces a URL to its template, e.g. "shop.com/p/*".
+
+    Numeric, hex and long or digit-bearing slug segments are wildcarded; the
+    query string is dropped.
+
+    Args:
+        url (str): Page URL.
+
+    Returns:
+        str: Host plus wildcarded path.
+    """
+    parts = urlsplit(url)
+    segments = [
+        "*" if _VARIABLE_SEGMENT_RE.match(segment) else segment
+        for segment in parts.path.split("/")
+        if segment
+    ]
+    return "/".join([parts.netloc.lower()] + segments)
+
+
+def looks_js_gated(
+    html: str,
+    markers: Iterable[str] = DEFAULT_JS_GATE_MARKERS,
+    min_text_chars: int = 200,
+) -> bool:
+    """Guesses whether a page needs JavaScript to show its content.
+
+    Markers are only looked for in the visible text: most complete pages
+    carry a "please enable JavaScript" notice inside `<noscript>`, which a
+    browser with JavaScript never shows.
+
+    Args:
+        html (str): Page body fetched without a browser.
+        markers (Iterable[str], optional): Lower-case phrases that signal a
+            "JavaScript required" notice.
+        min_text_chars (int, optional): Visible text below which a page that
+            ships scripts is treated as an empty app shell. Default to 200.
+
+    Returns:
+        bool: True if the page should be rendered in a browser.
+    """
+    if _EMPTY_APP_ROOT_RE.search(html):
+        return True
+    text = " ".join(_NON_TEXT_RE.sub(" ", html).split())
+    lowered = text.lower()
+    if any(marker in lowered for marker in markers):
+        return True
+    if "<script" not in html.lower():
+        return False
+    return len(text.replace(" ", "")) < min_text_chars
+
+
+@lru_cache(maxsize=256)
+def _compile_selector(selector: str) -> CSSSelector:
+    return CSSSelector(selector)
+
+
+def has_selectors(html: str, selectors: Iterable[str]) -> bool:
+    """Returns True if every CSS selector matches at least one element.
+
+    Uses lxml with compiled selectors, which is several times faster than
+    BeautifulSoup for this yes/no check.
+    """
+    selectors = list(selectors)
+    if not selectors:
+        return True
+    try:
+        root = lxml_html.document_fromstring(html)
+    except (etree.ParserError, ValueError):
+        return False
+    return all(_compile_selector(selector)(root) for selector in selectors)
+
+
+class TieredFetcher:
+    """Fetches over HTTP and escalates to a browser renderer when needed.
+
+    Safe to share between the tasks of one event loop; the per-pattern
+    decisions are also guarded for use from several threads.
+
+    Args:
+        renderer: Browser backend with an async `render(url, wait_selector)`
+            method, such as a `PlaywrightPool`.
+        required_selectors (Iterable[str], optional): CSS selectors that must
+            all match for an HTTP fetch to count as complete. Default to none.
+        page_check (PageCheck, optional): Extra completeness check run on the
+            HTTP body, e.g. "do the parsed fields include a price".
+        min_text_chars (int, optional): See `looks_js_gated`. Default to 200.
+        fetcher (AsyncFetcher, optional): Pooled HTTP fetcher. Default to the
+            process-wide shared fetcher.
+    """
+
+    def __init__(
+        self,
+        renderer: Any,
+        required_selectors: Iterable[str] = (),
+        page_check: Optional[PageCheck] = None,
+        min_text_chars: int = 200,
+        fetcher: Optional[AsyncFetcher] = None,
+    ):
+        self.renderer = renderer
+        self.required_selectors = tuple(required_selectors)
+        self.page_check = page_check
+        self.min_text_chars = min_text_chars
+        self.fetcher = fetcher
+        self._tiers: Dict[str, str] = {}
+        self._lock = threading.Lock()
+        self._stats = {"http": 0, "render": 0, "escalated": 0}
+
+    def tier_for(self, url: str) -> Optional[str]:
+        """Returns the remembered tier ("http" or "render") for `url`'s pattern."""
+        with self._lock:
+            return self._tiers.get(url_pattern(url))
+
+    def _remember(self, url: str, tier: str) -> None:
+        pattern = url_pattern(url)
+        with self._lock:
+            if self._tiers.get(pattern) != tier:
+                logger.info(f"TIER: {pattern} -> {tier}")
+            self._tiers[pattern] = tier
+
+    def _count(self, key: str) -> None:
+        with self._lock:
+            self._stats[key] += 1
+
+    def is_complete(self, html: str) -> bool:
+        """Returns True if an HTTP body can be parsed without rendering."""
+        if looks_js_gated(html, min_text_chars=self.min_text_chars):
+            return False
+        if not has_selectors(html, self.required_selectors):
+            return False
+        return self.page_check is None or self.page_check(html)
+
+    async def render(self, url: str, wait_selector: Optional[str] = None) -> str:
+        """Fetches `url` through the cheapest tier that yields a usable page.
+
+        Args:
+            url (str): The URL to fetch.
+            wait_selector (str, optional): Selector passed to the browser
+                renderer when the page is rendered.
+
+        Returns:
+            str: The page HTML.
+        """
+        if self.tier_for(url) != RENDER:
+            html = await fetch_utils.fetch_html_async(url, fetcher=self.fetcher)
+            # Parsing the page for the checks is CPU-bound; keep it off the loop.
+            if await asyncio.to_thread(self.is_complete, html):
+                self._remember(url, HTTP)
+                self._count("http")
+                return html
+            logger.info(f"TIER: Escalating {url} to the browser")
+            self._count("escalated")
+            self._remember(url, RENDER)
+        self._count("render")
+        return await self.renderer.render(url, wait_selector)
+
+    def stats(self) -> Dict[str, Any]:
+        """Returns tier counters and the number of learned URL patterns."""
+        with self._lock:
+            return dict(self._stats, patterns=len(self._tiers))
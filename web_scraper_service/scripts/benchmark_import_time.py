@@ -0,0 +1,90 @@
+"""Cold-start benchmark for the scrapers package.
+
+Runs each scenario in a fresh interpreter several times and reports the
+median wall time, so regressions in import cost (a vendor module pulling in
+a browser driver at import time, say) show up before they reach the
+autoscaled workers. Run from the `web_scraper_service` folder:
+
+    python scripts/benchmark_import_time.py --repeat 10
+
+Belongs to: Infrastructure / DevOps Utilities
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+from typing import Dict, List, Optional
+
+SERVICE_ROOT: str = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+SCENARIOS: Dict[str, str] = {
+    "import scrapers": "import scrapers",
+    "list scrapers": "import scrapers; scrapers.scraper_names()",
+    "create one scraper": (
+        "import scrapers; scrapers.create_scraper(scrapers.scraper_names()[0])"
+    ),
+    "create all scrapers": (
+        "import scrapers\n"
+        "for name in scrapers.scraper_names():\n"
+        "    scrapers.create_scraper(name)"
+    ),
+}
+
+_TIMER = (
+    "import sys, time\n"
+    "start = time.perf_counter()\n"
+    "{statement}\n"
+    "elapsed = time.perf_counter() - start\n"
+    "print(elapsed, len(sys.modules))"
+)
+
+
+def time_statement(statement: str, repeat: int = 5) -> Dict[str, float]:
+    """Times a statement in fresh interpreters.
+
+    Args:
+        statement (str): Python source to run.
+        repeat (int, optional): Number of interpreters to start. Default to 5.
+
+    Returns:
+        Dict[str, float]: Median and best time in milliseconds, and the
+        number of modules loaded afterwards.
+    """
+    env = dict(os.environ, PYTHONPATH=SERVICE_ROOT)
+    timings: List[float] = []
+    modules = 0
+    for _ in range(repeat):
+        output = subprocess.run(
+            [sys.executable, "-c", _TIMER.format(statement=statement)],
+            cwd=SERVICE_ROOT,
+            env=env,
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.split()
+        timings.append(float(output[0]) * 1000)
+        modules = int(output[1])
+    return {
+        "median_ms": round(statistics.median(timings), 2),
+        "best_ms": round(min(timings), 2),
+        "modules": modules,
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """Entrypoint for CLI execution: prints the timings as JSON."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args(argv)
+    report = {
+        name: time_statement(statement, args.repeat)
+        for name, statement in SCENARIOS.items()
+    }
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
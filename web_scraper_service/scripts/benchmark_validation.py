@@ -0,0 +1,121 @@
+"""Validation throughput benchmark for product models.
+
+Compares building products one by one with `LaptopProduct(**record)` (the
+dispatcher's former path) against the compiled `BatchValidator`, with and
+without type checks, on generated records of which a share is invalid.
+Run from the `web_scraper_service` folder:
+
+    python scripts/benchmark_validation.py --records 100000 --invalid 0.05
+
+Belongs to: Infrastructure / DevOps Utilities
+"""
+
+import argparse
+import json
+import os
+import random
+import sys
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from pydantic import ValidationError  # noqa: E402
+
+from app.models.product import LaptopProduct  # noqa: E402
+from app.services.validators import get_validator  # noqa: E402
+
+
+def make_records(count: int, invalid: float, seed: int = 0) -> List[Dict[str, Any]]:
+    """Generates parsed laptop records.
+
+    Args:
+        count (int): Number of records.
+        invalid (float): Share of records with an empty SKU or bad price.
+        seed (int, optional): Random seed. Default to 0.
+
+    Returns:
+        List[Dict[str, Any]]: Records as returned by `parse_html`.
+    """
+    rng = random.Random(seed)
+    records = []
+    for i in range(count):
+        record = {
+            "name": f"Laptop {i}",
+            "sku": f"SKU-{i}",
+            "price": round(rng.uniform(200, 3000), 2),
+            "vendor": "vendor_a",
+            "url": f"https://shop.example/p/{i}",
+            "available": rng.random() > 0.1,
+            "ram": rng.choice(["8GB", "16GB", "32GB", None]),
+            "cpu": "i7",
+        }
+        if rng.random() < invalid:
+            record[rng.choice(["sku", "price"])] = rng.choice(["", " ", -1.0])
+        records.append(record)
+    return records
+
+
+def per_object(records: List[Dict[str, Any]]) -> int:
+    """Validates records one by one, as the dispatcher used to."""
+    valid = 0
+    for record in records:
+        try:
+            LaptopProduct(**record)
+            valid += 1
+        except ValidationError:
+            pass
+    return valid
+
+
+def time_path(
+    path: Callable[[List[Dict[str, Any]]], Any],
+    records: List[Dict[str, Any]],
+    repeat: int,
+) -> Dict[str, float]:
+    """Times a validation path.
+
+    Args:
+        path (Callable): Validates the records.
+        records (List[Dict[str, Any]]): Input records.
+        repeat (int): Number of runs; the best one is reported.
+
+    Returns:
+        Dict[str, float]: Best time in milliseconds and records per second.
+    """
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        path(records)
+        best = min(best, time.perf_counter() - start)
+    return {
+        "best_ms": round(best * 1000, 2),
+        "records_per_s": round(len(records) / best),
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """Entrypoint for CLI execution: prints the timings as JSON."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--records", type=int, default=50000)
+    parser.add_argument("--invalid", type=float, default=0.05)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args(argv)
+    records = make_records(args.records, args.invalid)
+    validator = get_validator(LaptopProduct)
+    paths = {
+        "per object": per_object,
+        "batch": validator.validate,
+        "batch trusted": validator.construct,
+    }
+    report = {
+        name: time_path(path, records, args.repeat) for name, path in paths.items()
+    }
+    baseline = report["per object"]["best_ms"]
+    for timings in report.values():
+        timings["speedup"] = round(baseline / timings["best_ms"], 2)
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
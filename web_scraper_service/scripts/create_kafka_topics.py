@@ -1,45 +1,95 @@
 """Kafka topic creation script for the Web Scraper Service.
 
-Uses aiokafka's AdminClient to create the required Kafka topic
-if it does not already exist. Can be run as a standalone script.
+Uses aiokafka's AdminClient to create the required Kafka topics (the
+product topic and its dead-letter topic) if they do not already exist. Can be run as a standalone script.
+
+Product messages are keyed by vendor and SKU, so the product topic can be
+spread over many partitions while each product's updates stay in order:
+
+    python scripts/create_kafka_topics.py --partitions 24 --replication-factor 3
 
 Belongs to: Infrastructure / DevOps Utilities
 """
 
+import argparse
 import asyncio
+from typing import List, Optional
+
 from aiokafka.admin import AIOKafkaAdminClient, NewTopic
 
 TOPIC_NAME: str = "products"
+DLQ_TOPIC_NAME: str = "products.dlq"
 KAFKA_BOOTSTRAP_SERVERS: str = "localhost:9092"
+NUM_PARTITIONS: int = 12
+DLQ_NUM_PARTITIONS: int = 1
+REPLICATION_FACTOR: int = 1
 
 
-async def create_topic() -> None:
-    """Creates a Kafka topic if it does not already exist.
+async def create_topic(
+    bootstrap_servers: str = KAFKA_BOOTSTRAP_SERVERS,
+    num_partitions: int = NUM_PARTITIONS,
+    dlq_num_partitions: int = DLQ_NUM_PARTITIONS,
+    replication_factor: int = REPLICATION_FACTOR,
+) -> None:
+    """Creates the Kafka topics if they do not already exist.
 
     Uses aiokafka.admin.AIOKafkaAdminClient to list existing topics and
-    creates the topic if missing.
+    creates the missing ones. Existing topics are left unchanged.
+
+    Args:
+        bootstrap_servers (str, optional): Kafka broker addresses.
+            Default to `KAFKA_BOOTSTRAP_SERVERS`.
+        num_partitions (int, optional): Partitions of the product topic.
+            Default to `NUM_PARTITIONS`.
+        dlq_num_partitions (int, optional): Partitions of the dead-letter
+            topic. Default to `DLQ_NUM_PARTITIONS`.
+        replication_factor (int, optional): Replicas of each partition.
+            Default to `REPLICATION_FACTOR`.
 
     Raises:
         Exception: On Kafka connection or admin errors.
     """
-    admin_client = AIOKafkaAdminClient(bootstrap_servers=KAFKA_BOOTSTRAP_SERVERS)
+    admin_client = AIOKafkaAdminClient(bootstrap_servers=bootstrap_servers)
     await admin_client.start()
     try:
         topics = await admin_client.list_topics()
-        if TOPIC_NAME not in topics:
-            await admin_client.create_topics(
-                [NewTopic(name=TOPIC_NAME, num_partitions=1, replication_factor=1)]
-            )
-            print(f"Topic '{TOPIC_NAME}' created.")
-        else:
-            print(f"Topic '{TOPIC_NAME}' already exists.")
+        for name, partitions in (
+            (TOPIC_NAME, num_partitions),
+            (DLQ_TOPIC_NAME, dlq_num_partitions),
+        ):
+            if name not in topics:
+                await admin_client.create_topics(
+                    [
+                        NewTopic(
+                            name=name,
+                            num_partitions=partitions,
+                            replication_factor=replication_factor,
+                        )
+                    ]
+                )
+                print(f"Topic '{name}' created with {partitions} partition(s).")
+            else:
+                print(f"Topic '{name}' already exists.")
     finally:
         await admin_client.close()
 
 
-def main() -> None:
+def main(argv: Optional[List[str]] = None) -> None:
     """Entrypoint for CLI execution."""
-    asyncio.run(create_topic())
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--bootstrap-servers", default=KAFKA_BOOTSTRAP_SERVERS)
+    parser.add_argument("--partitions", type=int, default=NUM_PARTITIONS)
+    parser.add_argument("--dlq-partitions", type=int, default=DLQ_NUM_PARTITIONS)
+    parser.add_argument("--replication-factor", type=int, default=REPLICATION_FACTOR)
+    args = parser.parse_args(argv)
+    asyncio.run(
+        create_topic(
+            args.bootstrap_servers,
+            args.partitions,
+            args.dlq_partitions,
+            args.replication_factor,
+        )
+    )
 
 
 if __name__ == "__main__":
@@ -0,0 +1,100 @@
+"""
+Pytest suite for the async batch API of BaseScraper.
+"""
+
+import asyncio
+import time
+
+import pytest
+
+from scrapers import VendorAScraper
+
+
+class SlowScraper(VendorAScraper):
+    """Vendor A stub whose sync scrape sleeps for a per-URL duration."""
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.active = 0
+        self.peak = 0
+
+    def scrape(self, url, save_html=True, output_folder="./scraped_pages"):
+        self.active += 1
+        self.peak = max(self.peak, self.active)
+        try:
+            time.sleep(float(url.rsplit("/", 1)[1]))
+            if url.startswith("http://broken"):
+                raise RuntimeError("boom")
+            return super().scrape(url, False, output_folder)
+        finally:
+            self.active -= 1
+
+
+@pytest.fixture
+def anyio_backend():
+    # The batch API schedules work with asyncio tasks and threads.
+    return "asyncio"
+
+
+@pytest.mark.anyio
+async def test_ascrape_multiple_yields_in_completion_order():
+    scraper = SlowScraper()
+    urls = ["http://shop/0.2", "http://shop/0.01", "http://shop/0.1"]
+
+    results = [r async for r in scraper.ascrape_multiple(urls, concurrency=3)]
+
+    assert [r["url"] for r in results] == [
+        "http://shop/0.01",
+        "http://shop/0.1",
+        "http://shop/0.2",
+    ]
+    assert all(r["success"] for r in results)
+
+
+@pytest.mark.anyio
+async def test_ascrape_multiple_bounds_concurrency_and_accepts_async_iterables():
+    scraper = SlowScraper()
+
+    async def urls():
+        for _ in range(10):
+            yield "http://shop/0.02"
+
+    results = [r async for r in scraper.ascrape_multiple(urls(), concurrency=2)]
+
+    assert len(results) == 10
+    assert scraper.peak <= 2
+
+
+@pytest.mark.anyio
+async def test_ascrape_multiple_reports_failures_and_url_timeouts():
+    scraper = SlowScraper()
+    urls = ["http://broken/0", "http://shop/0.5", "http://shop/0"]
+
+    results = {
+        r["url"]: r
+        async for r in scraper.ascrape_multiple(urls, concurrency=3, url_timeout=0.1)
+    }
+
+    assert results["http://broken/0"]["error"] == "boom"
+    assert "Timed out" in results["http://shop/0.5"]["error"]
+    assert results["http://shop/0"]["success"]
+
+
+@pytest.mark.anyio
+async def test_ascrape_multiple_batch_timeout_stops_the_batch():
+    scraper = SlowScraper()
+    urls = iter(
+        ["http://shop/0", "http://shop/0.5", "http://shop/0.5", "http://shop/0.6"]
+    )
+
+    started = asyncio.get_running_loop().time()
+    results = [
+        r
+        async for r in scraper.ascrape_multiple(urls, concurrency=2, batch_timeout=0.2)
+    ]
+
+    assert asyncio.get_running_loop().time() - started < 0.45
+    assert results[0]["success"]
+    assert [r["success"] for r in results[1:]] == [False, False]
+    # The URL that was never started is left for the caller.
+    assert list(urls) == ["http://shop/0.6"]
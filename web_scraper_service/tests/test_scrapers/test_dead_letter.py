@@ -0,0 +1,143 @@
+"""
+Pytest suite for the dead-letter format and replay tool.
+"""
+
+from dataclasses import replace
+from unittest.mock import AsyncMock
+
+import pytest
+from aiokafka.structs import ConsumerRecord
+
+from app.services.dead_letter import (
+    DeadLetter,
+    dead_letter_headers,
+    replay_dead_letters,
+    scrape_payload,
+)
+from app.services.retry_queue import PUBLISH, SCRAPE, RetryTask
+
+
+async def noop():
+    return None
+
+
+def letter(offset, task, original_topic=None):
+    return ConsumerRecord(
+        topic="products.dlq",
+        partition=0,
+        offset=offset,
+        timestamp=0,
+        timestamp_type=0,
+        key=task.record_key,
+        value=task.payload,
+        checksum=None,
+        serialized_key_size=0,
+        serialized_value_size=len(task.payload),
+        headers=dead_letter_headers(task, original_topic),
+    )
+
+
+def failed(source, key, payload, error, context=None, record_key=None, headers=()):
+    task = RetryTask(
+        source,
+        key,
+        noop,
+        payload=payload,
+        context=context,
+        record_key=record_key,
+        headers=headers,
+    )
+    task.error = error
+    task.errors.append(f"{type(error).__name__}: {error}")
+    return task
+
+
+class FakeConsumer:
+    def __init__(self, records, batch_size):
+        self.records = list(records)
+        self.batch_size = batch_size
+        self.commits = 0
+
+    async def getmany(self, timeout_ms, max_records):
+        batch = self.records[: min(max_records, self.batch_size)]
+        self.records = self.records[len(batch) :]
+        return {("products.dlq", 0): batch} if batch else {}
+
+    async def commit(self):
+        self.commits += 1
+
+
+def test_dead_letter_round_trip():
+    task = failed(
+        SCRAPE,
+        "http://shop/p/1",
+        scrape_payload("vendor_a", "http://shop/p/1"),
+        TimeoutError("slow"),
+        {"scraper_name": "vendor_a"},
+    )
+
+    parsed = DeadLetter.from_record(letter(7, task))
+
+    assert parsed.source == SCRAPE
+    assert parsed.original_topic is None
+    assert parsed.error_type == "TimeoutError"
+    assert parsed.errors == ["TimeoutError: slow"]
+    assert parsed.attempts == 1
+    assert parsed.context == {"scraper_name": "vendor_a"}
+    assert parsed.failed_at >= parsed.first_failed_at
+
+
+@pytest.mark.anyio
+async def test_replay_dead_letters_in_bulk():
+    records = [
+        letter(
+            0,
+            failed(
+                PUBLISH,
+                "products",
+                b'{"sku": "1"}',
+                OSError(),
+                record_key=b"a:1",
+                headers=[("content-type", b"application/json")],
+            ),
+            "products",
+        ),
+        letter(1, failed(PUBLISH, "products", b'{"sku": "2"}', OSError()), "products"),
+        letter(
+            2,
+            failed(
+                SCRAPE,
+                "http://shop/p/3",
+                scrape_payload("vendor_a", "http://shop/p/3"),
+                OSError(),
+            ),
+        ),
+    ]
+    records.append(replace(records[0], offset=3, headers=[]))
+    consumer = FakeConsumer(records, batch_size=2)
+    producer = AsyncMock()
+    producer.send_message = AsyncMock(side_effect=lambda value, topic, **kw: value)
+    producer.wait_delivered = AsyncMock(
+        side_effect=lambda ds: [None if d != b'{"sku": "2"}' else OSError() for d in ds]
+    )
+    dispatcher = AsyncMock()
+
+    counts = await replay_dead_letters(consumer, producer, dispatcher)
+
+    assert counts == {
+        "read": 4,
+        "republished": 1,
+        "rescraped": 1,
+        "skipped": 1,
+        "failed": 1,
+    }
+    producer.send_message.assert_any_call(
+        b'{"sku": "1"}',
+        "products",
+        key=b"a:1",
+        headers=[("content-type", b"application/json")],
+    )
+    dispatcher.process_product_scraping.assert_called_once_with(
+        "vendor_a", "http://shop/p/3"
+    )
+    assert consumer.commits == 2
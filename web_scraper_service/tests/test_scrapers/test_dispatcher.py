@@ -1,35 +1,76 @@
 # web_scraper_service/tests/test_scrapers/test_dispatcher.py
 
+import itertools
+from concurrent.futures import ThreadPoolExecutor
+
+import anyio
 import pytest
-from unittest.mock import AsyncMock, patch
+from unittest.mock import AsyncMock, MagicMock, patch
 
 from app.services.dispatcher import ScraperDispatcher
+from app.services.parse_pool import ParserPool
+from app.services.pipeline import drain_pipelines
+from scrapers import BaseScraper
+from scrapers.fingerprint import FingerprintIndex
+from scrapers.registry import ScraperRegistry
+
+
+class EchoScraper(BaseScraper):
+    """Scraper whose parser only understands its own fetcher's pages."""
+
+    def __init__(self, name="echo", **kwargs):
+        super().__init__(name, **kwargs)
+
+    def fetch_html(self, url):
+        return f"<p data-sku='{url.rsplit('/', 1)[1]}'>{url}</p>"
+
+    async def fetch_html_async(self, url):
+        return self.fetch_html(url)
+
+    def parse_html(self, html, url):
+        if not html.startswith("<p data-sku="):
+            raise ValueError(f"Not an echo page: {html[:30]}")
+        return {
+            "name": "Echo Product",
+            "sku": html.split("'")[1],
+            "price": 10.0,
+            "vendor": "echo",
+            "url": url,
+        }
+
+
+async def all_delivered(deliveries):
+    return [None] * len(deliveries)
 
 
 @pytest.mark.anyio
 @patch("app.services.dispatcher.create_scraper")
-@patch("app.services.dispatcher.KafkaProducerService")
+@patch("app.services.dispatcher.get_kafka_producer")
 async def test_dispatcher_pipeline_success(mock_kafka_producer, mock_create_scraper):
     """Test the full dispatcher pipeline on a successful run."""
     # Arrange
     producer_instance = mock_kafka_producer.return_value
     producer_instance.start = AsyncMock()
     producer_instance.send_product = AsyncMock()
+    producer_instance.wait_delivered = AsyncMock(side_effect=all_delivered)
     producer_instance.stop = AsyncMock()
 
     mock_scraper = mock_create_scraper.return_value
     mock_scraper.fetch_html.return_value = "<html>Success</html>"
 
-    mock_scraper.parse_html.return_value = {
-        "name": "Mock Product",
-        "sku": "MOCK123",
-        "price": 999.0,
-        "vendor": "MockVendor",
-        "url": "http://example.com/success",
-        "available": True,
-    }
+    parser_pool = MagicMock(max_workers=1)
+    parser_pool.parse = AsyncMock(
+        return_value={
+            "name": "Mock Product",
+            "sku": "MOCK123",
+            "price": 999.0,
+            "vendor": "MockVendor",
+            "url": "http://example.com/success",
+            "available": True,
+        }
+    )
 
-    dispatcher = ScraperDispatcher()
+    dispatcher = ScraperDispatcher(parser_pool=parser_pool)
 
     # Act
     await dispatcher.process_product_scraping("vendor_a", "http://example.com/success")
@@ -37,4 +78,280 @@ async def test_dispatcher_pipeline_success(mock_kafka_producer, mock_create_scra
     # Assert: Now this will pass because validation succeeds
     producer_instance.start.assert_called_once()
     producer_instance.send_product.assert_called_once()
-    producer_instance.stop.assert_called_once()
+    parser_pool.parse.assert_awaited_once_with(
+        "vendor_a", "<html>Success</html>", "http://example.com/success"
+    )
+    # The producer is owned by the service, not stopped after each URL.
+    producer_instance.stop.assert_not_called()
+
+
+@pytest.mark.anyio
+@patch("app.services.dispatcher.create_scraper")
+@patch("app.services.dispatcher.get_kafka_producer")
+async def test_dispatcher_batch_pipeline(mock_kafka_producer, mock_create_scraper):
+    """Test that a batch fetches, parses in the pool and publishes every URL."""
+    producer_instance = mock_kafka_producer.return_value
+    producer_instance.start = AsyncMock()
+    producer_instance.send_product = AsyncMock()
+    producer_instance.wait_delivered = AsyncMock(side_effect=all_delivered)
+    producer_instance.stop = AsyncMock()
+
+    mock_scraper = mock_create_scraper.return_value
+    mock_scraper.fetch_html.side_effect = lambda url: f"<html>{url}</html>"
+
+    async def parse(scraper_name, html, url):
+        if url.endswith("/bad"):
+            return {"name": "Broken"}
+        return {
+            "name": "Mock Product",
+            "sku": url.rsplit("/", 1)[1],
+            "price": 10.0,
+            "vendor": "MockVendor",
+            "url": url,
+        }
+
+    parser_pool = MagicMock(max_workers=2)
+    parser_pool.parse = AsyncMock(side_effect=parse)
+    urls = [f"http://example.com/{i}" for i in range(10)] + ["http://example.com/bad"]
+
+    dispatcher = ScraperDispatcher()
+    stats = await dispatcher.process_batch(
+        "vendor_a", urls, fetch_concurrency=3, queue_size=2, parser_pool=parser_pool
+    )
+
+    assert stats == {
+        "fetched": 11,
+        "unchanged": 0,
+        "parsed": 11,
+        "published": 10,
+        "failed": 1,
+    }
+    producer_instance.start.assert_called_once()
+    producer_instance.stop.assert_not_called()
+    assert producer_instance.send_product.call_count == 10
+
+
+@pytest.mark.anyio
+@patch("app.services.dispatcher.create_scraper")
+@patch("app.services.dispatcher.get_kafka_producer")
+async def test_dispatcher_batch_skips_unchanged_pages(
+    mock_kafka_producer, mock_create_scraper, tmp_path
+):
+    """Test that a second incremental batch publishes only changed pages."""
+    producer_instance = mock_kafka_producer.return_value
+    producer_instance.start = AsyncMock()
+    producer_instance.send_product = AsyncMock()
+    producer_instance.wait_delivered = AsyncMock(side_effect=all_delivered)
+    producer_instance.stop = AsyncMock()
+
+    version = {"http://example.com/1": "v1"}
+    mock_scraper = mock_create_scraper.return_value
+    mock_scraper.fetch_html.side_effect = lambda url: (
+        f"<html>{url} {version.get(url, 'v0')}</html>"
+    )
+
+    async def parse(scraper_name, html, url):
+        return {
+            "name": "Mock Product",
+            "sku": url.rsplit("/", 1)[1],
+            "price": 10.0,
+            "vendor": "MockVendor",
+            "url": url,
+        }
+
+    parser_pool = MagicMock(max_workers=2)
+    parser_pool.parse = AsyncMock(side_effect=parse)
+    urls = [f"http://example.com/{i}" for i in range(3)]
+
+    with FingerprintIndex(str(tmp_path / "fingerprints.sqlite3")) as fingerprints:
+        dispatcher = ScraperDispatcher(fingerprints=fingerprints)
+        first = await dispatcher.process_batch(
+            "vendor_a", urls, parser_pool=parser_pool
+        )
+        version["http://example.com/1"] = "v2"
+        second = await dispatcher.process_batch(
+            "vendor_a", urls, parser_pool=parser_pool
+        )
+
+    assert first["published"] == 3
+    assert second["unchanged"] == 2
+    assert second["published"] == 1
+    assert producer_instance.send_product.call_count == 4
+
+
+@pytest.mark.anyio
+@patch("app.services.dispatcher.create_scraper")
+@patch("app.services.dispatcher.get_kafka_producer")
+async def test_dispatcher_batch_counts_failed_deliveries(
+    mock_kafka_producer, mock_create_scraper
+):
+    """Test that deliveries are awaited in windows and failures are counted."""
+    producer_instance = mock_kafka_producer.return_value
+    producer_instance.start = AsyncMock()
+    producer_instance.send_product = AsyncMock(side_effect=lambda product: product.sku)
+
+    async def wait_delivered(deliveries):
+        return [RuntimeError("nack") if d == "3" else None for d in deliveries]
+
+    producer_instance.wait_delivered = AsyncMock(side_effect=wait_delivered)
+    mock_create_scraper.return_value.fetch_html.side_effect = lambda url: url
+
+    async def parse(scraper_name, html, url):
+        return {
+            "name": "Mock Product",
+            "sku": url.rsplit("/", 1)[1],
+            "price": 10.0,
+            "vendor": "MockVendor",
+            "url": url,
+        }
+
+    parser_pool = MagicMock(max_workers=1)
+    parser_pool.parse = AsyncMock(side_effect=parse)
+    urls = [f"http://example.com/{i}" for i in range(5)]
+
+    stats = await ScraperDispatcher().process_batch(
+        "vendor_a", urls, parser_pool=parser_pool, delivery_window=2
+    )
+
+    assert stats["published"] == 4
+    assert stats["failed"] == 1
+    assert producer_instance.wait_delivered.call_count == 3
+
+
+@pytest.mark.anyio
+@patch("app.services.dispatcher.create_scraper")
+@patch("app.services.dispatcher.get_kafka_producer")
+async def test_dispatcher_hands_failed_scrapes_to_the_retry_queue(
+    mock_kafka_producer, mock_create_scraper
+):
+    """Test that fetch errors are retried and invalid data is dead-lettered."""
+    producer_instance = mock_kafka_producer.return_value
+    producer_instance.start = AsyncMock()
+    producer_instance.send_product = AsyncMock()
+    producer_instance.wait_delivered = AsyncMock(side_effect=all_delivered)
+    mock_scraper = mock_create_scraper.return_value
+    mock_scraper.fetch_html.side_effect = [
+        ConnectionError("reset"),
+        "<html></html>",
+        "<html>retried</html>",
+    ]
+    parser_pool = MagicMock(max_workers=1)
+    parser_pool.parse = AsyncMock(
+        side_effect=[
+            {"name": "No SKU"},
+            {
+                "name": "Mock Product",
+                "sku": "1",
+                "price": 10.0,
+                "vendor": "MockVendor",
+                "url": "http://example.com/1",
+            },
+        ]
+    )
+
+    dispatcher = ScraperDispatcher(parser_pool=parser_pool)
+    await dispatcher.process_product_scraping("vendor_a", "http://example.com/1")
+    await dispatcher.process_product_scraping("vendor_a", "http://example.com/2")
+
+    submit = producer_instance.retries.submit
+    assert submit.call_count == 2
+    (fetch_task, fetch_error), fetch_kwargs = submit.call_args_list[0]
+    assert fetch_task.key == "http://example.com/1"
+    assert isinstance(fetch_error, ConnectionError)
+    assert fetch_kwargs == {"retry": True}
+    (invalid_task, _), invalid_kwargs = submit.call_args_list[1]
+    assert invalid_task.context == {
+        "scraper_name": "vendor_a",
+        "url": "http://example.com/2",
+    }
+    assert invalid_kwargs == {"retry": False}
+
+    # The retry fetches off the event loop and parses on the parser pool.
+    assert await fetch_task.action() is True
+    parser_pool.parse.assert_awaited_with(
+        "vendor_a", "<html>retried</html>", "http://example.com/1"
+    )
+    mock_scraper.parse_html.assert_not_called()
+
+
+@pytest.mark.anyio
+@patch("app.services.dispatcher.create_scraper")
+@patch("app.services.dispatcher.get_kafka_producer")
+async def test_dispatcher_batch_drains_on_shutdown(
+    mock_kafka_producer, mock_create_scraper
+):
+    """Test that a slow broker throttles fetching and drain publishes the rest."""
+    producer_instance = mock_kafka_producer.return_value
+    producer_instance.start = AsyncMock()
+    producer_instance.send_product = AsyncMock()
+
+    async def slow_broker(deliveries):
+        await anyio.sleep(0.01)
+        return [None] * len(deliveries)
+
+    producer_instance.wait_delivered = AsyncMock(side_effect=slow_broker)
+    mock_create_scraper.return_value.fetch_html.side_effect = lambda url: url
+
+    async def parse(scraper_name, html, url):
+        return {
+            "name": "Mock Product",
+            "sku": url.rsplit("/", 1)[1],
+            "price": 10.0,
+            "vendor": "MockVendor",
+            "url": url,
+        }
+
+    parser_pool = MagicMock(max_workers=2)
+    parser_pool.parse = AsyncMock(side_effect=parse)
+    urls = (f"http://example.com/{i}" for i in itertools.count())
+    results = {}
+
+    async def run_batch():
+        results["stats"] = await ScraperDispatcher().process_batch(
+            "vendor_a",
+            urls,
+            fetch_concurrency=2,
+            queue_size=4,
+            parser_pool=parser_pool,
+            delivery_window=2,
+            publish_workers=1,
+        )
+
+    async with anyio.create_task_group() as tg:
+        tg.start_soon(run_batch)
+        await anyio.sleep(0.1)
+        with anyio.fail_after(5):
+            await drain_pipelines()
+
+    stats = results["stats"]
+    # The endless source was only read as fast as the broker acknowledged.
+    assert stats["fetched"] < 100
+    assert stats["published"] == stats["fetched"]
+    assert stats["failed"] == 0
+
+
+@pytest.mark.anyio
+# The parser pool hands work to the asyncio loop's executor machinery.
+@pytest.mark.parametrize("anyio_backend", ["asyncio"])
+@patch(
+    "scrapers.SCRAPER_REGISTRY",
+    ScraperRegistry({"echo": EchoScraper}, entry_point_group=None),
+)
+@patch("app.services.dispatcher.get_kafka_producer")
+async def test_dispatcher_batch_fetches_and_parses_with_the_same_scraper(
+    mock_kafka_producer,
+):
+    """Test that pages are fetched and parsed by the registered scraper."""
+    producer_instance = mock_kafka_producer.return_value
+    producer_instance.start = AsyncMock()
+    producer_instance.send_product = AsyncMock()
+    producer_instance.wait_delivered = AsyncMock(side_effect=all_delivered)
+    urls = [f"http://example.com/{i}" for i in range(3)]
+
+    with ThreadPoolExecutor(2) as executor:
+        stats = await ScraperDispatcher().process_batch(
+            "echo", urls, parser_pool=ParserPool(2, executor=executor)
+        )
+
+    assert stats["published"] == 3
+    assert stats["failed"] == 0
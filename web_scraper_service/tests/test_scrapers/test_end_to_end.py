@@ -1,10 +1,11 @@
 import json
 import anyio
 import pytest
-from unittest.mock import patch
+from unittest.mock import AsyncMock, MagicMock, patch
 from aiokafka import AIOKafkaConsumer
 from app.services.dispatcher import ScraperDispatcher
 from app.core.config import settings
+from app.services.kafka_producer import close_kafka_producer
 
 
 @pytest.mark.integration
@@ -40,11 +41,13 @@ async def test_end_to_end_dispatcher_pipeline(
         with patch("app.services.dispatcher.create_scraper") as mock_create_scraper:
             mock_scraper = mock_create_scraper.return_value
             mock_scraper.fetch_html.return_value = "<html></html>"
-            mock_scraper.parse_html.return_value = mock_product_data
-            dispatcher = ScraperDispatcher()
+            parser_pool = MagicMock(max_workers=1)
+            parser_pool.parse = AsyncMock(return_value=mock_product_data)
+            dispatcher = ScraperDispatcher(parser_pool=parser_pool)
             await dispatcher.process_product_scraping(
                 "mock_vendor", "http://integration.test/laptop"
             )
+            await close_kafka_producer()
         try:
             with anyio.fail_after(5):
                 message = await consumer.getone()
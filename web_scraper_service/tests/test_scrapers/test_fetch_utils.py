@@ -2,32 +2,113 @@
 Pytest suite for the fetch_utils module.
 """
 
+import threading
+import time
+
 import pytest
 from unittest.mock import patch, MagicMock, AsyncMock
-from scrapers.fetch_utils import fetch_html_sync, fetch_html_async, TimeoutException
+from scrapers.fetch_utils import (
+    AsyncFetcher,
+    SyncFetcher,
+    fetch_html_sync,
+    fetch_html_async,
+    fetch_many_sync,
+    stream_html_sync,
+    TimeoutException,
+)
 
 DUMMY_HTML = "<html><body>OK</body></html>"
 
 
-@patch("scrapers.fetch_utils.requests.get")
-@patch("scrapers.fetch_utils.time_limit", MagicMock())
-def test_fetch_html_sync_success(mock_get):
+@pytest.fixture
+def anyio_backend():
+    # The pooled aiohttp connector is bound to an asyncio event loop.
+    return "asyncio"
+
+
+def _sync_response(body: str = DUMMY_HTML) -> MagicMock:
     mock_resp = MagicMock()
     mock_resp.status_code = 200
-    mock_resp.text = DUMMY_HTML
+    mock_resp.encoding = "utf-8"
+    mock_resp.iter_content.return_value = [body.encode("utf-8")]
     mock_resp.raise_for_status = MagicMock()
-    mock_get.return_value = mock_resp
+    return mock_resp
+
+
+@patch("scrapers.fetch_utils.requests.Session")
+def test_fetch_html_sync_success(mock_session_cls):
+    mock_session_cls.return_value.get.return_value = _sync_response()
 
     html = fetch_html_sync("http://fake", timeout=1, max_retries=1)
     assert html == DUMMY_HTML
 
 
-@patch("scrapers.fetch_utils.requests.get")
-@patch("scrapers.fetch_utils.time_limit", side_effect=TimeoutException("Timed out"))
-def test_fetch_html_sync_retries_and_fails(mock_get, mock_time_limit):
-    mock_get.side_effect = Exception("fail")
+@patch("scrapers.fetch_utils.time.sleep", MagicMock())
+@patch("scrapers.fetch_utils.requests.Session")
+def test_fetch_html_sync_retries_and_fails(mock_session_cls):
+    mock_session_cls.return_value.get.side_effect = Exception("fail")
     with pytest.raises(Exception):
-        fetch_html_sync("http://fail", timeout=1, max_retries=2)
+        fetch_html_sync("http://fail", timeout=1, max_retries=2, fetcher=SyncFetcher())
+    assert mock_session_cls.return_value.get.call_count == 2
+
+
+@patch("scrapers.fetch_utils.requests.Session")
+def test_fetch_html_sync_deadline_without_signals(mock_session_cls):
+    def slow_body(chunk_size):
+        for _ in range(5):
+            time.sleep(0.05)
+            yield b"<p>chunk</p>"
+
+    mock_resp = _sync_response()
+    mock_resp.iter_content.side_effect = slow_body
+    mock_session_cls.return_value.get.return_value = mock_resp
+    errors = []
+
+    def worker():
+        try:
+            fetch_html_sync(
+                "http://slow", timeout=0.1, max_retries=1, fetcher=SyncFetcher()
+            )
+        except Exception as e:
+            errors.append(e)
+
+    thread = threading.Thread(target=worker)
+    thread.start()
+    thread.join()
+    assert len(errors) == 1
+    assert isinstance(errors[0], TimeoutException)
+
+
+@patch("scrapers.fetch_utils.requests.Session")
+def test_stream_html_sync_idle_timeout_allows_slow_consumers(mock_session_cls):
+    mock_resp = _sync_response()
+    mock_resp.iter_content.return_value = [b"<a/>", b"<b/>", b"<c/>"]
+    mock_session_cls.return_value.get.return_value = mock_resp
+
+    chunks = []
+    for chunk in stream_html_sync(
+        "http://big", timeout=None, idle_timeout=0.05, fetcher=SyncFetcher()
+    ):
+        time.sleep(0.05)
+        chunks.append(chunk)
+
+    assert chunks == [b"<a/>", b"<b/>", b"<c/>"]
+    assert mock_session_cls.return_value.get.call_args.kwargs["timeout"] == 0.05
+
+
+@patch("scrapers.fetch_utils.requests.Session")
+def test_fetch_many_sync_uses_one_session_per_thread(mock_session_cls):
+    mock_session_cls.side_effect = lambda: MagicMock(
+        get=MagicMock(side_effect=lambda url, **kw: _sync_response(url))
+    )
+    fetcher = SyncFetcher()
+    urls = [f"http://fake/{i}" for i in range(20)]
+
+    results = fetch_many_sync(urls, max_workers=4, max_retries=1, fetcher=fetcher)
+
+    assert results == urls
+    assert 1 <= mock_session_cls.call_count <= 4
+    fetcher.close()
 
 
 @pytest.mark.anyio
@@ -41,11 +122,14 @@ async def test_fetch_html_async_success(mock_session_cls):
     response_ctx_manager.__aenter__.return_value = mock_resp
 
     mock_session = AsyncMock()
+    mock_session.closed = False
     mock_session.get = MagicMock(return_value=response_ctx_manager)
 
-    mock_session_cls.return_value.__aenter__.return_value = mock_session
+    mock_session_cls.return_value = mock_session
 
-    result = await fetch_html_async("http://fake", max_retries=1)
+    result = await fetch_html_async(
+        "http://fake", max_retries=1, fetcher=AsyncFetcher()
+    )
     assert result == DUMMY_HTML
 
 
@@ -53,9 +137,34 @@ async def test_fetch_html_async_success(mock_session_cls):
 @patch("scrapers.fetch_utils.aiohttp.ClientSession")
 async def test_fetch_html_async_retries_and_fails(mock_session_cls):
     mock_session = AsyncMock()
+    mock_session.closed = False
     mock_session.get = MagicMock(side_effect=Exception("fail"))
 
-    mock_session_cls.return_value.__aenter__.return_value = mock_session
+    mock_session_cls.return_value = mock_session
 
     with pytest.raises(Exception):
-        await fetch_html_async("http://fail", max_retries=2)
+        await fetch_html_async("http://fail", max_retries=2, fetcher=AsyncFetcher())
+
+
+@pytest.mark.anyio
+@patch("scrapers.fetch_utils.aiohttp.ClientSession")
+async def test_async_fetcher_reuses_one_session(mock_session_cls):
+    mock_resp = AsyncMock()
+    mock_resp.text = AsyncMock(return_value=DUMMY_HTML)
+    mock_resp.raise_for_status = MagicMock()
+
+    response_ctx_manager = AsyncMock()
+    response_ctx_manager.__aenter__.return_value = mock_resp
+
+    mock_session = AsyncMock()
+    mock_session.closed = False
+    mock_session.get = MagicMock(return_value=response_ctx_manager)
+    mock_session_cls.return_value = mock_session
+
+    async with AsyncFetcher(limit=10, limit_per_host=2) as fetcher:
+        for url in ("http://fake/1", "http://fake/2", "http://fake/3"):
+            await fetch_html_async(url, max_retries=1, fetcher=fetcher)
+
+    assert mock_session_cls.call_count == 1
+    assert mock_session.get.call_count == 3
+    mock_session.close.assert_awaited_once()
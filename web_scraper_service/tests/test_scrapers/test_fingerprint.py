@@ -0,0 +1,63 @@
+"""
+Pytest suite for the fingerprint module.
+"""
+
+from scrapers import VendorAScraper
+from scrapers.fingerprint import FingerprintIndex
+
+PAGE = (
+    "<html><head><meta name='csrf-token' content='{token}'></head>"
+    "<body><!-- rendered {ts} --><p>Price: {price}</p>"
+    "<span>Updated 2024-05-0{day}T10:1{day}:00Z</span></body></html>"
+)
+
+
+def _page(token="a", ts="1", price="10", day="1"):
+    return PAGE.format(token=token, ts=ts, price=price, day=day)
+
+
+def test_volatile_regions_do_not_change_fingerprint(tmp_path):
+    with FingerprintIndex(str(tmp_path / "fp.sqlite3")) as index:
+        assert index.fingerprint(_page()) == index.fingerprint(
+            _page(token="b", ts="2", day="2")
+        )
+        assert index.fingerprint(_page()) != index.fingerprint(_page(price="12"))
+
+
+def test_check_only_matches_recorded_digest(tmp_path):
+    with FingerprintIndex(str(tmp_path / "fp.sqlite3")) as index:
+        unchanged, digest = index.check("http://shop/a", _page())
+        assert unchanged is False
+        assert index.lookup("http://shop/a") is None
+
+        index.record("http://shop/a", digest)
+        first = index.lookup("http://shop/a")
+        unchanged, _ = index.check("http://shop/a", _page(token="z"))
+        second = index.lookup("http://shop/a")
+
+    assert unchanged is True
+    assert second.last_seen >= first.last_seen
+    assert second.last_changed == first.last_changed
+
+
+def test_custom_patterns_replace_defaults(tmp_path):
+    with FingerprintIndex(str(tmp_path / "fp.sqlite3"), [r"<p>.*?</p>"]) as index:
+        assert index.fingerprint(_page(price="1")) == index.fingerprint(
+            _page(price="2")
+        )
+        assert index.fingerprint(_page(token="a")) != index.fingerprint(
+            _page(token="b")
+        )
+
+
+def test_scrape_skips_parse_for_unchanged_page(tmp_path):
+    with FingerprintIndex(str(tmp_path / "fp.sqlite3")) as index:
+        scraper = VendorAScraper(fingerprints=index)
+        first = scraper.scrape("http://shop/a", save_html=False)
+        second = scraper.scrape("http://shop/a", save_html=False)
+
+    assert first["unchanged"] is False
+    assert first["data"]
+    assert second["success"] is True
+    assert second["unchanged"] is True
+    assert second["data"] == {}
@@ -0,0 +1,159 @@
+"""
+Pytest suite for the frontier module.
+"""
+
+import pytest
+
+from scrapers import VendorAScraper
+from scrapers.frontier import (
+    BloomFilter,
+    Frontier,
+    UrlDeduplicator,
+    crawl,
+    find_next_page,
+    normalize_url,
+    pattern_link_extractor,
+)
+
+
+@pytest.fixture
+def anyio_backend():
+    # ascrape_multiple schedules its scrapes as asyncio tasks.
+    return "asyncio"
+
+
+def test_normalize_url_collapses_variants():
+    canonical = "https://shop.com/laptops?brand=dell&page=2"
+    variants = [
+        "HTTPS://Shop.com:443/laptops/?page=2&brand=dell",
+        "https://shop.com/laptops?brand=dell&page=2&utm_source=mail&gclid=x",
+        "https://shop.com/laptops?sort=price_asc&brand=dell&page=2#reviews",
+        "https://shop.com//laptops?page=2&brand=dell&order=desc",
+    ]
+
+    assert {normalize_url(v) for v in variants} == {canonical}
+    assert normalize_url("http://shop.com:8080/") == "http://shop.com:8080/"
+
+
+def test_bloom_filter_and_exact_dedup():
+    bloom = BloomFilter(1000, 0.01)
+    for i in range(1000):
+        bloom.add(f"u{i}")
+    assert all(f"u{i}" in bloom for i in range(1000))
+    false_positives = sum(f"v{i}" in bloom for i in range(10000))
+    assert false_positives < 500
+
+    dedup = UrlDeduplicator(capacity=1000, flush_every=50)
+    added = [dedup.add(f"https://shop.com/{i}") for i in range(200)]
+    assert all(added)
+    assert not dedup.add("https://shop.com/199")  # Still buffered.
+    assert not dedup.add("https://shop.com/7")  # Written to SQLite.
+    assert dedup.bloom_hits == 2
+    assert len(dedup) == 200
+    dedup.close()
+
+
+def test_dedup_never_skips_bloom_false_positives(tmp_path):
+    # A filter sized for 10 URLs saturates and reports most new URLs present.
+    dedup = UrlDeduplicator(
+        capacity=10, error_rate=0.1, path=str(tmp_path / "seen.db"), flush_every=7
+    )
+    urls = [f"https://shop.com/{i}" for i in range(500)]
+
+    assert all(dedup.add(url) for url in urls)
+    assert not any(dedup.add(url) for url in urls)
+    assert dedup.false_positives > 100
+    assert len(dedup) == 500
+    dedup.close()
+
+
+def test_frontier_round_robins_hosts_by_priority():
+    frontier = Frontier()
+    frontier.add("https://a.com/1", priority=5)
+    frontier.add("https://a.com/2", priority=1)
+    frontier.add("https://b.com/1")
+    assert not frontier.add("https://a.com/2?utm_medium=x")
+
+    order = [frontier.pop().url for _ in range(3)]
+
+    assert order == ["https://a.com/2", "https://b.com/1", "https://a.com/1"]
+    assert frontier.pop() is None
+
+
+def test_frontier_limits():
+    frontier = Frontier(max_depth=1, max_pages=2)
+    assert not frontier.add("https://a.com/deep", depth=2)
+    for i in range(5):
+        frontier.add(f"https://a.com/{i}")
+
+    assert [frontier.pop() is not None for _ in range(3)] == [True, True, False]
+
+
+def test_find_next_page():
+    assert find_next_page(
+        '<link rel="next" href="?page=3">', "https://s.com/c?page=2"
+    ) == ("https://s.com/c?page=3")
+    assert (
+        find_next_page(
+            '<a class="btn pagination-next" href="/c/p2">More</a>', "https://s.com/c"
+        )
+        == "https://s.com/c/p2"
+    )
+    assert find_next_page('<a href="/c/p2">2</a>', "https://s.com/c") is None
+
+
+LISTINGS = {
+    "https://shop.com/laptops": (
+        '<a href="/p/1?utm_source=x">A</a><a href="/p/2">B</a>'
+        '<a href="/laptops/gaming">Gaming</a><a rel="next" href="/laptops?page=2">Next</a>'
+    ),
+    "https://shop.com/laptops?page=2": '<a href="/p/2?sort=asc">B</a><a href="/p/3">C</a>',
+    "https://shop.com/laptops/gaming": '<a href="/p/4">D</a><a href="/laptops/gaming/rgb">RGB</a>',
+    "https://shop.com/laptops/gaming/rgb": '<a href="/p/5">E</a>',
+}
+
+
+async def fake_fetch(url):
+    return LISTINGS[url]
+
+
+@pytest.mark.anyio
+async def test_crawl_yields_each_product_once_within_depth():
+    frontier = Frontier(max_depth=1)
+    extractor = pattern_link_extractor(r"/p/\d+", r"/laptops/")
+
+    urls = [
+        url
+        async for url in crawl(
+            frontier, ["https://shop.com/laptops"], extractor, fetch=fake_fetch
+        )
+    ]
+
+    assert urls == [
+        "https://shop.com/p/1",
+        "https://shop.com/p/2",
+        "https://shop.com/p/3",
+        "https://shop.com/p/4",
+    ]
+
+
+@pytest.mark.anyio
+async def test_crawl_feeds_ascrape_multiple():
+    frontier = Frontier(max_depth=0)
+    extractor = pattern_link_extractor(r"/p/\d+")
+    product_urls = crawl(
+        frontier, ["https://shop.com/laptops"], extractor, fetch=fake_fetch
+    )
+
+    results = [
+        r
+        async for r in VendorAScraper().ascrape_multiple(
+            product_urls, concurrency=2, save_html=False
+        )
+    ]
+
+    assert sorted(r["url"] for r in results) == [
+        "https://shop.com/p/1",
+        "https://shop.com/p/2",
+        "https://shop.com/p/3",
+    ]
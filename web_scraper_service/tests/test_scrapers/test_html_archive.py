@@ -0,0 +1,107 @@
+"""
+Pytest suite for the html_archive module.
+"""
+
+import multiprocessing
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+from scrapers import VendorAScraper
+from scrapers.html_archive import HtmlArchive
+
+PAGE = "<html><body>" + "<div class='item'>Laptop</div>" * 200 + "</body></html>"
+
+
+def test_identical_bodies_are_stored_once(tmp_path):
+    with HtmlArchive(str(tmp_path)) as archive:
+        first = archive.put("http://shop/a", PAGE, fetched_at=1.0)
+        second = archive.put("http://shop/a", PAGE, fetched_at=2.0)
+        archive.put("http://shop/b", PAGE, fetched_at=2.0)
+        stats = archive.stats()
+
+    assert first == second
+    assert stats["pages"] == 3
+    assert stats["blobs"] == 1
+    assert stats["stored_bytes"] < stats["raw_bytes"]
+
+
+def test_get_returns_latest_or_exact_capture(tmp_path):
+    with HtmlArchive(str(tmp_path)) as archive:
+        archive.put("http://shop/a", "<p>old</p>", fetched_at=1.0)
+        archive.put("http://shop/a", "<p>new</p>", fetched_at=2.0)
+
+        assert archive.get("http://shop/a") == "<p>new</p>"
+        assert archive.get("http://shop/a", fetched_at=1.0) == "<p>old</p>"
+        assert archive.get("http://shop/missing") is None
+
+
+def test_segments_roll_over_and_survive_reopen(tmp_path):
+    with HtmlArchive(str(tmp_path), segment_size=64) as archive:
+        for i in range(5):
+            archive.put(f"http://shop/{i}", f"<p>{i}</p>" * 50, fetched_at=float(i))
+
+    assert len(os.listdir(tmp_path / "segments")) > 1
+    with HtmlArchive(str(tmp_path), segment_size=64) as archive:
+        archive.put("http://shop/5", "<p>5</p>", fetched_at=5.0)
+        pages = list(archive.iter_pages())
+
+    assert [url for url, _, _ in pages] == [f"http://shop/{i}" for i in range(6)]
+    assert pages[3][2] == "<p>3</p>" * 50
+
+
+def test_iter_pages_latest_only(tmp_path):
+    with HtmlArchive(str(tmp_path)) as archive:
+        archive.put("http://shop/a", "<p>old</p>", fetched_at=1.0)
+        archive.put("http://shop/a", "<p>new</p>", fetched_at=2.0)
+        latest = list(archive.iter_pages(latest_only=True))
+
+    assert latest == [("http://shop/a", 2.0, "<p>new</p>")]
+
+
+def test_scrape_saves_html_into_archive(tmp_path):
+    with VendorAScraper() as scraper:
+        result = scraper.scrape("http://fake-url.com", output_folder=str(tmp_path))
+        stored = scraper.archive(str(tmp_path)).get_blob(result["html_hash"])
+
+    assert result["success"]
+    assert result["data"]["metadata"]["vendor"] == "vendor_a"
+    assert "Stub content" in stored
+
+
+def write_pages(directory, writer, count=20):
+    with HtmlArchive(directory, segment_size=512) as archive:
+        for i in range(count):
+            archive.put(f"http://shop/{writer}/{i}", f"<p>{writer}-{i}</p>" * 40)
+
+
+def test_concurrent_writers_never_share_an_offset(tmp_path):
+    directory = str(tmp_path)
+    processes = [
+        multiprocessing.get_context("fork").Process(
+            target=write_pages, args=(directory, f"p{n}")
+        )
+        for n in range(3)
+    ]
+    for process in processes:
+        process.start()
+    with ThreadPoolExecutor(3) as pool:
+        list(pool.map(lambda n: write_pages(directory, f"t{n}"), range(3)))
+    for process in processes:
+        process.join(30)
+        assert process.exitcode == 0
+
+    with HtmlArchive(directory) as archive:
+        for writer in ["p0", "p1", "p2", "t0", "t1", "t2"]:
+            for i in range(20):
+                expected = f"<p>{writer}-{i}</p>" * 40
+                assert archive.get(f"http://shop/{writer}/{i}") == expected
+        assert archive.stats()["blobs"] == 120
+    assert len(os.listdir(tmp_path / "segments")) > 2
+
+
+def test_scraper_opens_one_archive_per_folder_across_threads(tmp_path):
+    with VendorAScraper() as scraper:
+        with ThreadPoolExecutor(8) as pool:
+            archives = set(pool.map(lambda _: scraper.archive(str(tmp_path)), range(8)))
+
+    assert len(archives) == 1
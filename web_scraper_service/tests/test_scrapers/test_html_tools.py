@@ -0,0 +1,220 @@
+"""
+Pytest suite for the html_tools extraction engine.
+"""
+
+import pytest
+
+from app.models.product import LaptopProduct, PeripheralProduct
+from app.services.html_tools import (
+    ExtractionSpec,
+    FieldRule,
+    extract_json_ld,
+    extract_structured_product,
+    get_spec,
+    in_stock,
+    parse_price,
+    register_spec,
+)
+
+PRODUCT_PAGE = """
+<html><body>
+  <h1 class="title">  Dell   XPS 13 </h1>
+  <span class="sku" data-sku="XPS-13-9340"></span>
+  <div class="price">$1,299.99</div>
+  <div class="stock">In stock</div>
+  <table class="specs">
+    <tr><th>RAM</th><td>16GB</td></tr>
+    <tr><th>CPU</th><td>Intel Core Ultra 7</td></tr>
+  </table>
+  <img class="gallery" src="/img/1.jpg"><img class="gallery" src="/img/2.jpg">
+</body></html>
+"""
+
+LISTING_PAGE = """
+<html><body><ul>
+  <li class="card"><a href="/p/mouse-1">MX Master</a><b>99,00 EUR</b><i>mouse</i></li>
+  <li class="card"><a href="/p/kbd-2">K380</a><b>39,50 EUR</b><i>keyboard</i></li>
+  <li class="card"><a href="/p/hub-3">USB Hub</a><b>Sold out</b><i>hub</i></li>
+</ul></body></html>
+"""
+
+
+def laptop_spec():
+    return ExtractionSpec(
+        {
+            "name": ".title",
+            "sku": FieldRule(".sku", attr="data-sku"),
+            "price": FieldRule(".price", post=parse_price),
+            "available": FieldRule(".stock", post=in_stock, default=False),
+            "ram": "//tr[th='RAM']/td",
+            "cpu": FieldRule("//tr[th='CPU']/td/text()"),
+        },
+        model=LaptopProduct,
+        constants={"vendor": "Vendor A"},
+    )
+
+
+def test_extract_product_page_matches_model():
+    record = laptop_spec().extract(PRODUCT_PAGE, "https://a.example/p/1")
+
+    assert record == {
+        "vendor": "Vendor A",
+        "name": "Dell XPS 13",
+        "sku": "XPS-13-9340",
+        "price": 1299.99,
+        "available": True,
+        "ram": "16GB",
+        "cpu": "Intel Core Ultra 7",
+        "url": "https://a.example/p/1",
+    }
+    assert LaptopProduct(**record).screen_size is None
+
+
+def test_many_and_absolute_url_rules():
+    spec = ExtractionSpec(
+        {"images": FieldRule("img.gallery", attr="src", many=True, absolute_url=True)}
+    )
+
+    record = spec.extract(PRODUCT_PAGE, "https://a.example/p/1")
+
+    assert record["images"] == [
+        "https://a.example/img/1.jpg",
+        "https://a.example/img/2.jpg",
+    ]
+
+
+def test_extract_all_cards_in_one_pass():
+    spec = ExtractionSpec(
+        {
+            "name": "a",
+            "sku": FieldRule("a", attr="href", post=lambda v: v.rsplit("/", 1)[1]),
+            "url": FieldRule("a", attr="href", absolute_url=True),
+            "price": FieldRule("b", post=parse_price),
+            "type": "i",
+        },
+        model=PeripheralProduct,
+        item_selector="li.card",
+        constants={"vendor": "Vendor B"},
+    )
+
+    records = spec.extract_all(LISTING_PAGE, "https://b.example/mice?page=2")
+
+    assert [r["sku"] for r in records] == ["mouse-1", "kbd-2", "hub-3"]
+    assert records[0]["url"] == "https://b.example/p/mouse-1"
+    assert [r["price"] for r in records] == [99.0, 39.5, None]
+    assert PeripheralProduct(**records[1]).type == "keyboard"
+
+
+def test_spec_rejects_unknown_fields_and_bad_selectors():
+    with pytest.raises(ValueError, match="colour"):
+        ExtractionSpec({"colour": ".c"}, model=LaptopProduct)
+    with pytest.raises(ValueError, match="Invalid selector"):
+        ExtractionSpec({"name": "div[["})
+
+
+def test_register_and_get_spec():
+    spec = register_spec("vendor_test", laptop_spec())
+
+    assert get_spec("vendor_test") is spec
+    with pytest.raises(KeyError):
+        get_spec("missing")
+
+
+@pytest.mark.parametrize(
+    "text,expected",
+    [
+        ("$1,299.99", 1299.99),
+        ("1.299,99 €", 1299.99),
+        ("£ 45", 45.0),
+        ("12,5", 12.5),
+        ("Call us", None),
+        (None, None),
+    ],
+)
+def test_parse_price(text, expected):
+    assert parse_price(text) == expected
+
+
+JSON_LD_PAGE = """
+<html><head>
+<script type="application/ld+json">{"@context": "https://schema.org",
+  "@graph": [{"@type": "BreadcrumbList"},
+             {"@type": "Product", "name": "ThinkPad X1", "sku": "TP-X1",
+              "offers": {"@type": "Offer", "price": "1499.00",
+                         "availability": "https://schema.org/InStock"}}]}
+</script>
+<script type="application/ld+json">{not json</script>
+</head><body><h1 class="title">ignored</h1></body></html>
+"""
+
+MICRODATA_PAGE = """
+<div itemscope itemtype="https://schema.org/Product">
+  <span itemprop="name">MX Keys</span>
+  <meta itemprop="sku" content="MXK-1" />
+  <div itemprop="offers" itemscope itemtype="https://schema.org/Offer">
+    <span itemprop="price" content="109.99">$109.99</span>
+    <link itemprop="availability" href="https://schema.org/OutOfStock" />
+  </div>
+</div>
+"""
+
+
+def test_json_ld_blocks_are_decoded_and_flattened():
+    nodes = extract_json_ld(JSON_LD_PAGE)
+
+    assert [n.get("@type") for n in nodes] == [None, "BreadcrumbList", "Product"]
+
+
+def test_structured_product_from_json_ld_and_microdata():
+    assert extract_structured_product(JSON_LD_PAGE) == {
+        "name": "ThinkPad X1",
+        "sku": "TP-X1",
+        "price": 1499.0,
+        "available": True,
+    }
+    assert extract_structured_product(MICRODATA_PAGE) == {
+        "name": "MX Keys",
+        "sku": "MXK-1",
+        "price": 109.99,
+        "available": False,
+    }
+    assert extract_structured_product(PRODUCT_PAGE) == {}
+
+
+def test_structured_fast_path_skips_selectors(monkeypatch):
+    spec = ExtractionSpec(
+        {"name": ".title", "price": FieldRule(".price", post=parse_price)},
+        model=LaptopProduct,
+        constants={"vendor": "Vendor A"},
+        structured_data=True,
+    )
+    monkeypatch.setattr(
+        "app.services.html_tools.parse_document",
+        lambda html: pytest.fail("selectors should not run"),
+    )
+
+    record = spec.extract(JSON_LD_PAGE, "https://a.example/p/1")
+
+    assert record["name"] == "ThinkPad X1"
+    assert record["vendor"] == "Vendor A"
+    assert record["url"] == "https://a.example/p/1"
+
+
+def test_structured_data_gaps_are_filled_by_selectors():
+    spec = ExtractionSpec(
+        {"sku": FieldRule(".sku", attr="data-sku"), "ram": "//tr[th='RAM']/td"},
+        model=LaptopProduct,
+        structured_data=True,
+    )
+    page = PRODUCT_PAGE.replace(
+        "<body>",
+        '<body><script type="application/ld+json">'
+        '{"@type": "Product", "name": "XPS", "offers": {"price": 999}}</script>',
+    )
+
+    record = spec.extract(page, "https://a.example/p/1")
+
+    assert record["name"] == "XPS"
+    assert record["price"] == 999.0
+    assert record["sku"] == "XPS-13-9340"
+    assert record["ram"] == "16GB"
@@ -0,0 +1,76 @@
+"""
+Pytest suite for the http_cache module.
+"""
+
+from unittest.mock import MagicMock, patch
+
+from scrapers.fetch_utils import SyncFetcher, fetch_html_sync
+from scrapers.http_cache import HttpCache
+
+URL = "http://example.com/product/1"
+BODY = "<html><body>Product</body></html>"
+
+
+def test_store_and_get_roundtrip(tmp_path):
+    cache = HttpCache(str(tmp_path))
+    assert cache.store(URL, BODY, {"ETag": '"v1"', "Cache-Control": "max-age=60"})
+
+    entry = cache.get(URL)
+    assert entry.body == BODY
+    assert entry.is_fresh()
+    assert entry.conditional_headers() == {"If-None-Match": '"v1"'}
+
+
+def test_uncacheable_responses_are_skipped(tmp_path):
+    cache = HttpCache(str(tmp_path))
+    assert not cache.store(URL, BODY, {})
+    assert not cache.store(URL, BODY, {"ETag": '"v1"', "Cache-Control": "no-store"})
+    assert cache.get(URL) is None
+
+
+def test_lru_eviction_within_byte_budget(tmp_path):
+    cache = HttpCache(str(tmp_path), max_bytes=2 * len(BODY))
+    for i in range(3):
+        cache.store(f"{URL}?p={i}", BODY, {"ETag": str(i)})
+    cache.get(f"{URL}?p=1")
+    cache.store(f"{URL}?p=3", BODY, {"ETag": "3"})
+
+    assert cache.get(f"{URL}?p=1") is not None
+    assert cache.get(f"{URL}?p=2") is None
+    assert cache.total_bytes <= cache.max_bytes
+
+
+def test_index_survives_reload(tmp_path):
+    HttpCache(str(tmp_path)).store(URL, BODY, {"Last-Modified": "Mon, 01 Jan 2024"})
+
+    entry = HttpCache(str(tmp_path)).get(URL)
+    assert entry.body == BODY
+    assert not entry.is_fresh()
+
+
+def test_revalidate_honours_a_zero_max_age(tmp_path):
+    cache = HttpCache(str(tmp_path))
+    cache.store(URL, BODY, {"ETag": '"v1"', "Cache-Control": "max-age=60"})
+
+    entry = cache.get(URL)
+    cache.revalidate(entry, {"ETag": '"v1"'})
+    assert entry.max_age == 60
+    cache.revalidate(entry, {"Cache-Control": "no-cache"})
+    assert entry.max_age == 0
+    assert not cache.get(URL).is_fresh()
+
+
+@patch("scrapers.fetch_utils.requests.Session")
+def test_fetch_html_sync_revalidates_with_304(mock_session_cls, tmp_path):
+    cache = HttpCache(str(tmp_path))
+    cache.store(URL, BODY, {"ETag": '"v1"'})
+
+    not_modified = MagicMock(status_code=304, encoding=None, headers={"ETag": '"v1"'})
+    not_modified.iter_content.return_value = []
+    mock_session_cls.return_value.get.return_value = not_modified
+
+    html = fetch_html_sync(URL, max_retries=1, fetcher=SyncFetcher(), cache=cache)
+
+    assert html == BODY
+    _, kwargs = mock_session_cls.return_value.get.call_args
+    assert kwargs["headers"] == {"If-None-Match": '"v1"'}
@@ -1,10 +1,15 @@
 # web_scraper_service/tests/test_scrapers/test_kafka_producer.py
 
+import asyncio
+
 import pytest
 from unittest.mock import AsyncMock, patch
 
 from app.models.product import LaptopProduct
 from app.services.kafka_producer import KafkaProducerService
+from scrapers.retry_policy import RetryPolicy
+
+FAST_RETRIES = RetryPolicy(max_retries=3, base_delay=0.001)
 
 # A sample product to use across tests
 SAMPLE_LAPTOP = LaptopProduct(
@@ -17,41 +22,177 @@ SAMPLE_LAPTOP = LaptopProduct(
 )
 
 
+@pytest.fixture
+def anyio_backend():
+    # Delivery reports are asyncio futures, as aiokafka runs on asyncio only.
+    return "asyncio"
+
+
+def delivered(error=None):
+    future = asyncio.get_running_loop().create_future()
+    if error is None:
+        future.set_result("metadata")
+    else:
+        future.set_exception(error)
+    return future
+
+
 @pytest.mark.anyio
 @patch("app.services.kafka_producer.AIOKafkaProducer")
 async def test_send_product_success(mock_aio_kafka_producer):  # <- FIX
     """Test successful message sending on the happy path."""
     mock_producer_instance = mock_aio_kafka_producer.return_value  # <- FIX
     mock_producer_instance.start = AsyncMock()
-    mock_producer_instance.send_and_wait = AsyncMock()
+    mock_producer_instance.send = AsyncMock(side_effect=lambda *a, **kw: delivered())
     mock_producer_instance.stop = AsyncMock()
+    mock_producer_instance.flush = AsyncMock()
     service = KafkaProducerService()
 
     await service.start()
-    await service.send_product(SAMPLE_LAPTOP)
+    await service.start()  # Already started: no second connection.
+    delivery = await service.send_product(SAMPLE_LAPTOP)
+    assert await delivery == "metadata"
+    await asyncio.sleep(0)  # Let the delivery callback run.
     await service.stop()
 
     mock_producer_instance.start.assert_called_once()
-    mock_producer_instance.send_and_wait.assert_called_once()
+    mock_producer_instance.send.assert_called_once()
+    _, send_kwargs = mock_producer_instance.send.call_args
+    assert send_kwargs["key"] == b"TestVendor:TEST-SKU-123"
+    assert dict(send_kwargs["headers"]) == {
+        "content-type": b"application/json",
+        "model": b"LaptopProduct",
+        "model-version": b"1",
+    }
     mock_producer_instance.stop.assert_called_once()
+    assert service.stats() == {"sent": 1, "delivered": 1, "failed": 0}
+    _, kwargs = mock_aio_kafka_producer.call_args
+    assert kwargs["linger_ms"] == service.linger_ms
+    assert kwargs["compression_type"] == service.compression_type
 
 
 @pytest.mark.anyio
 @patch("app.services.kafka_producer.AIOKafkaProducer")
 async def test_send_product_with_retries(mock_aio_kafka_producer):  # <- FIX
-    """Test that the producer retries on failure and eventually succeeds."""
+    """Test that failed sends are retried in the background and succeed."""
     mock_producer_instance = mock_aio_kafka_producer.return_value  # <- FIX
     mock_producer_instance.start = AsyncMock()
     mock_producer_instance.stop = AsyncMock()
-    mock_producer_instance.send_and_wait.side_effect = [
-        Exception("Kafka connection failed"),
-        Exception("Kafka still down"),
-        AsyncMock(),
-    ]
-    service = KafkaProducerService()
+    mock_producer_instance.flush = AsyncMock()
+    attempts = [Exception("Kafka connection failed"), Exception("Kafka still down")]
+
+    async def send(*args, **kwargs):
+        if attempts:
+            raise attempts.pop(0)
+        return delivered()
+
+    mock_producer_instance.send = AsyncMock(side_effect=send)
+    service = KafkaProducerService(FAST_RETRIES)
+
+    await service.start()
+    delivery = await service.send_product(SAMPLE_LAPTOP)
+    # The caller is not held up by the retries.
+    assert mock_producer_instance.send.call_count == 1
+    assert await delivery == "metadata"
+    await service.stop()
+
+    assert mock_producer_instance.send.call_count == 3
+    assert service.retries.stats()["scheduled"] == 2
+
+
+@pytest.mark.anyio
+@patch("app.services.kafka_producer.AIOKafkaProducer")
+async def test_send_products_awaits_deliveries_in_aggregate(mock_aio_kafka_producer):
+    """Test that a bulk send counts delivered and dead-lettered messages."""
+    mock_producer_instance = mock_aio_kafka_producer.return_value
+    mock_producer_instance.start = AsyncMock()
+    mock_producer_instance.stop = AsyncMock()
+    mock_producer_instance.flush = AsyncMock()
+    dead_letters = []
+
+    async def send(topic, value, key=None, headers=None):
+        if topic == "products.dlq":
+            dead_letters.append((value, key, dict(headers)))
+            return delivered()
+        if b"poison" in value:
+            return delivered(RuntimeError("broker gone"))
+        return delivered()
+
+    mock_producer_instance.send = AsyncMock(side_effect=send)
+    service = KafkaProducerService(FAST_RETRIES)
+    service.dlq_topic = "products.dlq"
+    products = [SAMPLE_LAPTOP, {"sku": "poison"}, {"sku": "raw"}, "not a product"]
+
+    await service.start()
+    counts = await service.send_products(iter(products), window=2)
+    await service.stop()
+
+    assert counts == {"delivered": 2, "failed": 2}
+    assert len(dead_letters) == 1
+    value, key, headers = dead_letters[0]
+    assert value == b'{"sku":"poison"}'
+    assert key == b":poison"
+    assert headers["content-type"] == b"application/json"
+    assert headers["dlq.source"] == b"publish"
+    assert headers["dlq.original_topic"] == b"products"
+    assert headers["dlq.attempts"] == b"3"
+    assert headers["dlq.error_message"] == b"broker gone"
+
+
+@pytest.mark.anyio
+@patch("app.services.kafka_producer.AIOKafkaProducer")
+async def test_stop_dead_letters_pending_retries(mock_aio_kafka_producer):
+    """Test that messages still waiting for a retry survive a shutdown."""
+    mock_producer_instance = mock_aio_kafka_producer.return_value
+    mock_producer_instance.start = AsyncMock()
+    mock_producer_instance.stop = AsyncMock()
+    mock_producer_instance.flush = AsyncMock()
+    topics = []
+
+    async def send(topic, value, key=None, headers=None):
+        topics.append(topic)
+        if topic == "products":
+            raise RuntimeError("metadata unavailable")
+        return delivered()
+
+    mock_producer_instance.send = AsyncMock(side_effect=send)
+    service = KafkaProducerService(RetryPolicy(max_retries=5, base_delay=60))
+
+    await service.start()
+    delivery = await service.send_product(SAMPLE_LAPTOP)
+    await service.stop()
+
+    assert topics == ["products", service.dlq_topic]
+    with pytest.raises(RuntimeError):
+        delivery.result()
+
+
+@pytest.mark.anyio
+@patch("app.services.kafka_producer.AIOKafkaProducer")
+async def test_stop_retries_deliveries_failing_during_flush(mock_aio_kafka_producer):
+    """Test that a delivery failing in the final flush is still settled."""
+    mock_producer_instance = mock_aio_kafka_producer.return_value
+    mock_producer_instance.start = AsyncMock()
+    mock_producer_instance.stop = AsyncMock()
+    buffered = asyncio.get_running_loop().create_future()
+    topics = []
+
+    async def send(topic, value, key=None, headers=None):
+        topics.append(topic)
+        return buffered if topic == "products" else delivered()
+
+    async def flush():
+        buffered.set_exception(RuntimeError("broker gone"))
+
+    mock_producer_instance.send = AsyncMock(side_effect=send)
+    mock_producer_instance.flush = AsyncMock(side_effect=flush)
+    service = KafkaProducerService(RetryPolicy(max_retries=5, base_delay=60))
 
     await service.start()
-    await service.send_product(SAMPLE_LAPTOP)
+    delivery = await service.send_product(SAMPLE_LAPTOP)
     await service.stop()
 
-    assert mock_producer_instance.send_and_wait.call_count == 3
+    mock_producer_instance.flush.assert_called_once()
+    assert topics == ["products", service.dlq_topic]
+    with pytest.raises(RuntimeError, match="broker gone"):
+        delivery.result()
@@ -0,0 +1,38 @@
+"""
+Pytest suite for the parse_pool module.
+"""
+
+from unittest.mock import patch
+
+import pytest
+
+from app.services import parse_pool
+from app.services.parse_pool import ParserPool, parse_in_worker
+
+
+@pytest.fixture
+def anyio_backend():
+    # The pool hands work to the asyncio loop's executor machinery.
+    return "asyncio"
+
+
+def test_parse_in_worker_builds_each_scraper_once():
+    parse_pool._worker_scrapers.clear()
+    with patch(
+        "app.services.parse_pool.create_scraper", wraps=parse_pool.create_scraper
+    ) as factory:
+        parse_in_worker("vendor_a", "<html></html>", "http://a/1")
+        parse_in_worker("vendor_a", "<html></html>", "http://a/2")
+        parse_in_worker("vendor_b", "<html></html>", "http://b/1")
+
+    assert factory.call_count == 2
+
+
+@pytest.mark.anyio
+async def test_parser_pool_parses_in_worker_processes():
+    with ParserPool(max_workers=2) as pool:
+        parsed = await pool.parse("vendor_a", "<html>page</html>", "http://a/1")
+
+    assert parsed["url"] == "http://a/1"
+    assert parsed["metadata"]["vendor"] == "vendor_a"
+    assert parsed["metadata"]["html_length"] == len("<html>page</html>")
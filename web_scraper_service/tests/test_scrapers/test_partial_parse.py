@@ -0,0 +1,75 @@
+"""
+Pytest suite for the partial_parse module.
+"""
+
+import pytest
+
+from scrapers import VendorAScraper
+from scrapers.partial_parse import (
+    iter_regions,
+    parse_region,
+    parse_regions,
+    soup_regions,
+)
+
+PAGE = (
+    "<html><head><script>var big = 1;</script></head><body>"
+    + "<nav>"
+    + "<a href='/x'>link</a>" * 500
+    + "</nav>"
+    + "<div id='product' class='pdp main'><h1>Laptop</h1>"
+    + "<div class='pdp'><span class='price'>999</span></div></div>"
+    + "<p class='pdp'>Ships today</p>"
+    + "<footer>"
+    + "<p>legal</p>" * 500
+    + "</footer></body></html>"
+)
+
+
+class RegionScraper(VendorAScraper):
+    target_regions = ("#product", "p.pdp")
+
+
+def test_parse_region_selector():
+    assert parse_region("div#product.pdp.main") == ("div", "product", ("pdp", "main"))
+    assert parse_region(".price") == (None, None, ("price",))
+    with pytest.raises(ValueError):
+        parse_region("div > span")
+
+
+def test_lxml_regions_are_detached_subtrees():
+    regions = parse_regions(PAGE, ["#product", "p.pdp"])
+
+    assert [r.tag for r in regions] == ["div", "p"]
+    assert all(r.getparent() is None for r in regions)
+    assert regions[0].cssselect(".price")[0].text == "999"
+    assert regions[1].text_content() == "Ships today"
+
+
+def test_lxml_regions_survive_small_chunks():
+    regions = list(iter_regions(PAGE, ["#product"], chunk_size=7))
+
+    assert len(regions) == 1
+    assert regions[0].text_content() == "Laptop999"
+
+
+def test_soup_regions_only_contain_targets():
+    soup = soup_regions(PAGE, ["#product", "p.pdp"])
+
+    assert soup.select_one(".price").text == "999"
+    assert soup.find("nav") is None
+    assert soup.find("footer") is None
+
+
+def test_scraper_parse_targets_backends():
+    scraper = RegionScraper()
+
+    regions = scraper.parse_targets(PAGE)
+    soup = scraper.parse_targets(PAGE, backend="soup")
+    whole = VendorAScraper().parse_targets("<html><body><p>x</p></body></html>")
+
+    assert [r.get("id") for r in regions] == ["product", None]
+    assert soup.find("h1").text == "Laptop"
+    assert whole[0].tag == "html"
+    with pytest.raises(ValueError):
+        scraper.parse_targets(PAGE, backend="regex")
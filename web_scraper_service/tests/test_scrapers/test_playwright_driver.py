@@ -0,0 +1,229 @@
+"""
+Pytest suite for the playwright_driver pool.
+"""
+
+import asyncio
+
+import pytest
+
+from app.utils.playwright_driver import PlaywrightPool, configure_renderer
+from scrapers import VendorAScraper
+from scrapers.tiered_fetch import TieredFetcher
+
+
+@pytest.fixture
+def anyio_backend():
+    # The context pool uses asyncio primitives.
+    return "asyncio"
+
+
+class FakeRequest:
+    def __init__(self, url, resource_type):
+        self.url = url
+        self.resource_type = resource_type
+
+
+class FakeRoute:
+    def __init__(self, url, resource_type="document"):
+        self.request = FakeRequest(url, resource_type)
+        self.outcome = None
+
+    async def abort(self):
+        self.outcome = "aborted"
+
+    async def continue_(self):
+        self.outcome = "continued"
+
+
+class FakePage:
+    def __init__(self, context):
+        self.context = context
+        self.url = None
+
+    async def goto(self, url, wait_until, timeout):
+        if self.context.browser.crashed:
+            raise RuntimeError("Target page, context or browser has been closed")
+        if url.endswith("/hang"):
+            await asyncio.sleep(10)
+        self.url = url
+
+    async def wait_for_selector(self, selector, state, timeout):
+        self.context.selectors.append(selector)
+
+    async def content(self):
+        return f"<html>{self.url}</html>"
+
+    async def close(self):
+        pass
+
+
+class FakeContext:
+    def __init__(self, browser):
+        self.browser = browser
+        self.handler = None
+        self.closed = False
+        self.selectors = []
+
+    def set_default_timeout(self, timeout):
+        pass
+
+    async def route(self, pattern, handler):
+        self.handler = handler
+
+    async def new_page(self):
+        return FakePage(self)
+
+    async def close(self):
+        self.closed = True
+
+
+class FakeBrowser:
+    def __init__(self):
+        self.contexts = []
+        self.closed = False
+        self.crashed = False
+
+    def is_connected(self):
+        return not self.crashed
+
+    async def new_context(self, **kwargs):
+        if self.crashed:
+            raise RuntimeError("Browser has been closed")
+        self.contexts.append(FakeContext(self))
+        return self.contexts[-1]
+
+    async def close(self):
+        self.closed = True
+
+
+@pytest.fixture
+def browser():
+    return FakeBrowser()
+
+
+@pytest.fixture
+def launcher(browser):
+    async def launch():
+        return browser
+
+    return launch
+
+
+@pytest.mark.anyio
+async def test_render_waits_for_selector_and_returns_dom(browser, launcher):
+    async with PlaywrightPool(max_contexts=2, launcher=launcher) as pool:
+        html = await pool.render("http://shop/item", wait_selector=".price")
+
+    assert html == "<html>http://shop/item</html>"
+    assert len(browser.contexts) == 2
+    assert [".price"] in [c.selectors for c in browser.contexts]
+    assert browser.closed
+
+
+@pytest.mark.anyio
+async def test_route_blocks_heavy_resources_and_trackers(launcher):
+    async with PlaywrightPool(max_contexts=1, launcher=launcher) as pool:
+        routes = [
+            FakeRoute("http://shop/logo.png", "image"),
+            FakeRoute("http://shop/font.woff2", "font"),
+            FakeRoute("https://www.google-analytics.com/collect", "script"),
+            FakeRoute("http://shop/app.js", "script"),
+            FakeRoute("http://shop/item", "document"),
+        ]
+        for route in routes:
+            await pool._route(route)
+
+    assert [r.outcome for r in routes] == [
+        "aborted",
+        "aborted",
+        "aborted",
+        "continued",
+        "continued",
+    ]
+    assert pool.blocked_requests == 3
+
+
+@pytest.mark.anyio
+async def test_contexts_are_recycled(browser, launcher):
+    async with PlaywrightPool(
+        max_contexts=1, max_pages_per_context=2, launcher=launcher
+    ) as pool:
+        for i in range(3):
+            await pool.render(f"http://shop/{i}")
+
+    assert len(browser.contexts) == 2
+    assert browser.contexts[0].closed
+
+
+@pytest.mark.anyio
+async def test_browser_crash_relaunches_without_shrinking_the_pool():
+    browsers, launches = [], []
+
+    async def launch():
+        launches.append(len(launches))
+        if len(launches) == 2:
+            raise RuntimeError("Chromium failed to start")
+        browsers.append(FakeBrowser())
+        return browsers[-1]
+
+    async with PlaywrightPool(max_contexts=2, launcher=launch) as pool:
+        browsers[0].crashed = True
+        for i in range(2):
+            with pytest.raises(RuntimeError):
+                await pool.render(f"http://shop/{i}")
+
+        # The first relaunch failed and left an empty slot, not a lost one.
+        assert pool._contexts.qsize() == 2
+        for i in range(2):
+            html = await pool.render(f"http://shop/ok{i}")
+            assert html == f"<html>http://shop/ok{i}</html>"
+
+    assert len(browsers) == 2
+    assert len(browsers[1].contexts) == 2
+
+
+@pytest.mark.anyio
+async def test_checkout_is_bounded_by_the_render_timeout(launcher):
+    async with PlaywrightPool(max_contexts=1, launcher=launcher) as pool:
+        hung = asyncio.ensure_future(pool.render("http://shop/hang"))
+        await asyncio.sleep(0)
+        with pytest.raises(asyncio.TimeoutError):
+            await pool.render("http://shop/1", timeout=0.05)
+        hung.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await hung
+
+        assert await pool.render("http://shop/2") == "<html>http://shop/2</html>"
+
+
+@pytest.mark.anyio
+async def test_scraper_renders_through_configured_backend(launcher):
+    class RenderedScraper(VendorAScraper):
+        render_backend = "playwright"
+        wait_selector = "#product"
+
+    pool = PlaywrightPool(max_contexts=1, launcher=launcher)
+    scraper = RenderedScraper(renderer=pool)
+    try:
+        assert (
+            await scraper.fetch_html_async("http://shop/1")
+            == "<html>http://shop/1</html>"
+        )
+    finally:
+        await pool.close()
+
+    assert configure_renderer(VendorAScraper()).renderer is None
+    with pytest.raises(ValueError):
+        configure_renderer(VendorAScraper(), "carrier-pigeon")
+
+
+def test_tiered_backend_is_shared_per_scraper_class():
+    class TieredScraper(VendorAScraper):
+        required_selectors = (".price",)
+
+    first = configure_renderer(TieredScraper(), "tiered").renderer
+    second = configure_renderer(TieredScraper(), "tiered").renderer
+
+    assert isinstance(first, TieredFetcher)
+    assert first is second
+    assert first.required_selectors == (".price",)
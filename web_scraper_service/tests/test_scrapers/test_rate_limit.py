@@ -0,0 +1,77 @@
+"""
+Pytest suite for the rate_limit module.
+"""
+
+import asyncio
+import time
+
+import pytest
+
+from scrapers.rate_limit import HostLimiter, HostRateLimiter
+
+
+@pytest.fixture
+def anyio_backend():
+    # The limiter is built on asyncio primitives.
+    return "asyncio"
+
+
+@pytest.mark.anyio
+async def test_token_bucket_paces_requests():
+    limiter = HostRateLimiter(rate=20.0, burst=1, initial_window=8)
+    started = time.monotonic()
+    for _ in range(5):
+        async with limiter.slot("http://shop.example/p") as slot:
+            slot.record(200)
+    # One token up front, four more at 20/sec.
+    assert time.monotonic() - started >= 0.18
+
+
+@pytest.mark.anyio
+async def test_window_grows_on_success_and_halves_on_throttle():
+    limiter = HostLimiter("shop.example", rate=1000.0, initial_window=4, cooldown=0)
+    for _ in range(4):
+        await limiter.acquire()
+        await limiter.release("success")
+    assert limiter.window > 4
+
+    grown = limiter.window
+    await limiter.acquire()
+    await limiter.release("throttled")
+    assert limiter.window == pytest.approx(grown / 2)
+
+    await limiter.acquire()
+    await limiter.release("error")
+    assert limiter.window == pytest.approx(grown / 2)
+
+
+@pytest.mark.anyio
+async def test_concurrency_is_capped_by_window():
+    limiter = HostRateLimiter(rate=1000.0, burst=100, initial_window=2, max_window=2)
+    peak = 0
+
+    async def request(i):
+        nonlocal peak
+        async with limiter.slot(f"http://shop.example/{i}") as slot:
+            peak = max(peak, limiter.limiter_for("http://shop.example").in_flight)
+            await asyncio.sleep(0.01)
+            slot.record(200)
+
+    await asyncio.gather(*(request(i) for i in range(10)))
+
+    assert peak == 2
+    stats = limiter.stats()["shop.example"]
+    assert stats["successes"] == 10
+    assert stats["in_flight"] == 0
+
+
+@pytest.mark.anyio
+async def test_hosts_are_limited_independently():
+    limiter = HostRateLimiter(rate=1000.0, overrides={"slow.example": {"rate": 1.0}})
+    assert limiter.limiter_for("http://slow.example/a").rate == 1.0
+    assert limiter.limiter_for("http://fast.example/a").rate == 1000.0
+
+    with pytest.raises(asyncio.TimeoutError):
+        async with limiter.slot("http://fast.example/a"):
+            raise asyncio.TimeoutError()
+    assert limiter.stats()["fast.example"]["throttled"] == 1
@@ -0,0 +1,104 @@
+"""
+Pytest suite for the lazy scraper registry.
+"""
+
+import subprocess
+import sys
+from importlib import metadata
+
+import pytest
+
+from scrapers import VendorAScraper
+from scrapers.registry import ScraperRegistry, import_target
+
+
+class TaggedScraper(VendorAScraper):
+    categories = ("inventory",)
+
+
+def test_import_does_not_load_vendor_modules():
+    code = (
+        "import sys, scrapers\n"
+        "assert scrapers.scraper_names() == ['vendor_a', 'vendor_b']\n"
+        "assert 'scrapers.vendor_a' not in sys.modules\n"
+        "assert 'scrapers.base_scraper' not in sys.modules\n"
+        "scrapers.create_scraper('vendor_a')\n"
+        "assert 'scrapers.vendor_a' in sys.modules\n"
+        "assert 'scrapers.vendor_b' not in sys.modules\n"
+    )
+    subprocess.run([sys.executable, "-c", code], check=True)
+
+
+def test_string_targets_load_on_first_lookup():
+    registry = ScraperRegistry(
+        {"a": "scrapers.vendor_a:VendorAScraper"},
+        categories={"a": ["product"]},
+        entry_point_group=None,
+    )
+
+    assert "a" in registry and not registry.is_loaded("a")
+    assert registry.names("product") == ["a"]
+    assert not registry.is_loaded("a")
+
+    scraper = registry.create("a")
+    assert isinstance(scraper, VendorAScraper) and scraper.name == "a"
+    assert registry.is_loaded("a")
+
+
+def test_class_categories_are_merged():
+    registry = ScraperRegistry(entry_point_group=None)
+    registry.register("tagged", TaggedScraper, ["product"])
+
+    assert registry.categories("tagged") == {"inventory", "product"}
+    assert registry.names("inventory") == ["tagged"]
+
+
+def test_register_errors():
+    registry = ScraperRegistry({"a": VendorAScraper}, entry_point_group=None)
+
+    with pytest.raises(ValueError):
+        registry.register("a", "scrapers.vendor_b:VendorBScraper")
+    with pytest.raises(TypeError):
+        registry.register("bad", dict)
+    with pytest.raises(ValueError):
+        registry.create("missing")
+
+    registry.register("wrong", "scrapers.registry:ScraperRegistry")
+    with pytest.raises(TypeError):
+        registry["wrong"]
+
+
+def test_import_target():
+    assert import_target("scrapers.vendor_a:VendorAScraper") is VendorAScraper
+    with pytest.raises(ValueError):
+        import_target("scrapers.vendor_a")
+    with pytest.raises(ImportError):
+        import_target("scrapers.vendor_a:Nope")
+
+
+def test_entry_point_plugins(monkeypatch):
+    plugins = [
+        metadata.EntryPoint(
+            "tagged", f"{__name__}:TaggedScraper", "web_scraper_service.scrapers"
+        ),
+        metadata.EntryPoint(
+            "a", "scrapers.vendor_b:VendorBScraper", "web_scraper_service.scrapers"
+        ),
+    ]
+    calls = []
+
+    def entry_points(group):
+        calls.append(group)
+        return plugins
+
+    monkeypatch.setattr(metadata, "entry_points", entry_points)
+    registry = ScraperRegistry({"a": "scrapers.vendor_a:VendorAScraper"})
+
+    # Built-in lookups never scan installed packages.
+    assert registry["a"] is VendorAScraper
+    assert calls == []
+
+    assert registry.names() == ["a", "tagged"]
+    assert registry.names("inventory") == ["tagged"]
+    assert registry["tagged"] is TaggedScraper
+    assert calls == ["web_scraper_service.scrapers"]
@@ -0,0 +1,57 @@
+"""
+Pytest suite for the replay module.
+"""
+
+from scrapers import get_available_scrapers
+from scrapers.html_archive import HtmlArchive
+from scrapers.replay import ReplayStats, benchmark, replay
+
+
+def _fill_archive(directory):
+    with HtmlArchive(directory) as archive:
+        archive.put("http://shop/a", "<p>old</p>", fetched_at=1.0)
+        archive.put("http://shop/a", "<p>new</p>", fetched_at=2.0)
+        archive.put("http://shop/b", "<script>x()</script>", fetched_at=2.0)
+
+
+def test_replay_parses_latest_captures(tmp_path):
+    _fill_archive(str(tmp_path))
+
+    records = list(replay(str(tmp_path), "vendor_a", max_workers=2, batch_size=1))
+
+    assert sorted(r["url"] for r in records) == ["http://shop/a", "http://shop/b"]
+    assert all(r["error"] is None for r in records)
+    by_url = {r["url"]: r for r in records}
+    assert by_url["http://shop/a"]["fetched_at"] == 2.0
+    assert by_url["http://shop/b"]["data"]["url"] == "http://shop/b"
+
+
+def test_replay_all_captures(tmp_path):
+    _fill_archive(str(tmp_path))
+
+    records = list(replay(str(tmp_path), "vendor_b", max_workers=1, latest_only=False))
+
+    assert len(records) == 3
+
+
+def test_benchmark_reports_every_registered_scraper(tmp_path):
+    _fill_archive(str(tmp_path))
+
+    report = benchmark(str(tmp_path), max_workers=1)
+
+    assert set(report) == set(get_available_scrapers())
+    for stats in report.values():
+        assert stats["pages"] == 2
+        assert stats["errors"] == 0
+        assert stats["pages_per_sec"] > 0
+        assert stats["p99_ms"] >= stats["p50_ms"]
+
+
+def test_replay_stats_percentiles():
+    stats = ReplayStats("vendor_a")
+    for i in range(100):
+        stats.add({"error": None, "parse_seconds": (i + 1) / 1000})
+
+    assert stats.percentile(0.50) == 0.051
+    assert stats.percentile(0.99) == 0.1
+    assert ReplayStats("empty").percentile(0.5) == 0.0
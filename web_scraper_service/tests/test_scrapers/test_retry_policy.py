@@ -0,0 +1,139 @@
+"""
+Pytest suite for the retry_policy module.
+"""
+
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import anyio
+import pytest
+import requests
+
+from scrapers.fetch_utils import (
+    AsyncFetcher,
+    SyncFetcher,
+    fetch_html_async,
+    fetch_html_sync,
+)
+from scrapers.retry_policy import (
+    CircuitBreaker,
+    CircuitOpenError,
+    RetryPolicy,
+    parse_retry_after,
+)
+
+
+@pytest.fixture
+def anyio_backend():
+    # AsyncFetcher sessions are aiohttp ones, which run on asyncio only.
+    return "asyncio"
+
+
+def _http_error(status: int, headers=None) -> requests.HTTPError:
+    response = MagicMock(status_code=status, headers=headers or {})
+    return requests.HTTPError(f"{status} error", response=response)
+
+
+def test_parse_retry_after_seconds_and_dates():
+    assert parse_retry_after("120") == 120.0
+    assert parse_retry_after("Wed, 21 Oct 2015 07:28:00 GMT") == 0.0
+    assert parse_retry_after("soon") is None
+    assert parse_retry_after(None) is None
+
+
+def test_backoff_uses_full_jitter_within_cap():
+    policy = RetryPolicy(base_delay=1.0, max_delay=5.0)
+    for attempt in range(1, 8):
+        delay = policy.backoff(attempt)
+        assert 0 <= delay <= min(5.0, 2 ** (attempt - 1))
+
+
+def test_non_retryable_status_gives_up_immediately():
+    policy = RetryPolicy(max_retries=5)
+    assert policy.on_failure("http://shop.example/p", _http_error(404), 1) is None
+    assert policy.on_failure("http://shop.example/p", _http_error(503), 1) is not None
+    assert policy.on_failure("http://shop.example/p", ConnectionError(), 1) is not None
+
+
+def test_retry_after_overrides_backoff():
+    policy = RetryPolicy(max_retries=3, max_delay=10.0)
+    exc = _http_error(429, {"Retry-After": "7"})
+    assert policy.on_failure("http://shop.example/p", exc, 1) == 7.0
+    exc = _http_error(429, {"Retry-After": "600"})
+    assert policy.on_failure("http://shop.example/p", exc, 1) == 10.0
+
+
+def test_circuit_opens_then_half_opens():
+    breaker = CircuitBreaker(failure_threshold=2, reset_timeout=0.0)
+    url = "http://down.example/p"
+    breaker.record_failure(url)
+    breaker.record_failure(url)
+    assert breaker.state(url) == "open"
+
+    breaker.before_call(url)
+    assert breaker.state(url) == "half_open"
+    with pytest.raises(CircuitOpenError):
+        breaker.before_call(url)
+
+    breaker.record_success(url)
+    assert breaker.state(url) == "closed"
+
+
+@pytest.mark.anyio
+@patch("scrapers.fetch_utils.aiohttp.ClientSession")
+async def test_cancelled_half_open_trial_frees_the_circuit(mock_session_cls):
+    async def hang():
+        await anyio.sleep(10)
+
+    response = AsyncMock()
+    response.__aenter__.return_value.raise_for_status = MagicMock()
+    response.__aenter__.return_value.text = AsyncMock(side_effect=hang)
+    mock_session_cls.return_value = AsyncMock(closed=False)
+    mock_session_cls.return_value.get = MagicMock(return_value=response)
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=0.0)
+    url = "http://down.example/p"
+    breaker.record_failure(url)
+
+    with anyio.move_on_after(0.05):
+        await fetch_html_async(
+            url,
+            retry_policy=RetryPolicy(max_retries=1, breaker=breaker),
+            fetcher=AsyncFetcher(),
+        )
+
+    assert breaker.state(url) == "half_open"
+    breaker.before_call(url)  # The next call gets the trial instead of failing.
+    with pytest.raises(CircuitOpenError):
+        breaker.before_call(url)
+
+
+@patch("scrapers.fetch_utils.time.sleep", MagicMock())
+@patch("scrapers.fetch_utils.requests.Session")
+def test_fetch_html_sync_fails_fast_on_open_circuit(mock_session_cls):
+    mock_session_cls.return_value.get.side_effect = requests.ConnectionError("down")
+    policy = RetryPolicy(
+        max_retries=3, breaker=CircuitBreaker(failure_threshold=3, reset_timeout=60)
+    )
+    fetcher = SyncFetcher()
+
+    with pytest.raises(requests.ConnectionError):
+        fetch_html_sync("http://down.example/a", fetcher=fetcher, retry_policy=policy)
+    with pytest.raises(CircuitOpenError):
+        fetch_html_sync("http://down.example/b", fetcher=fetcher, retry_policy=policy)
+
+    assert mock_session_cls.return_value.get.call_count == 3
+
+
+@patch("scrapers.fetch_utils.time.sleep")
+@patch("scrapers.fetch_utils.requests.Session")
+def test_fetch_html_sync_does_not_retry_404(mock_session_cls, mock_sleep):
+    mock_session_cls.return_value.get.side_effect = _http_error(404)
+
+    with pytest.raises(requests.HTTPError):
+        fetch_html_sync(
+            "http://shop.example/missing",
+            fetcher=SyncFetcher(),
+            retry_policy=RetryPolicy(max_retries=3),
+        )
+
+    assert mock_session_cls.return_value.get.call_count == 1
+    mock_sleep.assert_not_called()
@@ -0,0 +1,152 @@
+"""
+Pytest suite for the delayed-retry scheduler.
+"""
+
+import anyio
+import pytest
+
+from app.services.retry_queue import PUBLISH, SCRAPE, RetryScheduler, RetryTask
+from scrapers.retry_policy import RetryPolicy
+
+
+class FixedDelay(RetryPolicy):
+    """Retry policy without jitter, so retry order is deterministic."""
+
+    def backoff(self, attempt):
+        return self.base_delay
+
+
+def flaky(failures, events, name):
+    remaining = list(failures)
+
+    async def action():
+        if remaining:
+            events.append(f"{name} failed")
+            raise remaining.pop(0)
+        events.append(f"{name} ok")
+        return name
+
+    return action
+
+
+@pytest.mark.anyio
+async def test_failing_task_does_not_block_healthy_ones():
+    events = []
+    scheduler = RetryScheduler(FixedDelay(max_retries=3, base_delay=0.05))
+    slow = RetryTask(SCRAPE, "http://a", flaky([OSError("down")], events, "slow"))
+    fast = RetryTask(SCRAPE, "http://b", flaky([], events, "fast"))
+
+    async with anyio.create_task_group() as tg:
+        tg.start_soon(scheduler.run)
+        assert scheduler.submit(slow, OSError("down")) is not None
+        assert scheduler.submit(fast, OSError("down")) is not None
+        with anyio.fail_after(5):
+            while len(scheduler):
+                await anyio.sleep(0.01)
+        await scheduler.close()
+
+    assert events.index("fast ok") < events.index("slow ok")
+    assert slow.attempt == 3
+    assert scheduler.stats() == {
+        "scheduled": 3,
+        "succeeded": 2,
+        "dead_lettered": 0,
+        "pending": 0,
+    }
+
+
+@pytest.mark.anyio
+async def test_scrape_retry_waiting_on_a_publish_retry_does_not_deadlock():
+    events = []
+    scheduler = RetryScheduler(
+        FixedDelay(max_retries=3, base_delay=0.01), concurrency=1
+    )
+    delivered = anyio.Event()
+
+    async def deliver():
+        events.append("publish ok")
+        delivered.set()
+
+    async def scrape_and_wait_for_delivery():
+        scheduler.submit(RetryTask(PUBLISH, "products", deliver), OSError("down"))
+        await delivered.wait()
+        events.append("scrape ok")
+
+    scrape = RetryTask(SCRAPE, "http://a", scrape_and_wait_for_delivery)
+
+    async with anyio.create_task_group() as tg:
+        tg.start_soon(scheduler.run)
+        scheduler.submit(scrape, OSError("timeout"))
+        with anyio.fail_after(5):
+            while len(scheduler):
+                await anyio.sleep(0.01)
+        await scheduler.close()
+
+    assert events == ["publish ok", "scrape ok"]
+    assert scheduler.stats()["succeeded"] == 2
+
+
+@pytest.mark.anyio
+async def test_exhausted_and_non_retryable_tasks_are_dead_lettered():
+    dead = []
+
+    async def dead_letter(task):
+        dead.append((task.key, task.attempt, task.errors))
+
+    scheduler = RetryScheduler(
+        RetryPolicy(max_retries=2, base_delay=0.001), dead_letter
+    )
+    always = RetryTask(PUBLISH, "products", flaky([OSError("x")] * 5, [], "p"))
+    invalid = RetryTask(SCRAPE, "http://bad", flaky([], [], "s"))
+
+    async with anyio.create_task_group() as tg:
+        tg.start_soon(scheduler.run)
+        scheduler.submit(always, OSError("x"))
+        assert scheduler.submit(invalid, ValueError("no sku"), retry=False) is None
+        with anyio.fail_after(5):
+            while len(scheduler):
+                await anyio.sleep(0.01)
+        await scheduler.close()
+
+    assert sorted(dead) == [
+        ("http://bad", 1, ["ValueError: no sku"]),
+        ("products", 2, ["OSError: x", "OSError: x"]),
+    ]
+
+
+@pytest.mark.anyio
+async def test_close_dead_letters_waiting_tasks():
+    dead = []
+
+    async def dead_letter(task):
+        dead.append(task.key)
+
+    scheduler = RetryScheduler(RetryPolicy(max_retries=5, base_delay=60), dead_letter)
+    async with anyio.create_task_group() as tg:
+        tg.start_soon(scheduler.run)
+        scheduler.submit(
+            RetryTask(SCRAPE, "http://later", flaky([], [], "x")), OSError()
+        )
+        with anyio.fail_after(5):
+            await scheduler.close()
+
+    assert dead == ["http://later"]
+
+
+@pytest.mark.anyio
+async def test_scheduler_runs_again_after_close():
+    events = []
+    scheduler = RetryScheduler(FixedDelay(max_retries=3, base_delay=0.01))
+    for name in ("first", "second"):
+        async with anyio.create_task_group() as tg:
+            tg.start_soon(scheduler.run)
+            scheduler.submit(
+                RetryTask(SCRAPE, name, flaky([], events, name)), OSError()
+            )
+            with anyio.fail_after(5):
+                while len(scheduler):
+                    await anyio.sleep(0.01)
+            await scheduler.close()
+
+    assert events == ["first ok", "second ok"]
+    assert scheduler.stats()["dead_lettered"] == 0
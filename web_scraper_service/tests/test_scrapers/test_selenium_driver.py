@@ -0,0 +1,140 @@
+"""
+Pytest suite for the selenium_driver pool.
+"""
+
+import threading
+
+import pytest
+from selenium.common.exceptions import WebDriverException
+
+from app.utils.selenium_driver import DriverPool
+
+
+class FakeDriver:
+    """Stands in for a Chrome WebDriver."""
+
+    launched = 0
+
+    def __init__(self):
+        FakeDriver.launched += 1
+        self.alive = True
+        self.quit_called = False
+        self.visited = []
+
+    def execute_script(self, script):
+        if not self.alive:
+            raise WebDriverException("browser gone")
+        return "complete" if "readyState" in script else 1
+
+    def get(self, url):
+        self.visited.append(url)
+
+    @property
+    def page_source(self):
+        return f"<html>{self.visited[-1]}</html>"
+
+    def quit(self):
+        self.quit_called = True
+
+
+@pytest.fixture(autouse=True)
+def reset_launch_count():
+    FakeDriver.launched = 0
+
+
+def test_pool_prewarms_and_reuses_drivers():
+    with DriverPool(size=2, driver_factory=FakeDriver) as pool:
+        assert FakeDriver.launched == 2
+        for i in range(5):
+            assert (
+                pool.get_page_source(f"http://shop/{i}")
+                == f"<html>http://shop/{i}</html>"
+            )
+
+    assert FakeDriver.launched == 2
+
+
+def test_driver_recycled_after_max_pages():
+    with DriverPool(size=1, max_pages=2, driver_factory=FakeDriver) as pool:
+        with pool.checkout() as first:
+            pass
+        with pool.checkout() as again:
+            assert again is first
+        with pool.checkout() as replacement:
+            assert replacement is not first
+
+    assert first.quit_called
+    assert FakeDriver.launched == 2
+
+
+def test_unhealthy_and_broken_drivers_are_replaced():
+    with DriverPool(size=1, driver_factory=FakeDriver) as pool:
+        with pool.checkout() as driver:
+            driver.alive = False
+        with pool.checkout() as healthy:
+            assert healthy is not driver
+        with pytest.raises(WebDriverException):
+            with pool.checkout() as crashed:
+                raise WebDriverException("tab crashed")
+        with pool.checkout() as fresh:
+            assert fresh is not crashed
+
+    assert driver.quit_called and crashed.quit_called
+
+
+def test_concurrent_checkouts_never_share_a_driver():
+    in_use, errors = set(), []
+    lock = threading.Lock()
+
+    def worker(pool):
+        for _ in range(20):
+            with pool.checkout() as driver:
+                with lock:
+                    if id(driver) in in_use:
+                        errors.append("shared")
+                    in_use.add(id(driver))
+                with lock:
+                    in_use.discard(id(driver))
+
+    with DriverPool(size=2, max_pages=1000, driver_factory=FakeDriver) as pool:
+        threads = [threading.Thread(target=worker, args=(pool,)) for _ in range(4)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+    assert not errors
+    assert FakeDriver.launched == 2
+
+
+def test_failing_driver_factory_keeps_the_slot():
+    failures = [WebDriverException("chrome failed to start")] * 2
+
+    def factory():
+        if failures:
+            raise failures.pop()
+        return FakeDriver()
+
+    with DriverPool(
+        size=1, max_pages=1, checkout_timeout=1, driver_factory=factory
+    ) as pool:
+        # Pre-warming failed: the first checkout starts the driver itself.
+        with pytest.raises(WebDriverException):
+            pool.acquire()
+        first = pool.acquire()
+        # Recycling fails too, which leaves an empty slot instead of none.
+        failures.append(WebDriverException("chrome failed to start"))
+        pool.release(first)
+        second = pool.acquire()
+
+    assert first is not second
+    assert FakeDriver.launched == 2
+
+
+def test_closed_pool_refuses_checkout():
+    pool = DriverPool(size=1, driver_factory=FakeDriver)
+    pool.start()
+    pool.close()
+
+    with pytest.raises(RuntimeError):
+        pool.acquire()
@@ -0,0 +1,72 @@
+"""
+Pytest suite for the Kafka message serializers.
+"""
+
+import json
+
+import pytest
+
+from app.models.product import LaptopProduct
+from app.services.serializers import (
+    BinarySerializer,
+    JsonSerializer,
+    SchemaRegistry,
+    decode_message,
+    get_serializer,
+    message_key,
+)
+
+LAPTOP = LaptopProduct(
+    name="Ultrabook 14 – “Pro”",
+    sku="UB-14",
+    price=1299.5,
+    vendor="vendor_a",
+    url="http://shop/p/ub-14",
+    available=False,
+    ram="16GB",
+)
+
+
+def test_json_serializer_matches_pydantic_json():
+    serializer = JsonSerializer()
+
+    data = serializer.serialize(LAPTOP)
+
+    assert json.loads(data) == json.loads(LAPTOP.json())
+    assert serializer.deserialize(data) == LAPTOP.dict()
+    assert json.loads(serializer.serialize({"sku": "raw"})) == {"sku": "raw"}
+    with pytest.raises(ValueError):
+        serializer.serialize("not a product")
+
+
+def test_binary_round_trip_is_smaller_than_json():
+    registry = SchemaRegistry()
+    serializer = BinarySerializer(registry)
+
+    data = serializer.serialize(LAPTOP)
+    headers = serializer.headers(LAPTOP)
+
+    assert decode_message(data, headers, registry) == LAPTOP.dict()
+    assert len(data) < len(JsonSerializer().serialize(LAPTOP)) / 2
+    assert dict(headers)["model-version"] == b"1"
+
+
+def test_schema_ids_are_stable_and_versioned():
+    class LaptopV2(LaptopProduct):
+        schema_version = 2
+
+    first, second = SchemaRegistry(), SchemaRegistry()
+
+    assert first.register(LaptopProduct).id == second.register(LaptopProduct).id
+    assert first.register(LaptopV2).id != first.register(LaptopProduct).id
+    with pytest.raises(KeyError):
+        second.get(first.register(LaptopV2).id)
+
+
+def test_message_key_and_lookup():
+    assert message_key(LAPTOP) == b"vendor_a:UB-14"
+    assert message_key({"vendor": "v", "sku": "1"}) == b"v:1"
+    assert message_key({"name": "no sku"}) is None
+    assert isinstance(get_serializer("binary"), BinarySerializer)
+    with pytest.raises(ValueError):
+        get_serializer("avro")
@@ -0,0 +1,177 @@
+"""
+Pytest suite for the sitemap module.
+"""
+
+import gzip
+import io
+import threading
+from datetime import datetime, timezone
+
+import pytest
+
+from scrapers.frontier import Frontier
+from scrapers.sitemap import (
+    SitemapCheckpoint,
+    asitemap_urls,
+    iter_sitemap,
+    parse_lastmod,
+    seed_frontier,
+    sitemap_urls,
+)
+
+
+@pytest.fixture
+def anyio_backend():
+    # asitemap_urls reads sitemaps with asyncio.to_thread.
+    return "asyncio"
+
+
+NS = 'xmlns="http://www.sitemaps.org/schemas/sitemap/0.9"'
+
+
+def urlset(*entries):
+    body = "".join(
+        f"<url><loc>{loc}</loc>"
+        + (f"<lastmod>{lastmod}</lastmod>" if lastmod else "")
+        + "</url>"
+        for loc, lastmod in entries
+    )
+    return f'<?xml version="1.0"?><urlset {NS}>{body}</urlset>'.encode()
+
+
+def index(*entries):
+    body = "".join(
+        f"<sitemap><loc>{loc}</loc><lastmod>{lastmod}</lastmod></sitemap>"
+        for loc, lastmod in entries
+    )
+    return f'<?xml version="1.0"?><sitemapindex {NS}>{body}</sitemapindex>'.encode()
+
+
+SITEMAPS = {
+    "https://shop.test/sitemap.xml": index(
+        ("https://shop.test/products.xml.gz", "2024-06-01"),
+        ("https://shop.test/old.xml", "2023-01-01"),
+    ),
+    "https://shop.test/products.xml.gz": gzip.compress(
+        urlset(
+            ("https://shop.test/p/1", "2024-05-20"),
+            ("https://shop.test/p/2", "2024-04-01T08:00:00+00:00"),
+            ("https://shop.test/c/shoes", None),
+            ("https://shop.test/about", "2024-05-01"),
+        )
+    ),
+    "https://shop.test/old.xml": urlset(("https://shop.test/p/old", "2023-01-01")),
+}
+
+
+def opener(opened):
+    def open_(url):
+        opened.append(url)
+        return io.BytesIO(SITEMAPS[url])
+
+    return open_
+
+
+def test_parse_lastmod():
+    assert parse_lastmod("2024-05-01") == datetime(2024, 5, 1, tzinfo=timezone.utc)
+    assert parse_lastmod("2024-05-01T10:00Z").hour == 10
+    assert parse_lastmod("yesterday") is None
+    assert parse_lastmod(None) is None
+
+
+def test_iter_sitemap_follows_indexes_and_gzip():
+    opened = []
+    entries = list(iter_sitemap("https://shop.test/sitemap.xml", opener=opener(opened)))
+
+    assert [e.url for e in entries] == [
+        "https://shop.test/p/1",
+        "https://shop.test/p/2",
+        "https://shop.test/c/shoes",
+        "https://shop.test/about",
+        "https://shop.test/p/old",
+    ]
+    assert entries[2].lastmod is None
+    assert len(opened) == 3
+
+
+def test_iter_sitemap_filters_by_category_and_lastmod():
+    opened = []
+    entries = list(
+        iter_sitemap(
+            "https://shop.test/sitemap.xml",
+            categories={"product": r"/p/", "listing": r"/c/"},
+            since=datetime(2024, 5, 1),
+            opener=opener(opened),
+        )
+    )
+
+    assert [(e.url, e.category) for e in entries] == [
+        ("https://shop.test/p/1", "product"),
+        ("https://shop.test/c/shoes", "listing"),
+    ]
+    # The stale child sitemap is never downloaded.
+    assert "https://shop.test/old.xml" not in opened
+
+
+def test_sitemap_urls_dedups_against_frontier():
+    frontier = Frontier()
+    frontier.add("https://shop.test/p/1")
+
+    urls = list(
+        sitemap_urls(
+            ["https://shop.test/sitemap.xml"],
+            frontier=frontier,
+            categories={"product": r"/p/"},
+            opener=opener([]),
+        )
+    )
+
+    assert urls == ["https://shop.test/p/2", "https://shop.test/p/old"]
+
+
+@pytest.mark.anyio
+async def test_asitemap_urls_reads_sitemaps_off_the_event_loop():
+    frontier = Frontier()
+    frontier.add("https://shop.test/p/1")
+    threads = []
+
+    def open_in_thread(url):
+        threads.append(threading.current_thread())
+        return io.BytesIO(SITEMAPS[url])
+
+    urls = [
+        url
+        async for url in asitemap_urls(
+            ["https://shop.test/sitemap.xml"],
+            frontier=frontier,
+            batch_size=1,
+            categories={"product": r"/p/"},
+            opener=open_in_thread,
+        )
+    ]
+
+    assert urls == ["https://shop.test/p/2", "https://shop.test/p/old"]
+    assert threading.main_thread() not in threads
+
+
+def test_seed_frontier_queues_listing_pages():
+    frontier = Frontier()
+    entries = iter_sitemap(
+        "https://shop.test/products.xml.gz",
+        categories={"listing": r"/c/"},
+        opener=opener([]),
+    )
+
+    assert seed_frontier(frontier, entries) == 1
+    assert frontier.pop().url == "https://shop.test/c/shoes"
+
+
+def test_checkpoint_round_trip(tmp_path):
+    path = str(tmp_path / "sitemaps.json")
+    started = datetime(2024, 6, 1, 12, 0, tzinfo=timezone.utc)
+
+    SitemapCheckpoint(path).mark("https://shop.test/sitemap.xml", started)
+    checkpoint = SitemapCheckpoint(path)
+
+    assert checkpoint.last_run("https://shop.test/sitemap.xml") == started
+    assert checkpoint.last_run("https://other.test/sitemap.xml") is None
@@ -0,0 +1,91 @@
+"""
+Pytest suite for the streaming module and the streaming fetch API.
+"""
+
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from scrapers.fetch_utils import (
+    AsyncFetcher,
+    SyncFetcher,
+    fetch_html_sync,
+    stream_html_async,
+)
+from scrapers.streaming import decode_body, limit_chunks, stop_at_marker
+
+
+@pytest.fixture
+def anyio_backend():
+    # The pooled aiohttp connector is bound to an asyncio event loop.
+    return "asyncio"
+
+
+def test_stop_at_marker_matches_across_chunks():
+    predicate = stop_at_marker("</main>")
+    assert not predicate(b"<main>product</ma")
+    assert predicate(b"in><footer>")
+
+
+def test_limit_chunks_truncates_at_byte_cap():
+    chunks = [b"aaaa", b"bbbb", b"cccc"]
+    assert b"".join(limit_chunks(chunks, max_bytes=6)) == b"aaaabb"
+    assert b"".join(limit_chunks(chunks, max_bytes=8)) == b"aaaabbbb"
+
+
+def test_decode_body_prefers_header_then_meta():
+    body = '<meta charset="iso-8859-1"><p>caf\xe9</p>'.encode("latin-1")
+    assert "café" in decode_body(body)
+    assert "café" in decode_body("<p>café</p>".encode("utf-8"), "utf-8")
+
+
+@patch("scrapers.fetch_utils.requests.Session")
+def test_fetch_html_sync_stops_after_marker(mock_session_cls):
+    served = []
+
+    def body(chunk_size):
+        for chunk in (b"<main>", b"<h1>Laptop</h1></main>", b"<footer>", b"x" * 10):
+            served.append(chunk)
+            yield chunk
+
+    mock_resp = MagicMock(status_code=200, headers={"Content-Type": "text/html"})
+    mock_resp.iter_content.side_effect = body
+    mock_session_cls.return_value.get.return_value = mock_resp
+
+    html = fetch_html_sync(
+        "http://shop.example/p",
+        max_retries=1,
+        fetcher=SyncFetcher(),
+        stop_when=stop_at_marker("</main>"),
+    )
+
+    assert html == "<main><h1>Laptop</h1></main>"
+    assert len(served) == 2
+    mock_resp.close.assert_called_once()
+
+
+@pytest.mark.anyio
+@patch("scrapers.fetch_utils.aiohttp.ClientSession")
+async def test_stream_html_async_caps_bytes(mock_session_cls):
+    async def iter_chunked(size):
+        for chunk in (b"0123456789", b"abcdefghij", b"KLMNOPQRST"):
+            yield chunk
+
+    mock_resp = MagicMock()
+    mock_resp.content.iter_chunked = iter_chunked
+    response_ctx_manager = AsyncMock()
+    response_ctx_manager.__aenter__.return_value = mock_resp
+
+    mock_session = AsyncMock()
+    mock_session.closed = False
+    mock_session.get = MagicMock(return_value=response_ctx_manager)
+    mock_session_cls.return_value = mock_session
+
+    chunks = [
+        c
+        async for c in stream_html_async(
+            "http://shop.example/p", max_bytes=15, fetcher=AsyncFetcher()
+        )
+    ]
+
+    assert b"".join(chunks) == b"0123456789abcde"
@@ -0,0 +1,100 @@
+"""
+Pytest suite for the tiered_fetch module.
+"""
+
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from scrapers.tiered_fetch import (
+    TieredFetcher,
+    has_selectors,
+    looks_js_gated,
+    url_pattern,
+)
+
+FULL_PAGE = (
+    "<html><body><h1 class='title'>Laptop</h1><span class='price'>999</span>"
+    + "<p>Specs and description.</p>" * 20
+    + "<script src='app.js'></script></body></html>"
+)
+APP_SHELL = (
+    "<html><body><div id='root'></div><script src='app.js'></script></body></html>"
+)
+
+
+@pytest.fixture
+def anyio_backend():
+    # Page checks run on asyncio's thread pool, like aiohttp fetches on asyncio.
+    return "asyncio"
+
+
+def test_url_pattern_wildcards_ids_and_slugs():
+    assert url_pattern("https://Shop.com/p/12345?ref=x") == "shop.com/p/*"
+    assert (
+        url_pattern("https://shop.com/laptops/dell-xps-13-9340") == "shop.com/laptops/*"
+    )
+    assert url_pattern("https://shop.com/laptops") == "shop.com/laptops"
+
+
+def test_looks_js_gated():
+    assert looks_js_gated(APP_SHELL)
+    assert looks_js_gated("<body><p>Please enable JavaScript to continue</p></body>")
+    # A notice inside <noscript> is never shown to a JavaScript browser.
+    assert not looks_js_gated(
+        FULL_PAGE.replace("<body>", "<body><noscript>Enable JavaScript</noscript>")
+    )
+    assert not looks_js_gated(FULL_PAGE)
+    assert not looks_js_gated("<p>Short static page</p>")
+
+
+def test_has_selectors():
+    assert has_selectors(FULL_PAGE, ["h1.title", "span.price"])
+    assert not has_selectors(FULL_PAGE, [".price", ".stock"])
+    assert has_selectors("", [])
+    assert not has_selectors("", [".price"])
+
+
+@pytest.mark.anyio
+async def test_complete_http_page_is_not_rendered():
+    renderer = AsyncMock()
+    tiered = TieredFetcher(renderer, required_selectors=[".price"])
+    with patch(
+        "scrapers.tiered_fetch.fetch_utils.fetch_html_async",
+        AsyncMock(return_value=FULL_PAGE),
+    ):
+        html = await tiered.render("https://shop.com/p/1")
+
+    assert html == FULL_PAGE
+    renderer.render.assert_not_called()
+    assert tiered.tier_for("https://shop.com/p/2") == "http"
+
+
+@pytest.mark.anyio
+async def test_escalation_is_remembered_per_pattern():
+    renderer = AsyncMock()
+    renderer.render.return_value = "<html>rendered</html>"
+    tiered = TieredFetcher(renderer, required_selectors=[".price"])
+    fetch = AsyncMock(return_value=APP_SHELL)
+    with patch("scrapers.tiered_fetch.fetch_utils.fetch_html_async", fetch):
+        first = await tiered.render("https://shop.com/p/1", "#product")
+        second = await tiered.render("https://shop.com/p/2", "#product")
+
+    assert first == second == "<html>rendered</html>"
+    assert fetch.await_count == 1
+    renderer.render.assert_awaited_with("https://shop.com/p/2", "#product")
+    assert tiered.stats() == {"http": 0, "render": 2, "escalated": 1, "patterns": 1}
+
+
+@pytest.mark.anyio
+async def test_missing_required_selector_escalates():
+    renderer = AsyncMock()
+    tiered = TieredFetcher(renderer, required_selectors=[".stock"])
+    with patch(
+        "scrapers.tiered_fetch.fetch_utils.fetch_html_async",
+        AsyncMock(return_value=FULL_PAGE),
+    ):
+        await tiered.render("https://shop.com/p/1")
+
+    renderer.render.assert_awaited_once()
+    assert tiered.tier_for("https://shop.com/p/1") == "render"
@@ -0,0 +1,99 @@
+"""
+Pytest suite for the compiled batch validator.
+"""
+
+import pytest
+from pydantic import BaseModel, ValidationError, root_validator, validator
+
+from app.models.product import LaptopProduct
+from app.services.validators import BatchValidator, get_validator, validate_products
+
+VALID = {
+    "name": "Laptop",
+    "sku": "LAP-1",
+    "price": 999.0,
+    "vendor": "vendor_a",
+    "url": "http://shop/p/1",
+    "ram": "16GB",
+}
+
+RECORDS = [
+    VALID,
+    dict(VALID, price=1000, available="yes", unknown="ignored"),
+    dict(VALID, price="12.5", cpu=None),
+    dict(VALID, sku="  ", price=-1),
+    {"name": 5, "price": "cheap", "vendor": "v", "url": "u"},
+    dict(VALID, ram=16),
+]
+
+
+def reference(record):
+    try:
+        return LaptopProduct(**record), []
+    except ValidationError as e:
+        return None, [(err["loc"][0], err["msg"], err["type"]) for err in e.errors()]
+
+
+def test_batch_matches_per_object_validation():
+    result = validate_products(LaptopProduct, RECORDS)
+
+    assert result.rows == [0, 1, 2, 5]
+    assert result.invalid_rows == [3, 4]
+    for row, product in zip(result.rows, result.products):
+        expected, _ = reference(RECORDS[row])
+        assert product == expected
+        assert type(product.price) is float
+        assert product.__fields_set__ == expected.__fields_set__
+    by_row = result.errors_by_row()
+    for row in result.invalid_rows:
+        _, expected = reference(RECORDS[row])
+        assert [(e.field, e.message, e.type) for e in by_row[row]] == expected
+    assert by_row[3][0].value == "  "
+    assert by_row[4][1].value == "cheap"
+
+
+def test_trusted_path_skips_type_checks_but_not_required_fields():
+    result = get_validator(LaptopProduct).construct(
+        [dict(VALID, price="12.5", unknown=1), {"name": "x"}]
+    )
+
+    (product,) = result.products
+    assert product.price == "12.5"
+    assert "unknown" not in product.__dict__
+    assert product.available is True
+    assert {e.field for e in result.errors} == {"sku", "price", "vendor", "url"}
+
+
+def test_validate_one_raises_pydantic_errors():
+    validator = get_validator(LaptopProduct)
+
+    assert validator is get_validator(LaptopProduct)
+    assert validator.validate_one(VALID) == LaptopProduct(**VALID)
+    with pytest.raises(ValidationError) as info:
+        validator.validate_one(dict(VALID, sku=""))
+    assert info.value.errors()[0]["msg"] == "SKU must not be empty"
+
+
+def test_models_with_root_or_pre_validators_keep_their_semantics():
+    class Normalized(BaseModel):
+        sku: str
+        price: float
+
+        @validator("sku", pre=True)
+        def upper(cls, v):
+            return str(v).upper()
+
+        @root_validator
+        def positive(cls, values):
+            if values.get("price", 0) <= 0:
+                raise ValueError("price must be positive")
+            return values
+
+    result = BatchValidator(Normalized).validate(
+        [{"sku": "ab", "price": 1.0}, {"sku": 1, "price": 0.0}]
+    )
+
+    assert result.products == [Normalized(sku="AB", price=1.0)]
+    assert [(e.row, e.field, e.message) for e in result.errors] == [
+        (1, "__root__", "price must be positive")
+    ]